@@ -1,13 +1,14 @@
+import asyncio
+import json
 import os
 import re
-import json
-import asyncio
 from typing import Dict, List, Tuple
 
 import streamlit as st
-import requests
 from bs4 import BeautifulSoup
 
+from need_analysis.http_fetch import FetchError, fetch_text_sync
+
 # Optional PDF extraction dependency
 try:
     import pdfplumber
@@ -53,15 +54,15 @@ TITLE_HEURISTIC_CONFIDENCE = 0.6
 # ---------------------------- UTILITIES -------------------------------- #
 ###########################################################################
 
+
 @st.cache_data(show_spinner="Fetching URL …", ttl=86_400)
 def load_text_from_url(url: str) -> str:
     try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-    except requests.RequestException as exc:
+        html = fetch_text_sync(url).text
+    except FetchError as exc:
         st.error(f"Failed to fetch URL: {exc}")
         return ""
-    soup = BeautifulSoup(resp.text, "html.parser")
+    soup = BeautifulSoup(html, "html.parser")
     return soup.get_text(separator=" ")
 
 
@@ -97,6 +98,7 @@ def regex_extract(text: str) -> Tuple[Dict[str, str], Dict[str, float]]:
 
 async def _llm_extract_async(text: str, missing_keys: List[str]) -> Dict[str, str]:
     import openai
+
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         st.warning("OPENAI_API_KEY not set – skipping LLM fallback 💤")
@@ -107,7 +109,10 @@ async def _llm_extract_async(text: str, missing_keys: List[str]) -> Dict[str, st
         "You are a data‑extraction function. Return a JSON object with ONLY the keys: "
         + ", ".join(missing_keys)
     )
-    user = "Extract the requested information from the following job advert.\n\n" + text[:12000]
+    user = (
+        "Extract the requested information from the following job advert.\n\n"
+        + text[:12000]
+    )
 
     try:
         response = await openai.chat.completions.create(
@@ -115,7 +120,10 @@ async def _llm_extract_async(text: str, missing_keys: List[str]) -> Dict[str, st
             temperature=0,
             max_tokens=300,
             response_format={"type": "json_object"},
-            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
         )
         return json.loads(response.choices[0].message.content)
     except Exception as exc:  # pragma: no cover
@@ -136,12 +144,20 @@ def extract_structured_data(text: str) -> Tuple[Dict[str, str], Dict[str, float]
                 conf[k] = LLM_CONFIDENCE
     return data, conf
 
+
 ###########################################################################
 # -------------------------- WIZARD HELPERS ----------------------------- #
 ###########################################################################
 
 STEP_TITLES = [
-    "Source", "Company", "Department & Team", "Tasks & Responsibilities", "Skills", "Benefits", "Recruitment Process", "Summary",
+    "Source",
+    "Company",
+    "Department & Team",
+    "Tasks & Responsibilities",
+    "Skills",
+    "Benefits",
+    "Recruitment Process",
+    "Summary",
 ]
 TOTAL_STEPS = len(STEP_TITLES)
 
@@ -150,10 +166,12 @@ def goto(step: int):
     st.session_state["step"] = step
     st.rerun()
 
+
 ###########################################################################
 # ----------------------------- COMPONENTS ------------------------------ #
 ###########################################################################
 
+
 def draw_confidence(key: str):
     conf = st.session_state.get("confidence", {}).get(key, 0.0)
     if conf:
@@ -161,17 +179,23 @@ def draw_confidence(key: str):
     else:
         st.caption("no confidence yet")
 
+
 ##########################
 # ----- Step screens ----
 ##########################
 
+
 def step_source():
     st.subheader("📥 Provide Job Ad Source")
     mode = st.radio("Select input mode", ["Upload file", "Paste URL"], horizontal=True)
 
     raw_text = ""
     if mode == "Upload file":
-        file = st.file_uploader("Upload a PDF or text file", type=["pdf", "txt"], accept_multiple_files=False)
+        file = st.file_uploader(
+            "Upload a PDF or text file",
+            type=["pdf", "txt"],
+            accept_multiple_files=False,
+        )
         if file and st.button("Extract ➡️"):
             raw_text = load_text_from_upload(file)
     else:
@@ -192,7 +216,6 @@ def step_source():
 def step_company():
     st.subheader("🏢 Company Information")
     extracted = st.session_state.get("extracted", {})
-    confidence = st.session_state.get("confidence", {})
 
     col1, col2 = st.columns([3, 1])
     with col1:
@@ -245,9 +268,10 @@ def step_department_team():
 def step_tasks():
     st.subheader("📝 Tasks & Responsibilities")
     extracted = st.session_state.get("extracted", {})
-    confidence = st.session_state.get("confidence", {})
 
-    tasks = st.text_area("Describe the main tasks …", value=extracted.get("tasks", ""), height=150)
+    tasks = st.text_area(
+        "Describe the main tasks …", value=extracted.get("tasks", ""), height=150
+    )
     draw_confidence("tasks")
 
     if st.button("Next ➡️"):
@@ -260,7 +284,9 @@ def step_tasks():
 def step_skills():
     st.subheader("💡 Skills")
     extracted = st.session_state.get("extracted", {})
-    skills = st.text_area("List the required skills …", value=extracted.get("skills", ""), height=150)
+    skills = st.text_area(
+        "List the required skills …", value=extracted.get("skills", ""), height=150
+    )
     draw_confidence("skills")
 
     if st.button("Next ➡️"):
@@ -273,7 +299,9 @@ def step_skills():
 def step_benefits():
     st.subheader("🎁 Benefits")
     extracted = st.session_state.get("extracted", {})
-    benefits = st.text_area("Describe benefits …", value=extracted.get("benefits", ""), height=150)
+    benefits = st.text_area(
+        "Describe benefits …", value=extracted.get("benefits", ""), height=150
+    )
     draw_confidence("benefits")
 
     if st.button("Next ➡️"):
@@ -304,23 +332,46 @@ def step_summary():
 
     if st.button("Download JSON"):
         st.download_button(
-            label="Download", data=json.dumps(wizard_data, indent=2), mime="application/json", file_name="recruitment_need.json",
+            label="Download",
+            data=json.dumps(wizard_data, indent=2),
+            mime="application/json",
+            file_name="recruitment_need.json",
         )
 
+
 ###########################################################################
 # ----------------------------- MAIN ------------------------------------ #
 ###########################################################################
 
+
 def main():
-    st.set_page_config(page_title="Vacalyser – Recruitment Need Wizard", page_icon="📋", layout="centered")
+    st.set_page_config(
+        page_title="Vacalyser – Recruitment Need Wizard",
+        page_icon="📋",
+        layout="centered",
+    )
     st.title("Vacalyser · Recruitment Need Analysis Wizard 🧙‍♂️")
-    st.markdown("AI‑assisted form filling with confidence scores and full manual control.")
+    st.markdown(
+        "AI‑assisted form filling with confidence scores and full manual control."
+    )
 
     st.session_state.setdefault("step", 0)
     current = st.session_state["step"]
-    st.progress((current + 1) / TOTAL_STEPS, text=f"Step {current + 1} / {TOTAL_STEPS}: {STEP_TITLES[current]}")
+    st.progress(
+        (current + 1) / TOTAL_STEPS,
+        text=f"Step {current + 1} / {TOTAL_STEPS}: {STEP_TITLES[current]}",
+    )
 
-    {0: step_source, 1: step_company, 2: step_department_team, 3: step_tasks, 4: step_skills, 5: step_benefits, 6: step_process, 7: step_summary}[current]()
+    {
+        0: step_source,
+        1: step_company,
+        2: step_department_team,
+        3: step_tasks,
+        4: step_skills,
+        5: step_benefits,
+        6: step_process,
+        7: step_summary,
+    }[current]()
 
 
 if __name__ == "__main__":
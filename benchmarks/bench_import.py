@@ -0,0 +1,65 @@
+"""Cold-import benchmark for the headless extraction core.
+
+Usage::
+
+    python benchmarks/bench_import.py [--runs 10]
+
+Each run starts a fresh interpreter, imports the core modules and reports
+wall time plus which heavy dependencies were pulled in (there should be none).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = ("streamlit", "openai", "PyPDF2", "docx", "bs4", "httpx")
+TARGETS = {
+    "need_analysis": "import need_analysis",
+    "extraction": "import need_analysis.extraction",
+    "extraction+ingest": "import need_analysis.extraction, need_analysis.ingest",
+}
+
+PROBE = """
+import sys, time, json
+t0 = time.perf_counter()
+{stmt}
+dt = time.perf_counter() - t0
+print(json.dumps({{"seconds": dt, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(stmt: str, runs: int) -> dict:
+    times, heavy = [], set()
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(stmt=stmt, heavy=HEAVY)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        res = json.loads(out.stdout)
+        times.append(res["seconds"])
+        heavy.update(res["heavy"])
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 2),
+        "max_ms": round(max(times) * 1000, 2),
+        "heavy_imported": sorted(heavy),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    for name, stmt in TARGETS.items():
+        print(f"{name:20s} {measure(stmt, args.runs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Latency of the trigram occupation matcher.
+
+Usage::
+
+    python benchmarks/bench_occupation_match.py [--db esco.sqlite] [--titles 2000]
+
+Without ``--db`` an ESCO-sized synthetic label set is generated (3,000
+occupations with English and German preferred, alternative and gendered
+labels). Reports build, save and memory-map times plus per-title latency of
+``match`` on noisy ad titles.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+DOMAINS = (
+    "software data cloud network security sales marketing finance tax payroll "
+    "logistics warehouse supply chain quality mechanical electrical civil chemical "
+    "medical nursing care pharmacy laboratory retail hotel kitchen construction energy "
+    "solar wind automotive aviation maritime legal insurance banking real estate "
+    "education research media design game web mobile embedded test service"
+).split()
+ROLES = (
+    "engineer developer manager analyst consultant technician specialist assistant "
+    "administrator architect coordinator officer designer operator planner scientist"
+).split()
+DE_ROLES = (
+    "Ingenieur Entwickler Manager Analyst Berater Techniker Spezialist Assistent "
+    "Administrator Architekt Koordinator Referent Designer Bediener Planer Wissenschaftler"
+).split()
+NOISE = ("Senior ", "Junior ", "Lead ", "", "", "")
+SUFFIX = (" (m/w/d)", " (w/m/d)", "*in", " – 100% remote", "", " Vollzeit")
+
+
+def synthetic_labels(n: int, rng: random.Random) -> list[tuple[str, str, bool]]:
+    rows = []
+    for i in range(n):
+        uri = f"http://data.europa.eu/esco/occupation/{i}"
+        d1, d2 = rng.sample(DOMAINS, 2)
+        r = rng.randrange(len(ROLES))
+        rows.append((uri, f"{d1} {ROLES[r]}", True))
+        rows += [
+            (uri, f"{d1} {d2} {ROLES[r]}", False),
+            (uri, f"{d2} {rng.choice(ROLES)}", False),
+        ]
+        de = f"{d1.capitalize()}{DE_ROLES[r].lower()}"
+        rows += [(uri, f"{de}/{de}in", False), (uri, f"{d1} {DE_ROLES[r]}", False)]
+        rows += [
+            (uri, f"{d1} {d2} {DE_ROLES[r]}in", False) for _ in range(rng.randrange(4))
+        ]
+    return rows
+
+
+def main() -> int:
+    from need_analysis.esco.matcher import OccupationMatcher
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--db", type=Path, help="ESCO index from `esco-import`")
+    ap.add_argument("--occupations", type=int, default=3000)
+    ap.add_argument("--titles", type=int, default=2000)
+    args = ap.parse_args()
+    rng = random.Random(7)
+
+    t0 = time.perf_counter()
+    if args.db:
+        matcher = OccupationMatcher.from_db(args.db)
+    else:
+        rows = synthetic_labels(args.occupations, rng)
+        matcher = OccupationMatcher.from_labels(rows)
+    build = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "occupations.trigrams"
+        t0 = time.perf_counter()
+        matcher.save(path)
+        save = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        mapped = OccupationMatcher.load(path)
+        load = time.perf_counter() - t0
+
+        titles = [
+            rng.choice(NOISE) + rng.choice(matcher.labels) + rng.choice(SUFFIX)
+            for _ in range(args.titles)
+        ]
+        times = []
+        for title in titles:
+            t0 = time.perf_counter()
+            mapped.match(title, k=5)
+            times.append(time.perf_counter() - t0)
+        times.sort()
+        print(
+            json.dumps(
+                {
+                    "occupations": len(matcher),
+                    "labels": len(matcher.labels),
+                    "postings": len(matcher.postings),
+                    "file_mb": round(path.stat().st_size / 2**20, 1),
+                    "build_s": round(build, 2),
+                    "save_s": round(save, 3),
+                    "load_ms": round(load * 1000, 1),
+                    "match_median_ms": round(statistics.median(times) * 1000, 3),
+                    "match_p95_ms": round(
+                        times[int(0.95 * (len(times) - 1))] * 1000, 3
+                    ),
+                },
+                indent=2,
+            )
+        )
+        del mapped
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
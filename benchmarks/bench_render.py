@@ -0,0 +1,81 @@
+"""Rerun render-time budget for the wizard steps.
+
+Usage::
+
+    python benchmarks/bench_render.py [--runs 20] [--budget-ms 150]
+
+Renders every wizard step through ``streamlit.testing`` with all optional
+fields shown and a full set of extracted values, times ``runs`` reruns per
+step and exits non-zero if the median of any step with 20+ fields exceeds
+the budget. Element counts are reported too, since they drive the cost of
+shipping a rerun to the browser.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))  # need_analysis for the schema
+APP = ROOT / "Recruitment_Need_Analysis_Tool.py"
+BIG_STEP = 20  # fields; steps at least this large must meet the budget
+
+
+def measure_step(step: int, runs: int) -> dict:
+    from need_analysis.schema import STEPS, ExtractResult
+
+    _, fields = STEPS[step - 1]
+    at = AppTest.from_file(str(APP), default_timeout=30)
+    at.session_state["step"] = step
+    at.session_state["extracted"] = {
+        k: ExtractResult(f"value of {k}", 0.8) for k in fields
+    }
+    at.session_state[f"optional_{step}"] = True
+    at.run()
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - t0)
+    return {
+        "step": step,
+        "fields": len(fields),
+        "elements": sum(1 for _ in at.main),
+        "median_ms": round(statistics.median(times) * 1000, 1),
+        "p95_ms": round(sorted(times)[int(0.95 * (len(times) - 1))] * 1000, 1),
+    }
+
+
+def main() -> int:
+    from need_analysis.schema import STEPS
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--budget-ms", type=float, default=150.0)
+    args = ap.parse_args()
+
+    results = [
+        measure_step(i, args.runs) for i in range(1, len(STEPS)) if STEPS[i - 1][1]
+    ]
+    over = [
+        r
+        for r in results
+        if r["fields"] >= BIG_STEP and r["median_ms"] > args.budget_ms
+    ]
+    print(
+        json.dumps(
+            {"budget_ms": args.budget_ms, "steps": results, "over_budget": over},
+            indent=2,
+        )
+    )
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Suggestion latency of the role template index as the catalog grows.
+
+Usage::
+
+    python benchmarks/bench_role_templates.py [--sizes 10,100,1000,10000,50000] [--titles 2000]
+
+For every catalog size a synthetic set of templates is generated (each
+with a few English and German title patterns), compiled into a
+:class:`~need_analysis.roles.RoleIndex`, and ``suggest`` is timed on noisy
+ad titles. Aho-Corasick matching walks the title once, so the per-title
+latency should stay flat while build time and automaton size grow with
+the catalog.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from bench_occupation_match import DE_ROLES, DOMAINS, NOISE, ROLES, SUFFIX  # noqa: E402
+
+SYLLABLES = (
+    "ka lo mi ne ru sa te vo bri dan fel gor hul jen kim lar mos nor pet quin ".split()
+)
+
+
+def synthetic_templates(n: int, rng: random.Random) -> list[dict]:
+    """``n`` templates; small catalogs use real words, large ones add made-up domains."""
+    templates = []
+    for i in range(n):
+        domain = rng.choice(DOMAINS)
+        if i >= len(DOMAINS) * len(ROLES):  # keep patterns distinct in big catalogs
+            domain += "".join(rng.sample(SYLLABLES, 2))
+        r = rng.randrange(len(ROLES))
+        templates.append(
+            {
+                "id": f"t{i}",
+                "patterns": [
+                    f"{domain} {ROLES[r]}",
+                    f"{domain}{DE_ROLES[r].lower()}",
+                    f"{domain} {DE_ROLES[r].lower()}",
+                ],
+                "task_list": [f"task {i}"],
+                "must_have_skills": [f"skill {i}"],
+            }
+        )
+    return templates
+
+
+def main() -> int:
+    from need_analysis.roles import RoleIndex
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", default="10,100,1000,10000,50000")
+    ap.add_argument("--titles", type=int, default=2000)
+    args = ap.parse_args()
+
+    report = []
+    for size in map(int, args.sizes.split(",")):
+        rng = random.Random(7)
+        templates = synthetic_templates(size, rng)
+        t0 = time.perf_counter()
+        index = RoleIndex(templates)
+        build = time.perf_counter() - t0
+
+        titles = [
+            rng.choice(NOISE)
+            + rng.choice(rng.choice(templates)["patterns"]).title()
+            + rng.choice(SUFFIX)
+            for _ in range(args.titles)
+        ]
+        times = []
+        for title in titles:
+            t0 = time.perf_counter()
+            index.suggest(title)
+            times.append(time.perf_counter() - t0)
+        times.sort()
+        report.append(
+            {
+                "templates": size,
+                "patterns": len(index.automaton.patterns),
+                "states": len(index.automaton),
+                "build_s": round(build, 3),
+                "suggest_median_us": round(statistics.median(times) * 1e6, 1),
+                "suggest_p95_us": round(times[int(0.95 * (len(times) - 1))] * 1e6, 1),
+            }
+        )
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
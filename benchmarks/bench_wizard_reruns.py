@@ -0,0 +1,76 @@
+"""Script reruns needed to complete one requisition in the wizard.
+
+Usage::
+
+    python benchmarks/bench_wizard_reruns.py [--all-fields]
+
+Drives ``Recruitment_Need_Analysis_Tool.py`` through ``streamlit.testing``:
+starting at step 1, it fills the must-have fields of every step (or every
+field with ``--all-fields``) and clicks "Next →" until the summary. Edits to
+widgets outside a form are followed by a run, as a browser would trigger one;
+edits inside a form are not. Every script run after the first page load
+counts as a rerun.
+
+Run it against an older checkout of the page for the before/after comparison.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))  # need_analysis for the schema
+APP = ROOT / "Recruitment_Need_Analysis_Tool.py"
+
+
+def complete_requisition(app: Path, all_fields: bool) -> dict:
+    from need_analysis.schema import MUST_HAVE_KEYS, STEPS
+
+    at = AppTest.from_file(str(app), default_timeout=30)
+    at.session_state["step"] = 1
+    at.run()
+    edits = reruns = 0
+    t0 = time.perf_counter()
+    for _, fields in STEPS:
+        if at.session_state["step"] > len(STEPS) - 1:
+            break
+        rendered = {w.key for w in at.text_input}
+        for key in fields:
+            if f"fld_{key}" not in rendered or not (
+                all_fields or key in MUST_HAVE_KEYS
+            ):
+                continue
+            # fresh handle: runs rebuild the tree
+            widget = at.text_input(key=f"fld_{key}")
+            widget.input(f"bench {key}")
+            edits += 1
+            if not widget.form_id:
+                at.run()  # outside a form every edit is its own rerun
+                reruns += 1
+        next(b for b in at.button if b.label == "Next →").click().run()
+        reruns += 1
+    return {
+        "edits": edits,
+        "reruns": reruns,
+        "seconds": round(time.perf_counter() - t0, 2),
+        "reached_summary": at.session_state["step"] >= len(STEPS),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--app", type=Path, default=APP)
+    ap.add_argument(
+        "--all-fields", action="store_true", help="edit optional fields too"
+    )
+    args = ap.parse_args()
+    print(json.dumps(complete_requisition(args.app, args.all_fields), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,64 +1,166 @@
-"""State-update helpers – generate placeholders / suggestions."""
+"""State-update helpers – generate placeholders / suggestions.
+
+Each processor declares the state keys it reads and writes; :data:`PROCESSORS`
+runs them through :class:`~functions.engine.Engine`, which skips processors
+whose inputs did not change since the last wizard rerun.
+"""
+import re
 from typing import Any
 
+from functions.engine import Engine, processor
+from need_analysis.roles import role_suggestions
+
 
+@processor(reads=("job_title", "task_list"), writes=("task_list",))
 def update_task_list(state: dict[str, Any]) -> None:
-    """Populate `task_list` with generic tasks based on the role.
+    """Populate `task_list` with generic tasks from the matching role template.
 
     Args:
         state: Streamlit `st.session_state` dictionary.
     """
     if state.get("task_list"):
         return
-
-    role = state.get("job_title", "").lower()
-    if "developer" in role:
-        state["task_list"] = [
-            "Build new features",
-            "Refactor legacy modules",
-            "Write unit tests",
-        ]
-    elif "sales" in role:
-        state["task_list"] = [
-            "Prospect and qualify leads",
-            "Prepare demos",
-            "Negotiate contracts",
-        ]
+    if tasks := role_suggestions(state.get("job_title", "")).get("task_list"):
+        state["task_list"] = list(tasks)
 
 
+@processor(reads=("job_title", "must_have_skills"), writes=("must_have_skills",))
 def update_must_have_skills(state: dict[str, Any]) -> None:
-    """Fill `must_have_skills` with placeholder skills.
+    """Fill `must_have_skills` with placeholder skills from the matching role template.
 
     Args:
         state: Streamlit `st.session_state`.
     """
     if state.get("must_have_skills"):
         return
-    role = state.get("job_title", "").lower()
-    if "python" in role:
-        state["must_have_skills"] = ["Python 3.11", "AsyncIO", "pytest"]
-    elif "sales" in role:
-        state["must_have_skills"] = ["CRM", "Negotiation", "Lead generation"]
+    if skills := role_suggestions(state.get("job_title", "")).get("must_have_skills"):
+        state["must_have_skills"] = list(skills)
+
+
+def _skill_list(value: Any) -> list[str]:
+    """Skills from a list or a comma / semicolon / newline separated string."""
+    if isinstance(value, str):
+        value = re.split(r"[,;\n]", value)
+    return [str(v).strip() for v in value or () if str(v).strip()]
 
 
+def _skill_vectors(state: dict[str, Any]) -> tuple[Any, str | None]:
+    """Shared ESCO skill vectors (or ``None``) and the language to query."""
+    try:
+        from need_analysis.esco.vectors import get_skill_vectors
+    except ImportError:  # numpy missing
+        return None, None
+    vectors = get_skill_vectors()
+    lang = state.get("lang")
+    return vectors, lang if vectors is not None and lang in vectors.languages else None
+
+
+@processor(reads=("must_have_skills", "lang"), writes=("must_have_skills",))
+def normalize_must_have_skills(state: dict[str, Any]) -> None:
+    """Replace free-text must-have skills by close ESCO skill labels.
+
+    Items without a close match are kept as typed. A no-op until the offline
+    skill vectors are built (``python -m need_analysis esco-import``).
+
+    Args:
+        state: Streamlit `st.session_state`.
+    """
+    skills = _skill_list(state.get("must_have_skills"))
+    vectors, lang = _skill_vectors(state)
+    if not skills or vectors is None:
+        return
+    normalized = list(dict.fromkeys(vectors.normalize(skills, lang)))
+    if normalized != skills:
+        value = state["must_have_skills"]
+        state["must_have_skills"] = (
+            ", ".join(normalized) if isinstance(value, str) else normalized
+        )
+
+
+@processor(
+    reads=("must_have_skills", "lang", "nice_to_have_skills"),
+    writes=("nice_to_have_skills",),
+)
 def update_nice_to_have_skills(state: dict[str, Any]) -> None:
     """Suggest complementary skills.
 
+    Neighbours of the must-have skills in the ESCO skill vectors when they
+    are available, otherwise a generic list.
+
     Args:
         state: Streamlit `st.session_state`.
     """
     if state.get("nice_to_have_skills"):
         return
-    state["nice_to_have_skills"] = ["Public speaking", "Problem-solving", "Data analysis"]
-
-
+    suggestions: list[str] = []
+    must = _skill_list(state.get("must_have_skills"))
+    vectors, lang = _skill_vectors(state)
+    if must and vectors is not None:
+        suggestions = vectors.suggest(must, k=5, language=lang)
+    state["nice_to_have_skills"] = suggestions or [
+        "Public speaking",
+        "Problem-solving",
+        "Data analysis",
+    ]
+
+
+def _salary_benchmark(state: dict[str, Any]) -> tuple[float, float] | None:
+    """P25–P75 for the role from the local salary benchmarks, or ``None``."""
+    try:
+        from need_analysis.salary import get_salary_store, occupation_code, seniority_of
+    except ImportError:  # numpy missing
+        return None
+    title = state.get("job_title", "")
+    store = get_salary_store()
+    if store is None or not title or not (code := occupation_code(title)):
+        return None
+    from need_analysis.typed import parse_currency, parse_period
+
+    currency = parse_currency(state.get("salary_currency") or "") or "EUR"
+    period = parse_period(state.get("pay_frequency") or "") or "year"
+    bench = store.lookup(
+        code,
+        state.get("city") or state.get("work_location_city") or "",
+        seniority_of(state.get("seniority_level") or title),
+        currency if currency in store.rates else "EUR",
+        period,
+    )
+    if bench is None:
+        return None
+    digits = -2 if period in ("year", "month") else 2
+    return round(bench.p25, digits), round(bench.p75, digits)
+
+
+@processor(
+    reads=(
+        "salary_min",
+        "salary_max",
+        "job_title",
+        "seniority_level",
+        "city",
+        "work_location_city",
+        "salary_currency",
+        "pay_frequency",
+    ),
+    writes=("salary_min", "salary_max"),
+)
 def update_salary_range(state: dict[str, Any]) -> None:
-    """Provide a simple salary range estimate (EUR)."""
+    """Suggest the P25–P75 salary band of the role.
+
+    Uses the local salary benchmarks (``need_analysis.salary``) when the
+    role maps to an occupation code, otherwise a generic 60,000–80,000 EUR.
+    """
     if state.get("salary_min") or state.get("salary_max"):
         return
-    state["salary_min"], state["salary_max"] = 60000, 80000
+    state["salary_min"], state["salary_max"] = _salary_benchmark(state) or (
+        60000,
+        80000,
+    )
 
 
+@processor(
+    reads=("publication_channels", "is_remote"), writes=("publication_channels",)
+)
 def update_publication_channels(state: dict[str, Any]) -> None:
     """Recommend publication channels for remote roles."""
     if state.get("publication_channels"):
@@ -69,26 +171,47 @@ def update_publication_channels(state: dict[str, Any]) -> None:
     state["publication_channels"] = channels
 
 
+@processor(reads=("bonus_scheme", "job_title"), writes=("bonus_scheme",))
 def update_bonus_scheme(state: dict[str, Any]) -> None:
-    """Add a bonus scheme suggestion for mid/senior roles."""
+    """Add a bonus scheme suggestion for senior and executive roles."""
     if state.get("bonus_scheme"):
         return
-    senior = any(word in state.get("job_title", "").lower() for word in ("senior", "lead"))
-    if senior:
-        state["bonus_scheme"] = "Annual performance bonus up to 15 % of salary."
+    if bonus := role_suggestions(state.get("job_title", "")).get("bonus_scheme"):
+        state["bonus_scheme"] = bonus
 
 
+@processor(
+    reads=("commission_structure", "job_title"), writes=("commission_structure",)
+)
 def update_commission_structure(state: dict[str, Any]) -> None:
     """Suggest commission structure for sales roles."""
     if state.get("commission_structure"):
         return
-    if "sales" in state.get("job_title", "").lower():
-        state["commission_structure"] = "Quarterly quota with 8 % commission on gross profit."
+    if commission := role_suggestions(state.get("job_title", "")).get(
+        "commission_structure"
+    ):
+        state["commission_structure"] = commission
 
 
+@processor(reads=("translation_required", "language"), writes=("translation_required",))
 def update_translation_required(state: dict[str, Any]) -> None:
     """Mark whether translation is needed (DE ⇄ EN)."""
     if state.get("translation_required") is not None:
         return
     lang = state.get("language", "de")
     state["translation_required"] = lang not in ("de", "en")
+
+
+PROCESSORS = Engine(
+    [
+        update_task_list,
+        update_must_have_skills,
+        normalize_must_have_skills,
+        update_nice_to_have_skills,
+        update_salary_range,
+        update_publication_channels,
+        update_bonus_scheme,
+        update_commission_structure,
+        update_translation_required,
+    ]
+)
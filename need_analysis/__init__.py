@@ -0,0 +1,40 @@
+"""Headless extraction core of the Recruitment Need Analysis Tool.
+
+Importable from workers, scripts and tests without Streamlit. Submodules are
+loaded on first attribute access so ``import need_analysis`` stays cheap::
+
+    from need_analysis import extract, pdf_text
+"""
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    "ExtractResult": "need_analysis.schema",
+    "MUST_HAVE_KEYS": "need_analysis.schema",
+    "STEPS": "need_analysis.schema",
+    "DATE_KEYS": "need_analysis.schema",
+    "MONTH_KEYS": "need_analysis.schema",
+    "REGEX_PATTERNS": "need_analysis.patterns",
+    "pattern_search": "need_analysis.patterns",
+    "llm_fill": "need_analysis.llm",
+    "extract": "need_analysis.extraction",
+    "html_text": "need_analysis.ingest",
+    "http_text": "need_analysis.ingest",
+    "pdf_text": "need_analysis.ingest",
+    "docx_text": "need_analysis.ingest",
+    "normalize_text": "need_analysis.text_normalize",
+    "detect_language": "need_analysis.lang_detect",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
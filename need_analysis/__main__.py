@@ -0,0 +1,5 @@
+import sys
+
+from need_analysis.cli import main
+
+sys.exit(main())
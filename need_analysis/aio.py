@@ -0,0 +1,44 @@
+"""Shared background event loop for async I/O outside the Streamlit script thread."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide background loop, starting it on first use.
+
+    Pooled clients (``httpx.AsyncClient`` …) are bound to the loop they were
+    created on, so every coroutine that uses them must run here rather than in
+    a fresh ``asyncio.run()`` per Streamlit rerun.
+    """
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="need-analysis-aio", daemon=True
+            ).start()
+        return _loop
+
+
+def submit(coro: Coroutine[Any, Any, T]) -> Future[T]:
+    """Schedule ``coro`` on the background loop and return a thread-safe future."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def run_sync(coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+    """Run ``coro`` on the background loop and block until it returns.
+
+    Args:
+        coro: Coroutine to execute.
+        timeout: Seconds to wait before raising ``TimeoutError``.
+    """
+    return submit(coro).result(timeout)
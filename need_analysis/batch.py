@@ -0,0 +1,197 @@
+"""Bulk extraction over folders of job ads.
+
+Ingestion, normalization, the regex stage and the post-LLM refinement are
+CPU-bound and run in a process pool; the LLM stage runs on the caller's event
+loop with a bounded number of concurrent requests. Results are written as JSONL the moment each
+document finishes, in completion order. With a :class:`Manifest` every stage
+is checkpointed, so an interrupted run resumes instead of starting over;
+documents finished by an earlier run are written from the manifest, so the
+output holds every document exactly once.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, TextIO
+
+from need_analysis.extraction import llm_stage, refine_stage, regex_stage
+from need_analysis.ingest import SUPPORTED_SUFFIXES, file_text
+from need_analysis.manifest import Checkpoint, Manifest, content_hash, in_shard
+from need_analysis.schema import ExtractResult
+from need_analysis.text_normalize import normalize_text
+
+
+@dataclass
+class DocResult:
+    path: str
+    fields: dict[str, ExtractResult] | None = None
+    error: str | None = None
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "path": self.path,
+                "error": self.error,
+                "fields": {k: asdict(v) for k, v in (self.fields or {}).items()},
+            },
+            ensure_ascii=False,
+        )
+
+
+def iter_documents(root: Path) -> Iterator[Path]:
+    """Yield supported files below ``root`` in a stable order."""
+    for path in sorted(root.rglob("*")):
+        if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES:
+            yield path
+
+
+def prepare_document(path: str) -> tuple[str, dict[str, ExtractResult]]:
+    """Pool worker: file → normalized text → regex stage."""
+    text = normalize_text(file_text(path)).text
+    return text, regex_stage(text)
+
+
+class Progress:
+    """Single-line progress bar with docs/sec, redrawn at most every 0.2 s."""
+
+    def __init__(
+        self, total: int, stream: TextIO | None = None, width: int = 30
+    ) -> None:
+        # resolved per instance so redirected/captured stderr is honoured
+        self.total, self.stream, self.width = total, stream or sys.stderr, width
+        self.done = self.failed = self.skipped = 0
+        self.started = time.perf_counter()
+        self._drawn = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Processed docs/sec; documents skipped via the manifest don't count."""
+        elapsed = time.perf_counter() - self.started
+        return (self.done - self.skipped) / elapsed if elapsed else 0.0
+
+    def advance(self, failed: bool = False, skipped: bool = False) -> None:
+        self.done += 1
+        self.failed += failed
+        self.skipped += skipped
+        now = time.perf_counter()
+        if now - self._drawn >= 0.2 or self.done == self.total:
+            self._drawn = now
+            self.draw()
+
+    def draw(self) -> None:
+        share = self.done / self.total if self.total else 1.0
+        bar = "#" * int(share * self.width)
+        eta = (self.total - self.done) / self.rate if self.rate else 0.0
+        self.stream.write(
+            f"\r[{bar:<{self.width}}] {self.done}/{self.total} "
+            f"{self.rate:6.1f} docs/s  skipped={self.skipped}  failed={self.failed}  eta={eta:5.0f}s"
+        )
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.draw()
+        self.stream.write("\n")
+
+
+async def run_batch(
+    paths: Iterable[Path],
+    out: TextIO,
+    *,
+    workers: int,
+    llm_concurrency: int = 8,
+    use_llm: bool = True,
+    progress: Progress | None = None,
+    manifest: Manifest | None = None,
+    shard: tuple[int, int] | None = None,
+) -> Counter:
+    """Extract every file in ``paths`` and stream one JSON line per document.
+
+    Args:
+        paths: Files to process.
+        out: Text stream receiving JSONL; flushed after every line.
+        workers: Processes for ingestion + regex.
+        llm_concurrency: Simultaneous LLM requests on this loop.
+        use_llm: ``False`` stops after the regex stage (and the refinement).
+        progress: Optional progress bar to advance.
+        manifest: Checkpoint store (see :mod:`need_analysis.manifest`);
+            documents that already reached the target stage are not
+            processed again but written from their checkpoint, partial ones
+            resume. ``None`` processes everything.
+        shard: ``(K, N)`` – only process documents in the K-th of N
+            content-hash ranges, so several machines can split one corpus.
+
+    Returns:
+        Counter with ``ok``, ``failed`` and ``skipped`` totals.
+    """
+    loop = asyncio.get_running_loop()
+    llm_slots = asyncio.Semaphore(llm_concurrency)
+    # bounds texts held in memory
+    in_flight = asyncio.Semaphore(workers + llm_concurrency)
+    summary: Counter = Counter()
+    target = "llm" if use_llm else "refined"
+    pending: set[asyncio.Task] = set()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+
+        async def one(path: Path, digest: str | None, ckpt: Checkpoint | None) -> None:
+            key = str(path)
+            try:
+                if ckpt and ckpt.stage == "regex" and ckpt.text is not None:
+                    text, fields = ckpt.text, ckpt.fields  # resume at the LLM stage
+                elif ckpt and ckpt.stage == "refined" and ckpt.text is not None:
+                    # a regex-only result is refined already: start over from its text
+                    text = ckpt.text
+                    fields = await loop.run_in_executor(pool, regex_stage, text)
+                else:
+                    text, fields = await loop.run_in_executor(
+                        pool, prepare_document, key
+                    )
+                    if manifest and use_llm:
+                        manifest.record(key, digest, "regex", fields, text)
+                if use_llm:
+                    async with llm_slots:
+                        fields = await llm_stage(fields, text)
+                # CPU work (typed parsing, ESCO loads) must not stall the other LLM calls
+                fields = await loop.run_in_executor(pool, refine_stage, fields)
+                if manifest:  # after the last stage, so `export` matches this output
+                    manifest.record(key, digest, target, fields, text)
+                res = DocResult(key, fields)
+            except Exception as exc:  # noqa: BLE001 – record and keep going
+                res = DocResult(key, error=f"{type(exc).__name__}: {exc}")
+                if manifest:
+                    manifest.record_failure(key, digest, res.error)
+            finally:
+                in_flight.release()
+            out.write(res.to_json() + "\n")
+            out.flush()
+            summary["failed" if res.error else "ok"] += 1
+            if progress:
+                progress.advance(failed=res.error is not None)
+
+        for path in paths:
+            digest = ckpt = None
+            if manifest or shard:
+                digest = await loop.run_in_executor(None, content_hash, path)
+                if shard and not in_shard(digest, *shard):
+                    if progress:
+                        progress.total -= 1
+                    continue
+                ckpt = manifest.checkpoint(str(path), digest) if manifest else None
+                if ckpt and ckpt.reached(target):
+                    out.write(DocResult(str(path), ckpt.fields).to_json() + "\n")
+                    summary["skipped"] += 1
+                    if progress:
+                        progress.advance(skipped=True)
+                    continue
+            await in_flight.acquire()
+            task = asyncio.create_task(one(path, digest, ckpt))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        await asyncio.gather(*pending)
+    return summary
@@ -0,0 +1,285 @@
+"""Concurrent bulk URL ingestion with per-host politeness.
+
+Pipeline (all stages bounded, so memory stays flat for long URL lists)::
+
+    urls ─▶ fetch workers ─▶ pages queue ─▶ extract workers ─▶ results queue ─▶ caller
+
+Fetching honours ``robots.txt`` (allow rules and ``Crawl-delay``), caps the
+number of in-flight requests per host and retries transient failures with
+exponential backoff.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+from need_analysis.aio import run_sync
+from need_analysis.http_fetch import USER_AGENT, FetchError, fetch_text
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE = {
+    "timeout",
+    "network",
+    "http_429",
+    "http_500",
+    "http_502",
+    "http_503",
+    "http_504",
+}
+_DONE = object()
+
+
+@dataclass
+class IngestResult:
+    url: str
+    fields: dict[str, Any] | None = None
+    error: str | None = None
+    attempts: int = 0
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkReport:
+    total: int = 0
+    succeeded: int = 0
+    failures: Counter = field(default_factory=Counter)
+    cache_hits: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    finished: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def docs_per_sec(self) -> float:
+        done = self.succeeded + sum(self.failures.values())
+        return done / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": sum(self.failures.values()),
+            "failures": dict(self.failures),
+            "cache_hits": self.cache_hits,
+            "elapsed_s": round(self.elapsed, 2),
+            "docs_per_sec": round(self.docs_per_sec, 2),
+        }
+
+
+# ── Per-host politeness ───────────────────────────────────────────────────────
+class _Host:
+    """Concurrency slot, robots rules and crawl-delay clock for one host."""
+
+    def __init__(self, per_host: int, min_delay: float) -> None:
+        self.slots = asyncio.Semaphore(per_host)
+        self.delay = min_delay
+        self.next_at = 0.0
+        self.robots: RobotFileParser | None = None
+        self.robots_failed = False
+        self.robots_lock = asyncio.Lock()
+
+    async def allowed(self, url: str) -> bool:
+        """Whether robots.txt lets us fetch ``url``; the first call per host fetches it.
+
+        The robots.txt request takes a slot and a turn like any page. A 4xx means
+        there are no rules; any other failure (5xx, timeout, network) disallows
+        the whole host and sets :attr:`robots_failed`.
+        """
+        async with self.robots_lock:
+            if self.robots is None:
+                parts = urlsplit(url)
+                self.robots = RobotFileParser()
+                try:
+                    async with self.slots:
+                        await self.wait_turn()
+                        res = await fetch_text(
+                            f"{parts.scheme}://{parts.netloc}/robots.txt"
+                        )
+                    self.robots.parse(res.text.splitlines())
+                except FetchError as exc:
+                    if exc.status is not None and 400 <= exc.status < 500:
+                        self.robots.parse([])  # no robots.txt → everything allowed
+                    else:
+                        logger.warning(
+                            "robots.txt of %s unavailable: %s", parts.netloc, exc
+                        )
+                        self.robots_failed = True
+                        self.robots.parse(["User-agent: *", "Disallow: /"])
+                crawl_delay = self.robots.crawl_delay(USER_AGENT)
+                if crawl_delay:
+                    self.delay = max(self.delay, float(crawl_delay))
+        return self.robots.can_fetch(USER_AGENT, url)
+
+    async def wait_turn(self) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self.next_at)
+        self.next_at = start + self.delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+# ── Pipeline ------------------------------------------------------------------
+async def iter_ingest(
+    urls: Iterable[str],
+    *,
+    parse: Callable[[str], str] | None = None,
+    extract: Callable[[str], Awaitable[dict[str, Any]]] | None = None,
+    concurrency: int = 16,
+    per_host: int = 2,
+    extract_workers: int = 4,
+    retries: int = 3,
+    backoff: float = 1.0,
+    min_delay: float = 0.0,
+    queue_size: int = 32,
+    report: BulkReport | None = None,
+) -> AsyncIterator[IngestResult]:
+    """Fetch, parse and extract ``urls`` concurrently, yielding results as they finish.
+
+    Args:
+        urls: Job ad URLs; duplicates are fetched once.
+        parse: HTML → text; defaults to ``html_text``. Cached with the body.
+        extract: Async field extractor; defaults to ``extract``.
+        concurrency: Total in-flight fetches.
+        per_host: In-flight fetches per host.
+        extract_workers: Parallel extraction coroutines (LLM calls).
+        retries: Extra attempts for transient failures.
+        backoff: Base seconds for exponential backoff.
+        min_delay: Minimum gap between requests to one host; raised by
+            ``Crawl-delay`` in robots.txt.
+        queue_size: Bound of the inter-stage queues.
+        report: Collects counts and throughput while iterating.
+    """
+    if parse is None:
+        from need_analysis.ingest import html_text as parse
+    if extract is None:
+        from need_analysis.extraction import extract
+    report = report if report is not None else BulkReport()
+    todo: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    pages: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    results: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    hosts: dict[str, _Host] = {}
+
+    def host_for(url: str) -> _Host:
+        netloc = urlsplit(url).netloc.lower()
+        if netloc not in hosts:
+            hosts[netloc] = _Host(per_host, min_delay)
+        return hosts[netloc]
+
+    async def feed() -> None:
+        seen: set[str] = set()
+        for url in urls:
+            url = url.strip()
+            if url and url not in seen:
+                seen.add(url)
+                report.total += 1
+                await todo.put(url)
+        for _ in range(concurrency):
+            await todo.put(_DONE)
+
+    async def fetch_one(url: str) -> None:
+        host = host_for(url)
+        if not await host.allowed(url):
+            error = "robots_unavailable" if host.robots_failed else "robots_disallowed"
+            await results.put(IngestResult(url, error=error))
+            return
+        for attempt in range(1, retries + 2):
+            try:
+                async with host.slots:
+                    await host.wait_turn()
+                    res = await fetch_text(url, parse=parse)
+                await pages.put((url, res.text, attempt, res.from_cache))
+                return
+            except FetchError as exc:
+                if exc.reason not in RETRYABLE or attempt > retries:
+                    await results.put(
+                        IngestResult(url, error=exc.reason, attempts=attempt)
+                    )
+                    return
+                await asyncio.sleep(
+                    backoff * 2 ** (attempt - 1) * (1 + random.random() / 2)
+                )
+
+    async def fetcher() -> None:
+        while (url := await todo.get()) is not _DONE:
+            await fetch_one(url)
+
+    async def extractor() -> None:
+        while (item := await pages.get()) is not _DONE:
+            url, text, attempts, cached = item
+            try:
+                fields = await extract(text)
+                await results.put(
+                    IngestResult(url, fields, attempts=attempts, from_cache=cached)
+                )
+            except Exception as exc:  # noqa: BLE001
+                # one bad page must not stop the run
+                logger.warning("Extraction failed for %s: %s", url, exc)
+                await results.put(
+                    IngestResult(url, error="extract_error", attempts=attempts)
+                )
+
+    workers: list[asyncio.Task] = []
+
+    async def run() -> None:
+        fetchers = [asyncio.create_task(fetcher()) for _ in range(concurrency)]
+        extractors = [asyncio.create_task(extractor()) for _ in range(extract_workers)]
+        workers.extend(fetchers + extractors)
+        await feed()
+        await asyncio.gather(*fetchers)
+        for _ in extractors:
+            await pages.put(_DONE)
+        await asyncio.gather(*extractors)
+        await results.put(_DONE)
+
+    runner = asyncio.create_task(run())
+    try:
+        while (res := await results.get()) is not _DONE:
+            if res.ok:
+                report.succeeded += 1
+                report.cache_hits += res.from_cache
+            else:
+                report.failures[res.error] += 1
+            yield res
+        await runner
+    finally:
+        report.finished = time.perf_counter()
+        # the consumer may stop early: no fetch or LLM call outlives the iterator
+        pending = [t for t in (runner, *workers) if not t.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        logger.info("Bulk ingestion: %s", report.as_dict())
+
+
+async def ingest_urls(
+    urls: Iterable[str], *, report: BulkReport | None = None, **kwargs: Any
+) -> tuple[list[IngestResult], BulkReport]:
+    """Collect :func:`iter_ingest` into a list plus the final report.
+
+    Pass ``report`` to watch the counts from another thread while it runs.
+    """
+    report = report if report is not None else BulkReport()
+    out = [res async for res in iter_ingest(urls, report=report, **kwargs)]
+    return out, report
+
+
+def ingest_urls_sync(
+    urls: Iterable[str], **kwargs: Any
+) -> tuple[list[IngestResult], BulkReport]:
+    """Blocking wrapper for Streamlit; runs on the shared background loop."""
+    return run_sync(ingest_urls(urls, **kwargs))
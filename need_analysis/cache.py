@@ -0,0 +1,168 @@
+"""Process-wide extraction cache bounded by bytes, not entries.
+
+Sessions that extract the same ad (same content hash) share one cached
+result instead of each pinning its own copy. Entries are charged by their
+estimated in-memory size; raw texts above ``spill_bytes`` are written to
+disk and only re-read on demand, so a long-running server holds the small
+records (:class:`~need_analysis.record.JobRequisition`) in RAM and little else.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from need_analysis.record import JobRequisition
+from need_analysis.schema import ExtractResult
+
+logger = logging.getLogger(__name__)
+
+BUDGET_BYTES = int(os.getenv("NEED_ANALYSIS_CACHE_MB", "256")) * 1024 * 1024
+SPILL_BYTES = 64 * 1024
+
+
+def deep_sizeof(obj: Any, _seen: set[int] | None = None) -> int:
+    """Estimate the memory held by ``obj`` and everything it references.
+
+    Shared objects are counted once. Covers the containers, dataclasses and
+    slotted records used by the pipeline; it is an estimate, not a heap walk.
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    elif hasattr(obj, "__slots__"):
+        size += sum(
+            deep_sizeof(getattr(obj, s), seen) for s in obj.__slots__ if hasattr(obj, s)
+        )
+    return size
+
+
+@dataclass
+class CachedExtraction:
+    """One cached result. ``text`` is ``None`` in memory once spilled to ``text_path``."""
+
+    fields: JobRequisition
+    text: str | None = None
+    text_path: Path | None = None
+
+    def raw_text(self) -> str:
+        """The normalized ad text, read back from disk if it was spilled."""
+        if self.text is not None:
+            return self.text
+        try:
+            return self.text_path.read_text(encoding="utf-8") if self.text_path else ""
+        except FileNotFoundError:  # evicted while a session still held the entry
+            return ""
+
+
+class ByteBudgetLRU:
+    """Thread-safe LRU of :class:`CachedExtraction` keyed by content hash.
+
+    Args:
+        budget_bytes: Upper bound for the estimated in-memory size of all entries.
+        spill_dir: Where raw texts larger than ``spill_bytes`` go; defaults to a
+            private temporary directory.
+        spill_bytes: Size above which a raw text is kept on disk only.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = BUDGET_BYTES,
+        spill_dir: str | Path | None = None,
+        spill_bytes: int = SPILL_BYTES,
+    ) -> None:
+        self.budget_bytes = budget_bytes
+        self.spill_bytes = spill_bytes
+        self.spill_dir = Path(
+            spill_dir or tempfile.mkdtemp(prefix="need_analysis_cache_")
+        )
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: OrderedDict[str, tuple[CachedExtraction, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = self.spilled = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> CachedExtraction | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(
+        self,
+        key: str,
+        fields: dict[str, ExtractResult] | JobRequisition,
+        text: str | None = None,
+    ) -> CachedExtraction:
+        """Store a result and return the shared entry sessions should reference."""
+        if not isinstance(fields, JobRequisition):
+            fields = JobRequisition.from_results(fields)
+        entry = CachedExtraction(fields, text)
+        if text is not None and len(text) > self.spill_bytes:
+            path = self.spill_dir / f"{key}.txt"
+            path.write_text(text, encoding="utf-8")
+            entry.text, entry.text_path = None, path
+            self.spilled += 1
+        size = deep_sizeof(entry)
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (entry, size)
+            self.bytes += size
+            evicted = self._evict()
+        if evicted:
+            logger.debug(
+                "Evicted %d extraction(s); %d/%d bytes",
+                len(evicted),
+                self.bytes,
+                self.budget_bytes,
+            )
+        for old in evicted:
+            if old.text_path is not None:
+                old.text_path.unlink(missing_ok=True)
+        return entry
+
+    def _evict(self) -> list[CachedExtraction]:
+        evicted = []
+        while self.bytes > self.budget_bytes and len(self._entries) > 1:
+            _, (old, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+            evicted.append(old)
+        return evicted
+
+    def stats(self) -> dict[str, int]:
+        """Entry count, accounted bytes, budget and hit/miss/eviction/spill counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "spilled": self.spilled,
+        }
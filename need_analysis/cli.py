@@ -0,0 +1,203 @@
+"""Command-line entry point: ``python -m need_analysis <command>``."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+
+def _cmd_extract(args: argparse.Namespace) -> int:
+    from need_analysis import llm
+    from need_analysis.batch import Progress, iter_documents, run_batch
+    from need_analysis.manifest import Manifest, parse_shard
+
+    if not args.directory.is_dir():
+        print(f"Not a directory: {args.directory}", file=sys.stderr)
+        return 2
+    if not args.no_llm and not llm.get_api_key():
+        print(
+            "OPENAI_API_KEY is not set – use --no-llm for a regex-only run.",
+            file=sys.stderr,
+        )
+        return 2
+
+    try:
+        shard = parse_shard(args.shard) if args.shard else None
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+
+    # checkpointing is on by default so an interrupted run resumes; --no-manifest opts out
+    manifest = (
+        None
+        if args.no_manifest
+        else Manifest(args.manifest or args.out.with_suffix(".manifest.sqlite"))
+    )
+    paths = list(iter_documents(args.directory))
+    progress = Progress(len(paths))
+    # a resumed run rewrites the file: skipped documents are replayed from the manifest
+    with args.out.open("w", encoding="utf-8") as out:
+        summary = asyncio.run(
+            run_batch(
+                paths,
+                out,
+                workers=args.workers,
+                llm_concurrency=args.llm_concurrency,
+                use_llm=not args.no_llm,
+                progress=progress,
+                manifest=manifest,
+                shard=shard,
+            )
+        )
+    progress.close()
+    if manifest:
+        manifest.close()
+    print(
+        json.dumps({**summary, "docs_per_sec": round(progress.rate, 2)}),
+        file=sys.stderr,
+    )
+    return 1 if summary["failed"] else 0
+
+
+def _cmd_export(args: argparse.Namespace) -> int:
+    from dataclasses import asdict
+
+    from need_analysis.manifest import Manifest
+
+    manifest = Manifest(args.manifest)
+    with args.out.open("w", encoding="utf-8") as out:
+        for path, fields in manifest.results(args.stage):
+            row = {
+                "path": path,
+                "error": None,
+                "fields": {k: asdict(v) for k, v in fields.items()},
+            }
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    print(json.dumps(manifest.counts()), file=sys.stderr)
+    manifest.close()
+    return 0
+
+
+def _cmd_worker(args: argparse.Namespace) -> int:
+    from need_analysis.worker import run_workers
+
+    run_workers(args.queue, args.processes, args.concurrency)
+    return 0
+
+
+def _cmd_queue_stats(args: argparse.Namespace) -> int:
+    from need_analysis.jobs import JobQueue
+
+    queue = JobQueue(args.queue)
+    stats = queue.stats()
+    queue.close()
+    if args.prometheus:
+        for key, value in stats.items():
+            print(f"need_analysis_queue_{key} {value}")
+    else:
+        print(json.dumps(stats))
+    return 0
+
+
+def _cmd_esco_import(args: argparse.Namespace) -> int:
+    import logging
+
+    from need_analysis.esco.importer import import_csv
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    try:
+        counts = import_csv(args.sources, args.db, args.languages)
+    except FileNotFoundError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    print(json.dumps(counts))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m need_analysis")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser(
+        "extract", help="Extract fields from a folder of PDF / DOCX / TXT job ads"
+    )
+    p.add_argument("directory", type=Path)
+    p.add_argument(
+        "--out", type=Path, default=Path("results.jsonl"), help="JSONL output file"
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="ingest + regex processes",
+    )
+    p.add_argument(
+        "--llm-concurrency", type=int, default=8, help="simultaneous LLM requests"
+    )
+    p.add_argument("--no-llm", action="store_true", help="stop after the regex stage")
+    p.add_argument(
+        "--manifest",
+        type=Path,
+        help="checkpoint DB, always kept so a rerun resumes (default: <out>.manifest.sqlite)",
+    )
+    p.add_argument(
+        "--no-manifest", action="store_true", help="no checkpoints: a rerun starts over"
+    )
+    p.add_argument(
+        "--shard", metavar="K/N", help="process only hash range K of N (0-based)"
+    )
+    p.set_defaults(func=_cmd_extract)
+
+    p = sub.add_parser(
+        "export", help="Write all completed documents of a manifest as JSONL"
+    )
+    p.add_argument("manifest", type=Path)
+    p.add_argument("--out", type=Path, default=Path("results.jsonl"))
+    p.add_argument(
+        "--stage",
+        choices=("regex", "refined", "llm"),
+        default="llm",
+        help="minimum stage reached",
+    )
+    p.set_defaults(func=_cmd_export)
+
+    default_queue = os.getenv("NEED_ANALYSIS_QUEUE", "jobs.sqlite")
+    p = sub.add_parser("worker", help="Run extraction workers against a job queue")
+    p.add_argument("--queue", type=Path, default=Path(default_queue))
+    p.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    p.add_argument(
+        "--concurrency", type=int, default=4, help="jobs in flight per process"
+    )
+    p.set_defaults(func=_cmd_worker)
+
+    p = sub.add_parser(
+        "queue-stats", help="Print queue depth and job counts (autoscaling metric)"
+    )
+    p.add_argument("--queue", type=Path, default=Path(default_queue))
+    p.add_argument("--prometheus", action="store_true", help="Prometheus text format")
+    p.set_defaults(func=_cmd_queue_stats)
+
+    from need_analysis.esco import DB_PATH
+
+    p = sub.add_parser(
+        "esco-import", help="Build the offline ESCO index from the CSV dump"
+    )
+    p.add_argument(
+        "sources", type=Path, nargs="+", help="folders with the ESCO CSV files"
+    )
+    p.add_argument(
+        "--db", type=Path, default=DB_PATH, help=f"index file (default: {DB_PATH})"
+    )
+    p.add_argument(
+        "--languages", nargs="+", default=["en", "de"], help="label languages to keep"
+    )
+    p.set_defaults(func=_cmd_esco_import)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
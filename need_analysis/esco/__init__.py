@@ -0,0 +1,20 @@
+"""Offline ESCO taxonomy: CSV importer and a SQLite FTS5 index.
+
+Build the index once from the downloadable ESCO CSV dump (one folder per
+language)::
+
+    python -m need_analysis esco-import ~/Downloads/ESCO_en ~/Downloads/ESCO_de
+
+Lookups are then local SQLite queries instead of calls to the ESCO REST API.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+DB_PATH = Path(
+    os.getenv(
+        "NEED_ANALYSIS_ESCO_DB",
+        Path.home() / ".cache" / "need_analysis" / "esco.sqlite",
+    )
+)
@@ -0,0 +1,269 @@
+"""Async ESCO REST client – pooled connections, TTL cache, one request per title.
+
+A full occupation search (``full=true``) already carries the description and
+the essential / optional skill links, so one round trip answers both the
+skills and the tasks question for a job title. Profiles are cached with a
+TTL, and concurrent lookups of the same title share one in-flight request.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Generic, Hashable, Iterable, TypeVar
+
+import httpx
+
+from need_analysis.aio import run_sync
+from need_analysis.esco.matcher import clean_title
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://ec.europa.eu/esco/api"
+TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=8)
+CACHE_TTL = 24 * 3600.0  # ESCO releases are months apart
+CACHE_SIZE = 2048
+CONCURRENCY = 8
+
+V = TypeVar("V")
+_MISSING = object()
+
+
+# ── TTL cache ─────────────────────────────────────────────────────────────────
+class TTLCache(Generic[V]):
+    """Thread-safe LRU whose entries also expire ``ttl`` seconds after insertion.
+
+    ``None`` is a valid value, so "no occupation found" is cached as well.
+    """
+
+    def __init__(self, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                self._data.pop(key, None)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+@dataclass(frozen=True, slots=True)
+class OccupationProfile:
+    """Everything the wizard needs about one occupation."""
+
+    uri: str
+    label: str
+    essential_skills: tuple[str, ...] = ()
+    optional_skills: tuple[str, ...] = ()
+    description: str = ""
+
+    @property
+    def tasks(self) -> list[str]:
+        """Sentences of the description – ESCO has no separate task list."""
+        return [s.strip() for s in self.description.split(".") if s.strip()]
+
+
+# ── Pooled clients ────────────────────────────────────────────────────────────
+# Connections and futures belong to the loop that created them, so the pool and
+# the in-flight requests are kept per loop; entries go away with their loop.
+_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, httpx.AsyncClient
+] = weakref.WeakKeyDictionary()
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the pooled client of the running loop (normally the shared background loop)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(
+            base_url=BASE_URL, timeout=TIMEOUT, limits=LIMITS
+        )
+    return client
+
+
+_profiles: TTLCache[OccupationProfile | None] = TTLCache()
+_searches: TTLCache[tuple[str, ...]] = TTLCache()
+_inflight: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple[str, str], asyncio.Future]
+] = weakref.WeakKeyDictionary()
+
+
+def _key(job_title: str, language: str) -> tuple[str, str]:
+    """Cache key; ``Data Scientist (m/w/d)`` and ``data scientist`` share one entry."""
+    return clean_title(job_title) or job_title.strip().lower(), language
+
+
+async def _get(path: str, params: dict[str, Any]) -> dict[str, Any]:
+    resp = await get_client().get(path, params=params)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _titles(links: dict[str, Any], relation: str) -> tuple[str, ...]:
+    return tuple(s["title"] for s in links.get(relation, []) if s.get("title"))
+
+
+def _profile(resource: dict[str, Any], language: str) -> OccupationProfile:
+    links = resource.get("_links", {})
+    return OccupationProfile(
+        uri=resource.get("uri", ""),
+        label=resource.get("title", ""),
+        essential_skills=_titles(links, "hasEssentialSkill"),
+        optional_skills=_titles(links, "hasOptionalSkill"),
+        description=resource.get("description", {})
+        .get(language, {})
+        .get("literal", ""),
+    )
+
+
+async def _fetch_profile(job_title: str, language: str) -> OccupationProfile | None:
+    data = await _get(
+        "/search",
+        {
+            "text": _key(job_title, language)[0],
+            "language": language,
+            "type": "occupation",
+            "limit": 1,
+            "full": "true",
+        },
+    )
+    results = data.get("_embedded", {}).get("results", [])
+    if not results:
+        return None
+    resource = results[0]
+    if "_links" not in resource or "description" not in resource:
+        # older API versions return only the hit summary – one extra request
+        resource = await _get(
+            "/resource/occupation", {"uri": resource.get("uri"), "language": language}
+        )
+    return _profile(resource, language)
+
+
+# ── Public API ────────────────────────────────────────────────────────────────
+async def occupation_profile(
+    job_title: str, *, language: str = "en"
+) -> OccupationProfile | None:
+    """Best matching occupation for ``job_title`` with skills and description.
+
+    Cached for :data:`CACHE_TTL`; concurrent calls for the same title on the
+    same event loop await the same request.
+
+    Raises:
+        httpx.HTTPError: On transport errors and non-success status codes.
+    """
+    key = _key(job_title, language)
+    cached = _profiles.get(key)
+    if cached is not _MISSING:
+        return cached
+    inflight = _inflight.setdefault(asyncio.get_running_loop(), {})
+    task = inflight.get(key)
+    if task is None:
+        task = inflight[key] = asyncio.ensure_future(
+            _fetch_profile(job_title, language)
+        )
+        task.add_done_callback(lambda t: _settle(inflight, key, t))
+    # shielded: a cancelled caller must not cancel the request others await
+    return await asyncio.shield(task)
+
+
+def _settle(
+    inflight: dict[tuple[str, str], asyncio.Future],
+    key: tuple[str, str],
+    task: asyncio.Future,
+) -> None:
+    inflight.pop(key, None)
+    if not task.cancelled() and task.exception() is None:
+        _profiles.put(key, task.result())
+
+
+async def occupation_profiles(
+    job_titles: Iterable[str], *, language: str = "en", concurrency: int = CONCURRENCY
+) -> dict[str, OccupationProfile | None]:
+    """Resolve many titles at once; failures map to ``None`` and are logged.
+
+    Duplicate titles cost one request, and at most ``concurrency`` requests
+    are in flight.
+    """
+    titles = list(dict.fromkeys(job_titles))
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(title: str) -> OccupationProfile | None:
+        async with sem:
+            try:
+                return await occupation_profile(title, language=language)
+            except httpx.HTTPError as exc:
+                logger.warning("ESCO lookup for %r failed: %s", title, exc)
+                return None
+
+    return dict(zip(titles, await asyncio.gather(*(one(t) for t in titles))))
+
+
+async def search_skills(
+    query: str, *, language: str = "en", limit: int = 10
+) -> list[str]:
+    """Skill titles matching ``query`` (cached).
+
+    Raises:
+        httpx.HTTPError: On transport errors and non-success status codes.
+    """
+    key = (query.strip().lower(), language, limit)
+    cached = _searches.get(key)
+    if cached is _MISSING:
+        data = await _get(
+            "/search",
+            {"text": query, "language": language, "type": "skill", "limit": limit},
+        )
+        results = data.get("_embedded", {}).get("results", [])
+        cached = tuple(r["title"] for r in results if r.get("title"))
+        _searches.put(key, cached)
+    return list(cached)
+
+
+def occupation_profile_sync(
+    job_title: str, *, language: str = "en"
+) -> OccupationProfile | None:
+    """Blocking wrapper around :func:`occupation_profile` for Streamlit code.
+
+    A cache hit returns without touching the event loop.
+    """
+    cached = _profiles.get(_key(job_title, language))
+    if cached is not _MISSING:
+        return cached
+    return run_sync(occupation_profile(job_title, language=language))
+
+
+def cache_stats() -> dict[str, int]:
+    return {
+        "profiles": len(_profiles),
+        "profile_hits": _profiles.hits,
+        "profile_misses": _profiles.misses,
+        "searches": len(_searches),
+    }
@@ -0,0 +1,286 @@
+"""ESCO occupation → skill graph in CSR arrays.
+
+Essential and optional occupation–skill relations and the broader-skill
+hierarchy are stored as compressed sparse rows: a pointer array per source
+node and one flat array of target indices, all ``int32``. Expanding an
+occupation is two slices; expanding many occupations is one vectorised
+gather. The arrays are ``.npy`` files opened with ``mmap_mode="r"``, so
+every worker process shares them.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from need_analysis.esco import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+# reuse level → code; codes >= SPECIFIC count as "high" (distinctive for the role)
+REUSE_LEVELS = {
+    "transversal": 1,
+    "cross-sector": 2,
+    "sector-specific": 3,
+    "occupation-specific": 4,
+}
+SPECIFIC = 3
+_ARRAYS = (
+    "essential_ptr",
+    "essential_idx",
+    "optional_ptr",
+    "optional_idx",
+    "broader_ptr",
+    "broader_idx",
+    "reuse",
+)
+
+
+def graph_path(db_path: str | Path) -> Path:
+    """Directory where :mod:`.importer` stores the graph arrays for ``db_path``."""
+    return Path(db_path).with_suffix(".graph")
+
+
+def _csr(src: np.ndarray, dst: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """``(ptr, idx)`` with the targets of node ``i`` at ``idx[ptr[i]:ptr[i + 1]]``."""
+    order = np.argsort(src, kind="stable")  # keeps input order within a row
+    ptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src, minlength=n), out=ptr[1:])
+    return ptr, dst[order].astype(np.int32)
+
+
+def gather(
+    ptr: np.ndarray, idx: np.ndarray, rows: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Targets of many rows at once: ``(targets, row position of each target)``."""
+    starts = ptr[rows].astype(np.int64)
+    lens = ptr[rows + 1] - starts
+    total = int(lens.sum())
+    owner = np.repeat(np.arange(len(rows)), lens)
+    # position within the flat idx array: row start + offset inside the row
+    offsets = np.arange(total) - np.repeat(np.cumsum(lens) - lens, lens)
+    return idx[starts[owner] + offsets], owner
+
+
+@dataclass(frozen=True, slots=True)
+class OccupationSkills:
+    essential: list[str]
+    optional: list[str]
+    groups: list[str]  # broader skill groups of all essential and optional skills
+
+
+class SkillGraph:
+    """Essential / optional skills and skill groups of ESCO occupations."""
+
+    def __init__(
+        self,
+        occupations: list[str],
+        skills: list[str],
+        labels: dict[str, list[str]],
+        arrays: dict[str, np.ndarray],
+    ) -> None:
+        self.occupations = occupations
+        self.skills = skills  # skill and skill-group URIs; index = node id
+        self.labels = labels  # language → preferred label per node ("" if missing)
+        self.occupation_index = {uri: i for i, uri in enumerate(occupations)}
+        self.essential_ptr, self.essential_idx = (
+            arrays["essential_ptr"],
+            arrays["essential_idx"],
+        )
+        self.optional_ptr, self.optional_idx = (
+            arrays["optional_ptr"],
+            arrays["optional_idx"],
+        )
+        self.broader_ptr, self.broader_idx = (
+            arrays["broader_ptr"],
+            arrays["broader_idx"],
+        )
+        self.reuse = arrays["reuse"]  # REUSE_LEVELS code per node
+
+    @property
+    def languages(self) -> list[str]:
+        return list(self.labels)
+
+    # ── construction -----------------------------------------------------------
+    @classmethod
+    def from_db(cls, path: str | Path) -> SkillGraph:
+        """Build from the concepts, relations and hierarchy of an ESCO index."""
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            occupations = [
+                u
+                for (u,) in db.execute(
+                    "SELECT uri FROM concepts WHERE kind = 'occupation' ORDER BY uri"
+                )
+            ]
+            nodes = db.execute(
+                "SELECT uri, reuse_level FROM concepts WHERE kind IN ('skill', 'skillgroup') "
+                "ORDER BY kind, uri"
+            ).fetchall()
+            relations = db.execute(
+                "SELECT occupation_uri, skill_uri, relation FROM relations"
+            ).fetchall()
+            broader = db.execute("SELECT uri, broader_uri FROM broader").fetchall()
+            label_rows = db.execute(
+                "SELECT l.uri, l.lang, l.label FROM labels l JOIN concepts c USING (uri) "
+                "WHERE l.preferred = 1 AND c.kind IN ('skill', 'skillgroup')"
+            ).fetchall()
+        finally:
+            db.close()
+
+        skills = [u for u, _ in nodes]
+        node = {u: i for i, u in enumerate(skills)}
+        occ = {u: i for i, u in enumerate(occupations)}
+        reuse = np.array(
+            [
+                REUSE_LEVELS.get((level or "").rsplit("/", 1)[-1], 0)
+                for _, level in nodes
+            ],
+            dtype=np.uint8,
+        )
+        arrays: dict[str, np.ndarray] = {"reuse": reuse}
+        for relation in ("essential", "optional"):
+            pairs = [
+                (occ[o], node[s])
+                for o, s, r in relations
+                if r == relation and o in occ and s in node
+            ]
+            src, dst = np.array(pairs, dtype=np.int64).reshape(-1, 2).T
+            arrays[f"{relation}_ptr"], arrays[f"{relation}_idx"] = _csr(
+                src, dst, len(occupations)
+            )
+        pairs = [(node[s], node[b]) for s, b in broader if s in node and b in node]
+        src, dst = np.array(pairs, dtype=np.int64).reshape(-1, 2).T
+        arrays["broader_ptr"], arrays["broader_idx"] = _csr(src, dst, len(skills))
+
+        labels: dict[str, list[str]] = {}
+        for uri, lang, label in label_rows:
+            labels.setdefault(lang, [""] * len(skills))[node[uri]] = label
+        return cls(occupations, skills, labels, arrays)
+
+    # ── persistence ----------------------------------------------------------------
+    def save(self, path: str | Path) -> None:
+        """Write one ``.npy`` per array plus ``meta.json`` into directory ``path``."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        arrays = (
+            self.essential_ptr,
+            self.essential_idx,
+            self.optional_ptr,
+            self.optional_idx,
+            self.broader_ptr,
+            self.broader_idx,
+            self.reuse,
+        )
+        for name, array in zip(_ARRAYS, arrays):
+            np.save(path / f"{name}.npy", array)
+        meta = {
+            "occupations": self.occupations,
+            "skills": self.skills,
+            "labels": self.labels,
+        }
+        (path / "meta.json").write_text(
+            json.dumps(meta, ensure_ascii=False), encoding="utf-8"
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> SkillGraph:
+        """Memory-map a graph written by :meth:`save`."""
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r") for name in _ARRAYS
+        }
+        return cls(meta["occupations"], meta["skills"], meta["labels"], arrays)
+
+    # ── expansion -----------------------------------------------------------------
+    def essential(self, occupation: int) -> np.ndarray:
+        ptr = self.essential_ptr
+        return self.essential_idx[ptr[occupation] : ptr[occupation + 1]]
+
+    def optional(self, occupation: int) -> np.ndarray:
+        ptr = self.optional_ptr
+        return self.optional_idx[ptr[occupation] : ptr[occupation + 1]]
+
+    def broader(self, skills: np.ndarray) -> np.ndarray:
+        """Distinct broader nodes (skill groups) of ``skills``."""
+        targets, _ = gather(
+            self.broader_ptr, self.broader_idx, np.asarray(skills, dtype=np.int64)
+        )
+        return np.unique(targets)
+
+    def names(self, nodes: Iterable[int], language: str = "en") -> list[str]:
+        """Preferred labels of ``nodes``, falling back to English."""
+        labels = self.labels.get(language) or self.labels.get("en") or []
+        fallback = self.labels.get("en", labels)
+        return [labels[n] or fallback[n] for n in map(int, nodes)]
+
+    def expand(self, uri: str, language: str = "en") -> OccupationSkills | None:
+        """Essential and optional skills and their skill groups, or ``None`` for unknown URIs."""
+        if (o := self.occupation_index.get(uri)) is None:
+            return None
+        ess, opt = self.essential(o), self.optional(o)
+        groups = self.broader(np.concatenate([ess, opt]))
+        return OccupationSkills(
+            self.names(ess, language),
+            self.names(opt, language),
+            self.names(groups, language),
+        )
+
+    def prefill(
+        self, uris: Sequence[str], language: str = "en", limit: int = 10
+    ) -> list[dict[str, list[str]] | None]:
+        """``skills_must/nice_high/low`` for many occupations in one pass.
+
+        *must* are essential, *nice* optional skills; *high* are sector- or
+        occupation-specific, *low* cross-sector and transversal skills.
+        Unknown URIs give ``None``.
+        """
+        rows = np.array(
+            [self.occupation_index.get(u, -1) for u in uris], dtype=np.int64
+        )
+        known = rows >= 0
+        out: list[dict[str, list[str]] | None] = [
+            {} if k else None for k in known.tolist()
+        ]
+        positions = np.flatnonzero(known)
+        for (ptr, idx), prefix in (
+            ((self.essential_ptr, self.essential_idx), "skills_must"),
+            ((self.optional_ptr, self.optional_idx), "skills_nice"),
+        ):
+            targets, owner = gather(ptr, idx, rows[known])
+            high = self.reuse[targets] >= SPECIFIC
+            names = self.names(targets, language)
+            for pos in positions.tolist():
+                out[pos][f"{prefix}_high"] = []
+                out[pos][f"{prefix}_low"] = []
+            for name, row, is_high in zip(names, owner.tolist(), high.tolist()):
+                items = out[positions[row]][f"{prefix}_{'high' if is_high else 'low'}"]
+                if len(items) < limit:
+                    items.append(name)
+        return out
+
+
+_default: SkillGraph | None = None
+_default_path: Path | None = None
+_default_lock = threading.Lock()
+
+
+def get_graph(db_path: str | Path = DB_PATH) -> SkillGraph | None:
+    """Shared, memory-mapped graph for ``db_path``, or ``None`` if not built."""
+    global _default, _default_path
+    path = graph_path(db_path)
+    with _default_lock:
+        if _default is None or _default_path != path:
+            try:
+                _default, _default_path = SkillGraph.load(path), path
+            except (OSError, ValueError) as exc:
+                logger.debug("No skill graph at %s: %s", path, exc)
+                return None
+        return _default
@@ -0,0 +1,246 @@
+"""ESCO CSV dump → SQLite with FTS5 label search.
+
+The dump ships one folder per language with ``occupations_<lang>.csv``,
+``skills_<lang>.csv``, ``skillGroups_<lang>.csv`` and the language-independent
+relation files (``occupationSkillRelations_<lang>.csv``,
+``broaderRelationsSkillPillar_<lang>.csv``).
+Preferred and alternative labels of every language go into one FTS5 table;
+concepts, descriptions and relations into plain tables. The database is
+built next to the target and moved into place when complete; the trigram
+occupation matcher (:mod:`.matcher`), the skill vectors (:mod:`.vectors`)
+and the occupation–skill graph (:mod:`.graph`) are saved beside it.
+"""
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from need_analysis.esco import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE concepts (
+    uri         TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,            -- 'occupation' | 'skill' | 'skillgroup'
+    skill_type  TEXT,                     -- 'skill/competence' | 'knowledge'
+    reuse_level TEXT,                     -- 'transversal' | 'cross-sector' | 'sector-specific' | 'occupation-specific'
+    isco_group  TEXT
+);
+CREATE TABLE labels (
+    uri       TEXT NOT NULL,
+    lang      TEXT NOT NULL,
+    label     TEXT NOT NULL,
+    preferred INTEGER NOT NULL
+);
+CREATE INDEX labels_uri ON labels (uri, lang, preferred);
+CREATE TABLE descriptions (
+    uri         TEXT NOT NULL,
+    lang        TEXT NOT NULL,
+    description TEXT NOT NULL,
+    PRIMARY KEY (uri, lang)
+);
+CREATE TABLE relations (
+    occupation_uri TEXT NOT NULL,
+    skill_uri      TEXT NOT NULL,
+    relation       TEXT NOT NULL          -- 'essential' | 'optional'
+);
+CREATE INDEX relations_occupation ON relations (occupation_uri, relation);
+CREATE INDEX relations_skill ON relations (skill_uri);
+CREATE TABLE broader (
+    uri         TEXT NOT NULL,
+    broader_uri TEXT NOT NULL
+);
+CREATE INDEX broader_uri ON broader (uri);
+CREATE VIRTUAL TABLE labels_fts USING fts5 (
+    label,
+    uri UNINDEXED,
+    lang UNINDEXED,
+    kind UNINDEXED,
+    preferred UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+"""
+
+_LANG = re.compile(r"_([a-z]{2,3})\.csv$")
+BATCH = 5_000
+
+
+def _rows(path: Path) -> Iterator[dict[str, str]]:
+    with path.open(encoding="utf-8", newline="") as fh:
+        yield from csv.DictReader(fh)
+
+
+def _find(roots: Iterable[Path], stem: str) -> dict[str, Path]:
+    """``{lang: path}`` for every ``<stem>_<lang>.csv`` below ``roots``."""
+    found: dict[str, Path] = {}
+    for root in roots:
+        for path in sorted(root.rglob(f"{stem}_*.csv")):
+            if m := _LANG.search(path.name):
+                found.setdefault(m[1], path)
+    return found
+
+
+def _batched(rows: Iterable[tuple], db: sqlite3.Connection, sql: str) -> int:
+    batch, total = [], 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH:
+            db.executemany(sql, batch)
+            total += len(batch)
+            batch.clear()
+    db.executemany(sql, batch)
+    return total + len(batch)
+
+
+def _labels(row: dict[str, str], lang: str) -> Iterator[tuple[str, str, str, int]]:
+    uri = row["conceptUri"]
+    if pref := (row.get("preferredLabel") or "").strip():
+        yield uri, lang, pref, 1
+    for alt in (row.get("altLabels") or "").splitlines():
+        if alt := alt.strip():
+            yield uri, lang, alt, 0
+
+
+def import_csv(
+    roots: Iterable[str | os.PathLike[str]],
+    db_path: str | os.PathLike[str] = DB_PATH,
+    languages: Iterable[str] | None = None,
+) -> dict[str, int]:
+    """Build the ESCO index from CSV dump folders.
+
+    Args:
+        roots: Folders containing the per-language CSV files (searched recursively).
+        db_path: Target SQLite file; replaced atomically.
+        languages: Only import these label languages (default: all found).
+
+    Returns:
+        Row counts per table.
+
+    Raises:
+        FileNotFoundError: If no ``occupations_<lang>.csv`` is found.
+    """
+    roots = [Path(r) for r in roots]
+    wanted = set(languages) if languages else None
+    occupations = {
+        lang: p
+        for lang, p in _find(roots, "occupations").items()
+        if not wanted or lang in wanted
+    }
+    skills = {
+        lang: p
+        for lang, p in _find(roots, "skills").items()
+        if not wanted or lang in wanted
+    }
+    groups = {
+        lang: p
+        for lang, p in _find(roots, "skillGroups").items()
+        if not wanted or lang in wanted
+    }
+    if not occupations:
+        raise FileNotFoundError(
+            f"No occupations_<lang>.csv below {', '.join(map(str, roots))}"
+        )
+
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = db_path.with_suffix(".building")
+    tmp.unlink(missing_ok=True)
+    t0 = time.perf_counter()
+    db = sqlite3.connect(tmp)
+    db.execute("PRAGMA journal_mode=OFF")
+    db.execute("PRAGMA synchronous=OFF")
+    db.executescript(SCHEMA)
+    counts: dict[str, int] = {}
+    with db:
+        for kind, files in (
+            ("occupation", occupations),
+            ("skill", skills),
+            ("skillgroup", groups),
+        ):
+            for i, (lang, path) in enumerate(sorted(files.items())):
+                logger.info("Importing %s", path)
+                if i == 0:  # concept attributes are the same in every language
+                    counts[f"{kind}s"] = _batched(
+                        (
+                            (
+                                r["conceptUri"],
+                                kind,
+                                r.get("skillType") or None,
+                                r.get("reuseLevel") or None,
+                                r.get("iscoGroup") or None,
+                            )
+                            for r in _rows(path)
+                        ),
+                        db,
+                        "INSERT OR IGNORE INTO concepts VALUES (?, ?, ?, ?, ?)",
+                    )
+                _batched(
+                    (lab for r in _rows(path) for lab in _labels(r, lang)),
+                    db,
+                    "INSERT INTO labels VALUES (?, ?, ?, ?)",
+                )
+                _batched(
+                    (
+                        (r["conceptUri"], lang, d)
+                        for r in _rows(path)
+                        if (
+                            d := (
+                                r.get("description") or r.get("definition") or ""
+                            ).strip()
+                        )
+                    ),
+                    db,
+                    "INSERT OR IGNORE INTO descriptions VALUES (?, ?, ?)",
+                )
+        if rel := next(iter(_find(roots, "occupationSkillRelations").values()), None):
+            counts["relations"] = _batched(
+                (
+                    (r["occupationUri"], r["skillUri"], r["relationType"])
+                    for r in _rows(rel)
+                ),
+                db,
+                "INSERT INTO relations VALUES (?, ?, ?)",
+            )
+        if broader := next(
+            iter(_find(roots, "broaderRelationsSkillPillar").values()), None
+        ):
+            counts["broader"] = _batched(
+                ((r["conceptUri"], r["broaderUri"]) for r in _rows(broader)),
+                db,
+                "INSERT INTO broader VALUES (?, ?)",
+            )
+        db.execute(
+            "INSERT INTO labels_fts (label, uri, lang, kind, preferred) "
+            "SELECT l.label, l.uri, l.lang, c.kind, l.preferred FROM labels l JOIN concepts c USING (uri)"
+        )
+        db.execute("INSERT INTO labels_fts (labels_fts) VALUES ('optimize')")
+    counts["labels"] = db.execute("SELECT COUNT(*) FROM labels").fetchone()[0]
+    db.execute("ANALYZE")
+    db.close()
+    os.replace(tmp, db_path)
+
+    from need_analysis.esco.graph import SkillGraph, graph_path
+    from need_analysis.esco.matcher import OccupationMatcher, matcher_path
+    from need_analysis.esco.vectors import SkillVectors, vectors_path
+
+    # English names first
+    langs = sorted(occupations, key=lambda lang: (lang != "en", lang))
+    matcher = OccupationMatcher.from_db(db_path, langs)
+    matcher.save(matcher_path(db_path))
+    counts["occupation_labels"] = len(matcher.labels)
+    vectors = SkillVectors.from_db(db_path)
+    vectors.save(vectors_path(db_path))
+    counts["skill_vectors"] = len(vectors)
+    graph = SkillGraph.from_db(db_path)
+    graph.save(graph_path(db_path))
+    counts["graph_relations"] = len(graph.essential_idx) + len(graph.optional_idx)
+    logger.info("ESCO index built in %.1fs: %s", time.perf_counter() - t0, counts)
+    return counts
@@ -0,0 +1,194 @@
+"""Read-only queries against the local ESCO index built by :mod:`.importer`.
+
+Label search runs on the FTS5 table (prefix match per token, BM25 ranking,
+preferred labels first); results are memoised per index, so repeated
+lookups from wizard reruns cost a dict hit.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from need_analysis.esco import DB_PATH
+from need_analysis.esco.matcher import MIN_SCORE, OccupationMatcher, matcher_path
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+PREFERRED_BOOST = 2.0  # bm25 is negative; lower is better
+
+
+@dataclass(frozen=True, slots=True)
+class Concept:
+    uri: str
+    label: str  # preferred label in the requested language
+    kind: str
+
+
+def fts_query(text: str) -> str | None:
+    """``"data scien"`` → ``"data"* "scien"*`` (all tokens, prefix match)."""
+    tokens = _TOKEN.findall(text.lower())
+    return " ".join(f'"{t}"*' for t in tokens) or None
+
+
+def _load_matcher(path: Path) -> OccupationMatcher | None:
+    if not path.exists():
+        return None
+    try:
+        return OccupationMatcher.load(path)
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring occupation matcher %s: %s", path, exc)
+        return None
+
+
+class EscoIndex:
+    """Occupation and skill lookups on the offline ESCO database.
+
+    Raises:
+        FileNotFoundError: If ``path`` does not exist (run ``esco-import`` first).
+    """
+
+    def __init__(self, path: str | Path = DB_PATH, cache_size: int = 4096) -> None:
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"ESCO index not found: {self.path}")
+        self.db = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self.search = lru_cache(maxsize=cache_size)(self._search)  # type: ignore[method-assign]
+        self.matcher = _load_matcher(matcher_path(self.path))
+
+    def close(self) -> None:
+        self.db.close()
+
+    def _query(self, sql: str, params: tuple) -> list[tuple]:
+        with self._lock:
+            return self.db.execute(sql, params).fetchall()
+
+    # ── Label search -----------------------------------------------------------
+    def _search(
+        self, text: str, kind: str | None = None, language: str = "en", limit: int = 10
+    ) -> tuple[Concept, ...]:
+        """Best matching concepts for ``text``; each concept appears once."""
+        match = fts_query(text)
+        if not match:
+            return ()
+        rows = self._query(
+            f"""
+            SELECT f.uri, f.kind, bm25(labels_fts) - f.preferred * {PREFERRED_BOOST} AS score
+            FROM labels_fts f
+            WHERE labels_fts MATCH ? AND f.lang = ? {"AND f.kind = ?" if kind else ""}
+            ORDER BY score
+            LIMIT ?
+            """,
+            (match, language, *((kind,) if kind else ()), limit * 5),
+        )
+        uris = list(dict.fromkeys((uri, k) for uri, k, _ in rows))[:limit]
+        labels = self.preferred_labels([u for u, _ in uris], language)
+        return tuple(Concept(u, labels.get(u, ""), k) for u, k in uris)
+
+    def preferred_labels(self, uris: list[str], language: str = "en") -> dict[str, str]:
+        if not uris:
+            return {}
+        rows = self._query(
+            f"SELECT uri, label FROM labels WHERE lang = ? AND preferred = 1 "
+            f"AND uri IN ({','.join('?' * len(uris))})",
+            (language, *uris),
+        )
+        return dict(rows)
+
+    def find_occupation(self, title: str, language: str = "en") -> Concept | None:
+        """Best occupation for a job title from an ad.
+
+        Uses the trigram matcher when it was built by the importer (tolerates
+        gender markers, seniority words and spelling variants) and falls back
+        to label search.
+        """
+        if self.matcher is not None:
+            hits = self.matcher.match(title, 1, MIN_SCORE)
+            if hits:
+                uri = hits[0].uri
+                label = self.preferred_labels([uri], language).get(uri, hits[0].label)
+                return Concept(uri, label, "occupation")
+        hits = self.search(title, "occupation", language, 1)
+        return hits[0] if hits else None
+
+    # ── Relations ----------------------------------------------------------------
+    def occupation_skills(
+        self,
+        uri: str,
+        language: str = "en",
+        relation: str = "essential",
+        limit: int = 10,
+    ) -> list[str]:
+        """Preferred labels of the skills linked to occupation ``uri``."""
+        rows = self._query(
+            """
+            SELECT l.label FROM relations r
+            JOIN labels l ON l.uri = r.skill_uri AND l.lang = ? AND l.preferred = 1
+            WHERE r.occupation_uri = ? AND r.relation = ?
+            LIMIT ?
+            """,
+            (language, uri, relation, limit),
+        )
+        return [r[0] for r in rows]
+
+    def description(self, uri: str, language: str = "en") -> str:
+        rows = self._query(
+            "SELECT description FROM descriptions WHERE uri = ? AND lang = ?",
+            (uri, language),
+        )
+        return rows[0][0] if rows else ""
+
+    def isco_group(self, uri: str) -> str | None:
+        """ISCO-08 code of occupation ``uri`` (e.g. ``"2512"``)."""
+        rows = self._query("SELECT isco_group FROM concepts WHERE uri = ?", (uri,))
+        return rows[0][0] if rows and rows[0][0] else None
+
+    # ── Drop-in replacements for utils esco_client --------------------------------
+    def search_skills(
+        self, query: str, *, language: str = "en", limit: int = 10
+    ) -> list[str]:
+        return [c.label for c in self.search(query, "skill", language, limit)]
+
+    def get_skills_for_job_title(
+        self, job_title: str, *, language: str = "en", limit: int = 10
+    ) -> list[str]:
+        occ = self.find_occupation(job_title, language)
+        return self.occupation_skills(occ.uri, language, limit=limit) if occ else []
+
+    def get_tasks_for_job_title(
+        self, job_title: str, *, language: str = "en", limit: int = 10
+    ) -> list[str]:
+        """Sentences of the occupation description, as the REST client returned them."""
+        occ = self.find_occupation(job_title, language)
+        if not occ:
+            return []
+        sentences = [
+            s.strip()
+            for s in self.description(occ.uri, language).split(".")
+            if s.strip()
+        ]
+        return sentences[:limit]
+
+
+_default: EscoIndex | None = None
+_default_lock = threading.Lock()
+
+
+def get_index(path: str | Path = DB_PATH) -> EscoIndex | None:
+    """Shared index at ``path``, or ``None`` if it has not been imported."""
+    global _default
+    with _default_lock:
+        if _default is None or _default.path != Path(path):
+            try:
+                _default = EscoIndex(path)
+            except (FileNotFoundError, sqlite3.Error):
+                return None
+        return _default
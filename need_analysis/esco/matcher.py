@@ -0,0 +1,290 @@
+"""Fuzzy job title → ESCO occupation matching on a character-trigram index.
+
+Titles in ads ("Senior Fullstack Entwickler (m/w/d)") rarely equal an ESCO
+label. :func:`clean_title` strips gender markers, seniority and contract
+words; :class:`OccupationMatcher` then scores every preferred and
+alternative occupation label that shares trigrams with the title (Dice
+coefficient) and keeps the best label per occupation.
+
+The inverted index is four flat ``uint32`` arrays (bucket offsets, postings,
+label → occupation, label size). :meth:`OccupationMatcher.save` writes them
+to one file that :meth:`OccupationMatcher.load` memory-maps, so worker
+processes share the pages instead of each building a copy.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import re
+import sqlite3
+import sys
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+BUCKETS = 1 << 18  # trigram hash space; collisions only add noise to rare scores
+MIN_SCORE = 0.45  # below this a match is more likely wrong than right
+_MAGIC = b"NATRGM01"
+
+_GENDER = re.compile(
+    r"[(\[]\s*(?:[mwfdxi]\s*[/|,]\s*){1,3}[mwfdxi]\s*[)\]]"  # (m/w/d), [w/m/x]
+    r"|\b(?:[mwfd]\s*/\s*){2}[mwfdx]\b"  # m/w/d without brackets
+    r"|[(\[]\s*(?:all genders?|gn\*?|d)\s*[)\]]",
+    re.I,
+)
+# Entwickler*in, Entwickler:innen, Entwickler/-in, Entwickler(in), EntwicklerIn
+_GENDER_SUFFIX = re.compile(
+    r"(?<=[a-zäöüß])(?:(?:\*|:|_|/-?)[iI]n(?:nen)?|\([iI]n(?:nen)?\)|In(?:nen)?)(?!\w)"
+)
+_NOISE = re.compile(
+    r"\b(?:senior|junior|sr|jr|lead|principal|mid[- ]?level|"
+    r"vollzeit|teilzeit|full[- ]?time|part[- ]?time|remote|hybrid|befristet|unbefristet)\b\.?"
+    r"|\d+\s*%|\d+\s*-\s*\d+\s*%",
+    re.I,
+)
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def clean_title(title: str) -> str:
+    """``"Senior Fullstack Entwickler*in (m/w/d)"`` → ``"fullstack entwickler"``."""
+    text = _GENDER.sub(" ", title)
+    text = _GENDER_SUFFIX.sub("", text)  # before lower(): "EntwicklerIn"
+    text = _NOISE.sub(" ", text.lower())
+    return _NON_WORD.sub(" ", text).replace("_", " ").strip()
+
+
+def _buckets(clean: str) -> set[int]:
+    """Hashed trigrams of every word, padded so short words still count."""
+    grams = set()
+    for word in clean.split():
+        padded = f" {word} ".encode()
+        grams.update(
+            zlib.crc32(padded[i : i + 3]) & (BUCKETS - 1)
+            for i in range(len(padded) - 2)
+        )
+    return grams
+
+
+@dataclass(frozen=True, slots=True)
+class OccupationMatch:
+    uri: str
+    label: str  # display name of the occupation
+    score: float  # Dice coefficient of the best matching label, 0–1
+    matched: str = ""  # label that matched (preferred or alternative)
+
+
+class OccupationMatcher:
+    """Top-k ESCO occupations for a job title.
+
+    Build with :meth:`from_labels` / :meth:`from_db`, or memory-map a saved
+    index with :meth:`load`.
+    """
+
+    def __init__(
+        self,
+        uris: list[str],
+        names: list[str],
+        labels: list[str],
+        offsets: np.ndarray,
+        postings: np.ndarray,
+        label_occ: np.ndarray,
+        label_size: np.ndarray,
+        mapped: mmap.mmap | None = None,
+    ) -> None:
+        self.uris = uris
+        self.names = names
+        self.labels = labels
+        self.offsets = offsets
+        self.postings = postings
+        self.label_occ = label_occ
+        self.label_size = label_size
+        self._mapped = mapped  # keeps the pages behind the arrays alive
+
+    def __len__(self) -> int:
+        return len(self.uris)
+
+    # ── construction -----------------------------------------------------------
+    @classmethod
+    def from_labels(cls, rows: Iterable[tuple[str, str, bool]]) -> OccupationMatcher:
+        """Build from ``(uri, label, preferred)`` rows.
+
+        The first preferred label of an occupation becomes its display name
+        (its first label if it has no preferred one).
+        """
+        occ_index: dict[str, int] = {}
+        named: set[int] = set()
+        uris: list[str] = []
+        names: list[str] = []
+        labels: list[str] = []
+        occs: list[int] = []
+        grams: list[int] = []
+        sizes: list[int] = []
+        for uri, label, preferred in rows:
+            if (o := occ_index.get(uri)) is None:
+                o = occ_index[uri] = len(uris)
+                uris.append(uri)
+                names.append(label)
+            if preferred and o not in named:
+                names[o] = label
+                named.add(o)
+            if g := _buckets(clean_title(label)):
+                labels.append(label)
+                occs.append(o)
+                sizes.append(len(g))
+                grams.extend(g)
+
+        label_size = np.array(sizes, dtype=np.uint32)
+        bucket = np.array(grams, dtype=np.uint32)
+        owner = np.repeat(np.arange(len(labels), dtype=np.uint32), label_size)
+        postings = owner[np.argsort(bucket, kind="stable")]  # grouped by bucket
+        offsets = np.zeros(BUCKETS + 1, dtype=np.uint32)
+        np.cumsum(np.bincount(bucket, minlength=BUCKETS), out=offsets[1:])
+        return cls(
+            uris,
+            names,
+            labels,
+            offsets,
+            postings,
+            np.array(occs, dtype=np.uint32),
+            label_size,
+        )
+
+    @classmethod
+    def from_db(
+        cls, path: str | Path, languages: Iterable[str] = ("en", "de")
+    ) -> OccupationMatcher:
+        """Build from the occupation labels of an ESCO index (see :mod:`.importer`).
+
+        Preferred labels of the first language in ``languages`` become the
+        display names.
+        """
+        langs = list(languages)
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            rows = db.execute(
+                f"""
+                SELECT l.uri, l.label, l.preferred FROM labels l JOIN concepts c USING (uri)
+                WHERE c.kind = 'occupation' AND l.lang IN ({','.join('?' * len(langs))})
+                ORDER BY l.lang != ?, l.preferred DESC
+                """,
+                (*langs, langs[0]),
+            ).fetchall()
+        finally:
+            db.close()
+        return cls.from_labels(rows)
+
+    # ── persistence --------------------------------------------------------------
+    def _arrays(self) -> tuple[np.ndarray, ...]:
+        return (self.offsets, self.postings, self.label_occ, self.label_size)
+
+    def save(self, path: str | Path) -> None:
+        """Write the index as a JSON header plus raw arrays; replaced atomically."""
+        path = Path(path)
+        header = json.dumps(
+            {
+                "byteorder": sys.byteorder,
+                "buckets": BUCKETS,
+                "uris": self.uris,
+                "names": self.names,
+                "labels": self.labels,
+                "sizes": [len(a) for a in self._arrays()],
+            },
+            ensure_ascii=False,
+        ).encode()
+        header += b" " * (-len(header) % 4)  # keep the arrays 4-byte aligned
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as fh:
+            fh.write(_MAGIC + len(header).to_bytes(4, "little") + header)
+            for arr in self._arrays():
+                fh.write(np.ascontiguousarray(arr, dtype=np.uint32).tobytes())
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> OccupationMatcher:
+        """Memory-map an index written by :meth:`save`.
+
+        Raises:
+            ValueError: If the file is not a matcher index for this platform.
+        """
+        with open(path, "rb") as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:8] != _MAGIC:
+            raise ValueError(f"Not an occupation matcher index: {path}")
+        hlen = int.from_bytes(mapped[8:12], "little")
+        header = json.loads(mapped[12 : 12 + hlen])
+        if header["byteorder"] != sys.byteorder or header["buckets"] != BUCKETS:
+            raise ValueError(
+                f"Occupation matcher index built for another platform: {path}"
+            )
+        pos = 12 + hlen
+        arrays = []
+        for n in header["sizes"]:
+            arrays.append(np.frombuffer(mapped, dtype=np.uint32, count=n, offset=pos))
+            pos += 4 * n
+        return cls(
+            header["uris"], header["names"], header["labels"], *arrays, mapped=mapped
+        )
+
+    # ── matching ---------------------------------------------------------------
+    def match(
+        self, title: str, k: int = 5, min_score: float = 0.0
+    ) -> list[OccupationMatch]:
+        """Best ``k`` occupations for ``title``, highest score first.
+
+        Every label sharing a trigram is scored exactly; the postings of all
+        title trigrams are counted in one ``bincount``.
+        """
+        grams = _buckets(clean_title(title))
+        if not grams:
+            return []
+        idx = np.fromiter(grams, dtype=np.int64, count=len(grams))
+        starts, ends = self.offsets[idx].tolist(), self.offsets[idx + 1].tolist()
+        hit = np.concatenate([self.postings[s:e] for s, e in zip(starts, ends)])
+        if not hit.size:
+            return []
+        counts = np.bincount(hit)
+        lids = np.flatnonzero(counts)
+        scores = 2.0 * counts[lids] / (len(grams) + self.label_size[lids])
+
+        n = min(len(lids), 8 * k)
+        while True:  # widen the window until k distinct occupations are found
+            top = (
+                np.argpartition(-scores, n - 1)[:n]
+                if n < len(lids)
+                else np.arange(len(lids))
+            )
+            results: list[OccupationMatch] = []
+            seen: set[int] = set()
+            for i in top[np.argsort(-scores[top], kind="stable")].tolist():
+                score = float(scores[i])
+                if score < min_score:
+                    return results
+                lid = int(lids[i])
+                o = int(self.label_occ[lid])
+                if o in seen:
+                    continue
+                seen.add(o)
+                results.append(
+                    OccupationMatch(
+                        self.uris[o], self.names[o], round(score, 4), self.labels[lid]
+                    )
+                )
+                if len(results) == k:
+                    return results
+            if n >= len(lids):
+                return results
+            n = min(len(lids), 4 * n)
+
+    def match_many(
+        self, titles: Iterable[str], k: int = 1, min_score: float = MIN_SCORE
+    ) -> dict[str, list[OccupationMatch]]:
+        """:meth:`match` for a batch of titles (bulk mode); duplicates matched once."""
+        return {t: self.match(t, k, min_score) for t in dict.fromkeys(titles)}
+
+
+def matcher_path(db_path: str | Path) -> Path:
+    """Where :mod:`.importer` stores the trigram index for ``db_path``."""
+    return Path(db_path).with_suffix(".trigrams")
@@ -0,0 +1,108 @@
+"""Speculative ESCO lookups, started as soon as the job title is known.
+
+The extraction task calls :meth:`EscoPrefetch.start` right after the regex
+stage, so resolving the occupation and expanding its skills and tasks runs
+on the shared :mod:`~need_analysis.aio` loop while the LLM stage is still
+working. The wizard keeps the task's :class:`EscoPrefetch` in the session;
+when the user reaches the Tasks or Skills step, :meth:`EscoPrefetch.get`
+returns the finished lookup instead of making a request.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+
+from need_analysis import aio
+from need_analysis.esco.matcher import clean_title
+
+logger = logging.getLogger(__name__)
+
+LIMIT = 10  # skills and tasks kept per lookup; callers slice further
+WAIT_SECONDS = 5.0  # how long get() waits for a lookup that is still running
+
+
+@dataclass(frozen=True, slots=True)
+class EscoLookup:
+    title: str
+    language: str
+    skills: tuple[str, ...]  # essential skills of the best matching occupation
+    tasks: tuple[str, ...]  # sentences of its description
+
+
+async def lookup(title: str, language: str = "en", limit: int = LIMIT) -> EscoLookup:
+    """Skills and tasks for ``title``: offline index if built, else the REST client.
+
+    Raises:
+        httpx.HTTPError: If the REST API is used and the request fails.
+    """
+    from need_analysis.esco.index import get_index
+
+    index = await asyncio.to_thread(get_index)
+    if index is not None:
+        skills, tasks = await asyncio.to_thread(
+            lambda: (
+                index.get_skills_for_job_title(title, language=language, limit=limit),
+                index.get_tasks_for_job_title(title, language=language, limit=limit),
+            )
+        )
+    else:
+        from need_analysis.esco import client
+
+        profile = await client.occupation_profile(title, language=language)
+        skills = list(profile.essential_skills[:limit]) if profile else []
+        tasks = profile.tasks[:limit] if profile else []
+    return EscoLookup(title, language, tuple(skills), tuple(tasks))
+
+
+class EscoPrefetch:
+    """ESCO lookups of one session, keyed by cleaned title and language.
+
+    Safe to share between the loop thread (which starts lookups) and the
+    script thread (which reads them).
+    """
+
+    def __init__(self, limit: int = LIMIT) -> None:
+        self.limit = limit
+        self._lookups: dict[tuple[str, str], Future[EscoLookup]] = {}
+        self._lock = threading.Lock()
+
+    def start(self, title: str, language: str = "en") -> Future[EscoLookup]:
+        """Start the lookup for ``title`` unless it is already running or done."""
+        key = (clean_title(title), language)
+        with self._lock:
+            if (future := self._lookups.get(key)) is None:
+                future = self._lookups[key] = aio.submit(
+                    lookup(title, language, self.limit)
+                )
+            return future
+
+    def get(
+        self, title: str, language: str = "en", timeout: float = WAIT_SECONDS
+    ) -> EscoLookup | None:
+        """The lookup for ``title``, started now if no prefetch covered it.
+
+        Waits up to ``timeout`` seconds for a running lookup. Returns ``None``
+        on timeout or failure; a failed lookup is retried on the next call.
+        """
+        future = self.start(title, language)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            logger.info("ESCO lookup for %r still running after %.1fs", title, timeout)
+            return None
+        except Exception as exc:
+            logger.warning("ESCO lookup for %r failed: %s", title, exc)
+            with self._lock:
+                if self._lookups.get(key := (clean_title(title), language)) is future:
+                    del self._lookups[key]
+            return None
+
+    def cancel(self) -> None:
+        """Cancel lookups that have not finished (the extraction was superseded)."""
+        with self._lock:
+            for future in self._lookups.values():
+                future.cancel()
@@ -0,0 +1,56 @@
+"""Prefill the ``skills_must/nice_high/low`` fields from the ESCO skill graph.
+
+Runs after :func:`~need_analysis.skills.skills_stage`: the job title is
+matched to an occupation with the trigram matcher and its essential and
+optional skills are read from the CSR graph (:mod:`.graph`) – no network.
+Fields the ad or the LLM already filled are left alone. Without a local
+ESCO index the stage is a no-op, and nothing heavy is imported until an
+index exists.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+from need_analysis.esco import DB_PATH
+from need_analysis.schema import ExtractResult
+
+PREFILL_FIELDS = (
+    "skills_must_high",
+    "skills_must_low",
+    "skills_nice_high",
+    "skills_nice_low",
+)
+CONFIDENCE = 0.6  # scaled by the title match score: taxonomy defaults, not ad content
+
+
+def prefill_stage(
+    fields: dict[str, ExtractResult], db_path: str | Path = DB_PATH
+) -> dict[str, ExtractResult]:
+    """Return ``fields`` with missing :data:`PREFILL_FIELDS` filled from ESCO."""
+    if all(k in fields for k in PREFILL_FIELDS) or not Path(db_path).exists():
+        return fields
+    title = fields.get("job_title")
+    if title is None or not title.value:
+        return fields
+
+    from need_analysis.esco.graph import get_graph
+    from need_analysis.esco.index import get_index
+    from need_analysis.esco.matcher import MIN_SCORE
+
+    index, graph = get_index(db_path), get_graph(db_path)
+    if index is None or index.matcher is None or graph is None:
+        return fields
+    matches = index.matcher.match(str(title.value), 1, MIN_SCORE)
+    if not matches:
+        return fields
+    lang = fields["language_of_ad"].value if "language_of_ad" in fields else "en"
+    (skills,) = graph.prefill([matches[0].uri], lang if lang in graph.labels else "en")
+    if not skills:
+        return fields
+
+    confidence = round(matches[0].score * CONFIDENCE, 3)
+    out = dict(fields)
+    for key in PREFILL_FIELDS:
+        if key not in out and (items := skills[key]):
+            out[key] = ExtractResult(", ".join(items), confidence, typed=items)
+    return out
@@ -0,0 +1,274 @@
+"""Character n-gram TF-IDF vectors of ESCO skill labels for similarity search.
+
+Each preferred skill label becomes a row of hashed character 3–5-grams
+(word-boundary padded), weighted by sublinear TF × IDF and L2-normalised,
+so a dot product is the cosine similarity. The matrix is saved as a plain
+``.npy`` and opened with ``mmap_mode="r"``: every worker process maps the
+same pages, and a batch of queries is one matrix product plus a top-k
+``argpartition`` per row. No network, no GPU.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from need_analysis.esco import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+DIM = 1024  # hashed feature space; 14k skills × 2 languages ≈ 115 MB float32
+NGRAMS = (3, 4, 5)
+NORMALIZE_SCORE = 0.75  # cosine above which free text is replaced by the ESCO label
+_WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True, slots=True)
+class SkillHit:
+    label: str
+    uri: str
+    score: float  # cosine similarity, 0–1
+
+
+def _features(text: str, dim: int) -> dict[int, int]:
+    """Hashed character n-gram counts of ``text``."""
+    counts: dict[int, int] = {}
+    for word in _WORD.findall(text.lower()):
+        padded = f" {word} ".encode()
+        for n in NGRAMS:
+            for i in range(len(padded) - n + 1):
+                h = zlib.crc32(padded[i : i + n]) & (dim - 1)
+                counts[h] = counts.get(h, 0) + 1
+    return counts
+
+
+def _tf(texts: Sequence[str], dim: int) -> np.ndarray:
+    """Sublinear term frequencies, one float32 row per text."""
+    rows, cols, vals = [], [], []
+    for r, text in enumerate(texts):
+        feats = _features(text, dim)
+        rows.extend([r] * len(feats))
+        cols.extend(feats)
+        vals.extend(feats.values())
+    tf = np.zeros((len(texts), dim), dtype=np.float32)
+    tf[rows, cols] = 1.0 + np.log(np.array(vals, dtype=np.float32))
+    return tf
+
+
+def _l2(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length in place; all-zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms > 0, norms, 1.0)
+    return matrix
+
+
+def vectors_path(db_path: str | Path) -> Path:
+    """Where :mod:`.importer` stores the skill matrix for ``db_path``."""
+    return Path(db_path).with_suffix(".skills.npy")
+
+
+class SkillVectors:
+    """Top-k ESCO skills by cosine similarity, for many queries at once.
+
+    Rows are grouped by language, so restricting a query to one language is
+    a slice of the mapped matrix rather than a copy.
+    """
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        idf: np.ndarray,
+        labels: list[str],
+        uris: list[str],
+        languages: dict[str, tuple[int, int]],
+    ) -> None:
+        self.matrix = matrix
+        self.idf = idf
+        self.labels = labels
+        self.uris = uris
+        self.languages = languages  # language → (first row, end row)
+        self.dim = matrix.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    # ── construction -----------------------------------------------------------
+    @classmethod
+    def from_labels(
+        cls, rows: Iterable[tuple[str, str, str]], dim: int = DIM
+    ) -> SkillVectors:
+        """Build from ``(uri, language, label)`` rows.
+
+        Raises:
+            ValueError: If ``dim`` is not a power of two.
+        """
+        if dim & (dim - 1):
+            raise ValueError(f"dim must be a power of two, got {dim}")
+        # stable: input order within a language
+        ordered = sorted(rows, key=lambda r: r[1])
+        labels = [label for _, _, label in ordered]
+        uris = [uri for uri, _, _ in ordered]
+        languages: dict[str, tuple[int, int]] = {}
+        for i, (_, lang, _) in enumerate(ordered):
+            start, _ = languages.get(lang, (i, i))
+            languages[lang] = (start, i + 1)
+
+        tf = _tf(labels, dim)
+        df = np.count_nonzero(tf, axis=0)
+        idf = (np.log((1 + len(labels)) / (1 + df)) + 1).astype(np.float32)
+        tf *= idf  # in place: the matrix is the largest allocation of the import
+        return cls(_l2(tf), idf, labels, uris, languages)
+
+    @classmethod
+    def from_db(cls, path: str | Path, dim: int = DIM) -> SkillVectors:
+        """Build from the preferred skill labels of an ESCO index (see :mod:`.importer`)."""
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            rows = db.execute(
+                "SELECT l.uri, l.lang, l.label FROM labels l JOIN concepts c USING (uri) "
+                "WHERE c.kind = 'skill' AND l.preferred = 1 ORDER BY l.rowid"
+            ).fetchall()
+        finally:
+            db.close()
+        return cls.from_labels(rows, dim)
+
+    # ── persistence ----------------------------------------------------------------
+    def save(self, path: str | Path) -> None:
+        """Write ``<path>`` (the matrix) and ``<path>.json`` (labels, IDF, ranges)."""
+        path = Path(path)
+        np.save(path, np.ascontiguousarray(self.matrix, dtype=np.float32))
+        meta = {
+            "dim": self.dim,
+            "ngrams": list(NGRAMS),
+            "idf": self.idf.tolist(),
+            "labels": self.labels,
+            "uris": self.uris,
+            "languages": self.languages,
+        }
+        path.with_suffix(".json").write_text(
+            json.dumps(meta, ensure_ascii=False), encoding="utf-8"
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> SkillVectors:
+        """Memory-map a matrix written by :meth:`save`.
+
+        Raises:
+            ValueError: If the file was built with different n-gram settings.
+        """
+        path = Path(path)
+        meta = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        if tuple(meta["ngrams"]) != NGRAMS:
+            raise ValueError(
+                f"Skill vectors built with n-grams {meta['ngrams']}: {path}"
+            )
+        matrix = np.load(path, mmap_mode="r")
+        languages = {k: tuple(v) for k, v in meta["languages"].items()}
+        idf = np.array(meta["idf"], dtype=np.float32)
+        return cls(matrix, idf, meta["labels"], meta["uris"], languages)  # type: ignore[arg-type]
+
+    # ── queries ----------------------------------------------------------------
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """L2-normalised query vectors, one row per text."""
+        tf = _tf(texts, self.dim)
+        tf *= self.idf
+        return _l2(tf)
+
+    def search(
+        self, queries: Sequence[str], k: int = 5, language: str | None = None
+    ) -> list[list[SkillHit]]:
+        """Top-``k`` skills for every query, best first.
+
+        Args:
+            queries: Free-text skills; all are scored in one matrix product.
+            k: Hits per query.
+            language: Only labels of this language (default: all).
+        """
+        if not queries:
+            return []
+        start, end = (
+            self.languages.get(language, (0, 0)) if language else (0, len(self))
+        )
+        if end <= start:
+            return [[] for _ in queries]
+        scores = self.embed(queries) @ self.matrix[start:end].T
+        k = min(k, end - start)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1) + start
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        return [
+            [
+                SkillHit(self.labels[i], self.uris[i], round(float(s), 4))
+                for i, s in zip(row.tolist(), row_scores.tolist())
+                if s > 0
+            ]
+            for row, row_scores in zip(top, top_scores)
+        ]
+
+    def normalize(
+        self,
+        skills: Sequence[str],
+        language: str | None = None,
+        min_score: float = NORMALIZE_SCORE,
+    ) -> list[str]:
+        """Replace each skill by its closest ESCO label if it is at least ``min_score`` similar."""
+        hits = self.search(skills, 1, language)
+        return [
+            h[0].label if h and h[0].score >= min_score else s
+            for s, h in zip(skills, hits)
+        ]
+
+    def suggest(
+        self,
+        skills: Sequence[str],
+        k: int = 5,
+        language: str | None = None,
+        min_score: float = NORMALIZE_SCORE,
+    ) -> list[str]:
+        """Related skills for a skill list, excluding the skills themselves.
+
+        Neighbours of all inputs are pooled; a label reached from several
+        inputs keeps its best score. Skipped are the inputs and the label
+        :meth:`normalize` maps each input to (its best hit at ``min_score`` or
+        above); other close neighbours are suggestions like any hit.
+        """
+        results = self.search(skills, k + 1, language)
+        have = {s.strip().lower() for s in skills}
+        have.update(
+            h[0].label.lower() for h in results if h and h[0].score >= min_score
+        )
+        best: dict[str, float] = {}
+        for hits in results:
+            for h in hits:
+                if h.label.lower() not in have:
+                    best[h.label] = max(h.score, best.get(h.label, 0.0))
+        return sorted(best, key=best.__getitem__, reverse=True)[:k]
+
+
+_default: SkillVectors | None = None
+_default_path: Path | None = None
+_default_lock = threading.Lock()
+
+
+def get_skill_vectors(db_path: str | Path = DB_PATH) -> SkillVectors | None:
+    """Shared, memory-mapped skill vectors for ``db_path``, or ``None`` if not built."""
+    global _default, _default_path
+    path = vectors_path(db_path)
+    with _default_lock:
+        if _default is None or _default_path != path:
+            try:
+                _default, _default_path = SkillVectors.load(path), path
+            except (OSError, ValueError) as exc:
+                logger.debug("No skill vectors at %s: %s", path, exc)
+                return None
+        return _default
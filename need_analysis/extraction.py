@@ -0,0 +1,78 @@
+"""Extraction orchestrator – regex stage first, LLM for whatever is missing,
+then typed normalization, skill canonicalization and ESCO skill prefill of
+the merged fields."""
+from __future__ import annotations
+
+import asyncio
+
+from need_analysis.esco.prefill import prefill_stage
+from need_analysis.lang_detect import MIN_CONFIDENCE, detect_language
+from need_analysis.llm import ChunkCallback, llm_fill
+from need_analysis.patterns import (
+    ANY_LANG,
+    REGEX_PATTERNS,
+    compiled_patterns,
+    pattern_search,
+)
+from need_analysis.schema import ExtractResult
+from need_analysis.skills import skills_stage
+from need_analysis.typed import typed_stage
+
+
+# ── Stages --------------------------------------------------------------------
+def regex_stage(text: str) -> dict[str, ExtractResult]:
+    """Detect the language and run the matching compiled pattern set.
+
+    CPU-only and picklable in/out, so bulk runs can execute it in a process pool.
+    The detected language is stored under ``language_of_ad``.
+    """
+    lang, lang_conf = detect_language(text)
+    patterns = compiled_patterns(lang if lang_conf >= MIN_CONFIDENCE else ANY_LANG)
+    interim: dict[str, ExtractResult] = {
+        k: res for k, pat in patterns.items() if (res := pattern_search(text, k, pat))
+    }
+
+    # salary merge
+    if (
+        "salary_range" not in interim
+        and {"salary_range_min", "salary_range_max"} <= interim.keys()
+    ):
+        interim["salary_range"] = ExtractResult(
+            f"{interim['salary_range_min'].value} – {interim['salary_range_max'].value}",
+            min(
+                interim["salary_range_min"].confidence,
+                interim["salary_range_max"].confidence,
+            ),
+        )
+
+    interim["language_of_ad"] = ExtractResult(lang, lang_conf)
+    return interim
+
+
+async def llm_stage(
+    interim: dict[str, ExtractResult],
+    text: str,
+    on_chunk: ChunkCallback | None = None,
+) -> dict[str, ExtractResult]:
+    """Ask the LLM for every pattern key the regex stage did not find.
+
+    ``on_chunk`` is forwarded to :func:`~need_analysis.llm.llm_fill` for progress.
+    """
+    lang = interim["language_of_ad"].value if "language_of_ad" in interim else "en"
+    missing = [k for k in REGEX_PATTERNS.keys() if k not in interim]
+    return {**interim, **await llm_fill(missing, text, lang, on_chunk)}
+
+
+def refine_stage(fields: dict[str, ExtractResult]) -> dict[str, ExtractResult]:
+    """Typed normalization, skill canonicalization and ESCO skill prefill of merged fields.
+
+    Everything after the LLM stage; CPU-only, so runs without an LLM (bulk
+    ``--no-llm``) go through the same steps.
+    """
+    return prefill_stage(skills_stage(typed_stage(fields)))
+
+
+# ── Extraction orchestrator ---------------------------------------------------
+async def extract(text: str) -> dict[str, ExtractResult]:
+    fields = await llm_stage(await asyncio.to_thread(regex_stage, text), text)
+    return await asyncio.to_thread(refine_stage, fields)
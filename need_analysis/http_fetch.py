@@ -0,0 +1,249 @@
+"""Async URL fetcher – pooled client, byte cap, incremental decoding, ETag cache."""
+from __future__ import annotations
+
+import asyncio
+import codecs
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+
+from need_analysis.aio import run_sync
+
+logger = logging.getLogger(__name__)
+
+MAX_BYTES = 5 * 1024 * 1024  # job ads are a few hundred kB; anything larger is noise
+TIMEOUT = httpx.Timeout(20.0, connect=10.0)
+LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+USER_AGENT = "Vacalyser/0.3 (+https://github.com/GerriF86/Need_Analysis)"
+CACHE_DIR = Path(
+    os.getenv(
+        "NEED_ANALYSIS_HTTP_CACHE", Path.home() / ".cache" / "need_analysis" / "http"
+    )
+)
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w.:-]+)""", re.I)
+_SNIFF_BYTES = 2048
+
+
+class FetchError(Exception):
+    """Raised when a URL cannot be fetched.
+
+    Attributes:
+        reason: Short machine-readable cause ("http_404", "timeout", …).
+        status: HTTP status code, if a response was received.
+    """
+
+    def __init__(
+        self, reason: str, status: int | None = None, detail: str = ""
+    ) -> None:
+        super().__init__(f"{reason}: {detail}" if detail else reason)
+        self.reason = reason
+        self.status = status
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    text: str
+    encoding: str
+    from_cache: bool = False
+    truncated: bool = False
+
+
+# ── On-disk HTTP cache ────────────────────────────────────────────────────────
+class HttpCache:
+    """One JSON file per (URL, parser) holding validators and the parsed text."""
+
+    def __init__(self, root: Path = CACHE_DIR) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        try:
+            return json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(entry, fh, ensure_ascii=False)
+            os.replace(tmp, self._path(key))  # atomic – readers never see half a file
+        except OSError as exc:
+            logger.warning("HTTP cache write failed: %s", exc)
+
+
+_cache = HttpCache()
+
+# ── Pooled clients ────────────────────────────────────────────────────────────
+# A client's connections belong to the loop that opened them, so each loop gets
+# its own pool; entries go away with their loop.
+_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, httpx.AsyncClient
+] = weakref.WeakKeyDictionary()
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=TIMEOUT,
+        limits=LIMITS,
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the pooled client of the running loop (normally the shared background loop)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = _new_client()
+    return client
+
+
+def _parser_key(
+    parse: Callable[[str], str] | None, cache_key: str | None
+) -> str | None:
+    """Cache identity of a parser; ``None`` if it has no stable name (lambdas, closures)."""
+    if cache_key is not None:
+        return cache_key
+    if parse is None:
+        return ""
+    name = f"{getattr(parse, '__module__', '')}.{getattr(parse, '__qualname__', '<?>')}"
+    return None if "<" in name else name
+
+
+# ── Charset detection ---------------------------------------------------------
+def _sniff_charset(head: bytes) -> str | None:
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    m = _META_CHARSET.search(head)
+    return m.group(1).decode("ascii", "ignore") if m else None
+
+
+def _decoder(charset: str | None) -> tuple[str, codecs.IncrementalDecoder]:
+    try:
+        name = codecs.lookup(charset or "utf-8").name
+    except LookupError:
+        name = "utf-8"
+    return name, codecs.getincrementaldecoder(name)(errors="replace")
+
+
+# ── Fetch ---------------------------------------------------------------------
+async def fetch_text(
+    url: str,
+    *,
+    parse: Callable[[str], str] | None = None,
+    max_bytes: int = MAX_BYTES,
+    cache: HttpCache | None = _cache,
+    cache_key: str | None = None,
+) -> FetchResult:
+    """Stream ``url`` into text, revalidating a cached copy with ETag/Last-Modified.
+
+    Args:
+        url: Address to fetch.
+        parse: Optional transform (e.g. HTML → visible text). Its output is what
+            gets cached, so a 304 skips both the download and the re-parse.
+        max_bytes: Body cap; reading stops there and the result is flagged
+            ``truncated``.
+        cache: On-disk cache, or ``None`` to bypass it.
+        cache_key: Identity of ``parse`` in the cache. Module-level functions
+            default to their qualified name; lambdas and nested functions are
+            not cached without one, since two of them can share a name.
+
+    Raises:
+        FetchError: On transport errors and non-success status codes.
+    """
+    parser = _parser_key(parse, cache_key)
+    if parser is None:
+        logger.debug("Not caching %s: parser %r has no cache_key", url, parse)
+        cache = None
+    key = f"{url}\n{parser}"
+    entry = cache.get(key) if cache else None
+    headers: dict[str, str] = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        async with get_client().stream("GET", url, headers=headers) as resp:
+            if resp.status_code == 304 and entry:
+                return FetchResult(
+                    url, 304, entry["text"], entry["encoding"], from_cache=True
+                )
+            if resp.status_code >= 400:
+                raise FetchError(f"http_{resp.status_code}", resp.status_code, url)
+
+            charset = resp.charset_encoding
+            encoding, decoder = ("", None) if charset is None else _decoder(charset)
+            head, parts, size, truncated = b"", [], 0, False
+            async for chunk in resp.aiter_bytes():
+                if size + len(chunk) > max_bytes:  # cap the bytes, not the decoded text
+                    chunk, truncated = chunk[: max_bytes - size], True
+                size += len(chunk)
+                if decoder is None:  # buffer until we can sniff <meta charset>
+                    head += chunk
+                    if len(head) < _SNIFF_BYTES and not truncated:
+                        continue
+                    encoding, decoder = _decoder(_sniff_charset(head))
+                    chunk = head
+                parts.append(decoder.decode(chunk))
+                if truncated:
+                    break
+            if decoder is None:
+                encoding, decoder = _decoder(_sniff_charset(head))
+                parts.append(decoder.decode(head))
+            if not truncated:
+                # a cut body may end mid-character: drop the partial one, don't replace it
+                parts.append(decoder.decode(b"", final=True))
+            status = resp.status_code
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+    except httpx.TimeoutException as exc:
+        raise FetchError("timeout", detail=str(exc)) from exc
+    except httpx.HTTPError as exc:
+        raise FetchError("network", detail=str(exc)) from exc
+
+    if truncated:
+        logger.info("Body of %s capped at %d bytes", url, max_bytes)
+    text = "".join(parts)
+    if parse is not None:
+        text = parse(text)
+    if cache and (etag or last_modified) and not truncated:
+        cache.put(
+            key,
+            {
+                "etag": etag,
+                "last_modified": last_modified,
+                "encoding": encoding,
+                "text": text,
+            },
+        )
+    return FetchResult(url, status, text, encoding, truncated=truncated)
+
+
+def fetch_text_sync(url: str, **kwargs: Any) -> FetchResult:
+    """Blocking wrapper around :func:`fetch_text` for Streamlit callbacks.
+
+    The coroutine runs on the shared background loop so the connection pool
+    survives across reruns.
+    """
+    return run_sync(fetch_text(url, **kwargs))
@@ -0,0 +1,64 @@
+"""Ingestion helpers – PDF / DOCX / HTML / URL → plain text.
+
+Parser libraries (PyPDF2, python-docx, BeautifulSoup) are imported inside the
+functions so importing this module stays cheap for workers that only need
+one of them.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import BinaryIO
+
+from need_analysis.text_normalize import PAGE_BREAK
+
+
+# HTML-to-text helper
+def html_text(html: str) -> str:
+    """Return visible text only."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    return " ".join(soup.stripped_strings)
+
+
+def http_text(url: str) -> str:
+    """Fetch ``url`` and return its visible text (ETag-revalidated disk cache)."""
+    from need_analysis.http_fetch import fetch_text_sync
+
+    return fetch_text_sync(url, parse=html_text).text
+
+
+def pdf_text(data: BinaryIO) -> str:
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(data)
+    # form feeds keep page boundaries for header/footer detection
+    return PAGE_BREAK.join(t for p in reader.pages if (t := p.extract_text()))
+
+
+def docx_text(data: BinaryIO) -> str:
+    import docx
+
+    return "\n".join(p.text for p in docx.Document(data).paragraphs)
+
+
+SUPPORTED_SUFFIXES = (".pdf", ".docx", ".txt")
+
+
+def file_text(path: str | os.PathLike[str]) -> str:
+    """Return text from a PDF, DOCX or TXT file on disk.
+
+    Raises:
+        ValueError: For unsupported file types.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".txt":
+        return path.read_text(encoding="utf-8", errors="ignore")
+    if suffix not in SUPPORTED_SUFFIXES:
+        raise ValueError(f"Unsupported file type: {path.name}")
+    with path.open("rb") as fh:
+        return pdf_text(fh) if suffix == ".pdf" else docx_text(fh)
@@ -0,0 +1,231 @@
+"""SQLite-backed extraction job queue shared by the UI and the worker tier.
+
+The wizard enqueues a payload (uploaded file bytes, a URL or plain text) and
+polls for the result; worker processes claim jobs with a lease, so a worker
+that dies mid-job only delays that job until the lease expires, while a live
+worker renews its lease with :meth:`JobQueue.heartbeat`. Any number of
+worker processes – on this host or on others sharing the database file – can
+consume one queue, and :meth:`JobQueue.stats` exposes the depth for autoscaling.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+from need_analysis.record import JobRequisition
+from need_analysis.schema import ExtractResult, dump_results
+
+KINDS = ("pdf", "docx", "txt", "url", "text")
+LEASE_SECONDS = 300.0
+MAX_ATTEMPTS = 3
+QUEUE_PATH = os.getenv("NEED_ANALYSIS_QUEUE")  # unset → the wizard extracts in-process
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,
+    payload     BLOB NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'queued',
+    result      TEXT,
+    error       TEXT,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    worker      TEXT,
+    lease_until REAL,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+"""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    payload: bytes
+    status: str
+    attempts: int = 0
+    result: JobRequisition | None = None
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+
+class JobQueue:
+    """Durable FIFO of extraction jobs with lease-based claiming.
+
+    One instance can be shared by threads (the wizard caches one per server
+    process): every statement runs under a lock, together with reading its
+    result.
+    """
+
+    def __init__(self, path: str | Path, lease_seconds: float = LEASE_SECONDS) -> None:
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.db = sqlite3.connect(
+            self.path, isolation_level=None, timeout=30, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self.db.close()
+
+    def _one(self, sql: str, params: tuple = ()) -> tuple | None:
+        with self._lock:
+            return self.db.execute(sql, params).fetchone()
+
+    def _all(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self.db.execute(sql, params).fetchall()
+
+    def _update(self, sql: str, params: tuple = ()) -> int:
+        """Run a write statement; returns the number of rows it changed."""
+        with self._lock:
+            return self.db.execute(sql, params).rowcount
+
+    # ── producer side ---------------------------------------------------------
+    def enqueue(self, kind: str, payload: bytes | str) -> str:
+        """Add a job and return its id.
+
+        Raises:
+            ValueError: For an unknown ``kind``.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown job kind {kind!r}")
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        job_id, now = uuid.uuid4().hex, time.time()
+        self._update(
+            "INSERT INTO jobs (id, kind, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (job_id, kind, payload, now, now),
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Job | None:
+        row = self._one(
+            "SELECT id, kind, x'', status, attempts, result, error FROM jobs WHERE id = ?",
+            (job_id,),
+        )
+        if row is None:
+            return None
+        result = JobRequisition.from_json(row[5]) if row[5] else None
+        return Job(*row[:5], result=result, error=row[6])
+
+    def wait(
+        self, job_id: str, timeout: float = 300.0, poll: float = 0.25
+    ) -> Job | None:
+        """Block until the job finishes or ``timeout`` passes; returns its last state."""
+        deadline = time.monotonic() + timeout
+        while (
+            (job := self.get(job_id))
+            and not job.finished
+            and time.monotonic() < deadline
+        ):
+            time.sleep(poll)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Withdraw a queued or running job; a running worker's result is then discarded."""
+        return (
+            self._update(
+                "UPDATE jobs SET status = 'cancelled', payload = x'', lease_until = NULL, "
+                "updated_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id),
+            )
+            > 0
+        )
+
+    # ── worker side -----------------------------------------------------------
+    def claim(self, worker: str) -> Job | None:
+        """Atomically lease the oldest runnable job (queued, or running with an expired lease)."""
+        now = time.time()
+        row = self._one(
+            """
+            UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1,
+                            lease_until = ?, updated_at = ?
+            WHERE id = (
+                SELECT id FROM jobs
+                WHERE status = 'queued' OR (status = 'running' AND lease_until < ?)
+                ORDER BY created_at LIMIT 1
+            )
+            RETURNING id, kind, payload, status, attempts
+            """,
+            (worker, now + self.lease_seconds, now, now),
+        )
+        return Job(*row) if row else None
+
+    def heartbeat(self, job_id: str) -> bool:
+        """Extend the lease of a running job; returns whether the job was cancelled.
+
+        ``True`` also covers a job that is no longer running for another reason,
+        so the worker should stop working on it either way.
+        """
+        now = time.time()
+        return (
+            self._update(
+                "UPDATE jobs SET lease_until = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'running'",
+                (now + self.lease_seconds, now, job_id),
+            )
+            == 0
+        )
+
+    def complete(
+        self, job_id: str, result: dict[str, ExtractResult] | JobRequisition
+    ) -> None:
+        self._update(
+            "UPDATE jobs SET status = 'done', result = ?, payload = x'', lease_until = NULL, "
+            "updated_at = ? WHERE id = ? AND status = 'running'",
+            (dump_results(result), time.time(), job_id),
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Record a failure; the job is re-queued until it has used ``MAX_ATTEMPTS``."""
+        self._update(
+            """
+            UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END,
+                            error = ?, lease_until = NULL, updated_at = ?
+            WHERE id = ? AND status = 'running'
+            """,
+            (MAX_ATTEMPTS, error, time.time(), job_id),
+        )
+
+    # ── metrics ---------------------------------------------------------------
+    def depth(self) -> int:
+        """Jobs waiting for a worker (the autoscaling signal)."""
+        return self._one(
+            "SELECT COUNT(*) FROM jobs WHERE status = 'queued' "
+            "OR (status = 'running' AND lease_until < ?)",
+            (time.time(),),
+        )[0]
+
+    def stats(self) -> dict[str, float]:
+        """Counts per status, queue depth and age of the oldest waiting job (seconds)."""
+        out: dict[str, float] = {
+            s: 0 for s in ("queued", "running", "done", "failed", "cancelled")
+        }
+        out.update(self._all("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+        oldest = self._one("SELECT MIN(created_at) FROM jobs WHERE status = 'queued'")[
+            0
+        ]
+        out["depth"] = self.depth()
+        out["oldest_wait_s"] = round(time.time() - oldest, 1) if oldest else 0.0
+        return out
+
+    def purge(self, older_than: float = 24 * 60 * 60) -> int:
+        """Delete finished jobs older than ``older_than`` seconds; returns the count."""
+        return self._update(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND updated_at < ?",
+            (time.time() - older_than,),
+        )
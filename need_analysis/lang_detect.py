@@ -0,0 +1,77 @@
+"""Fast character-trigram language identifier for job ads.
+
+Each language has a ranked profile of its most frequent trigrams (word
+boundaries padded with spaces). All profiles are merged into one lookup table,
+so scoring a document costs one dict access per trigram no matter how many
+languages are registered. Adding French or Dutch means adding a profile line
+to ``PROFILES``.
+"""
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+
+SAMPLE_CHARS = 4000  # the first few paragraphs decide; ads don't switch language midway
+MIN_CONFIDENCE = 0.2
+MIN_WORDS = 8  # fewer words are no evidence ("Job Title: Data Engineer" scores German)
+DEFAULT = "en"
+
+# Most frequent trigrams, highest rank first ("_" marks a word boundary).
+PROFILES: dict[str, str] = {
+    "en": (
+        "_th the he_ _an and nd_ ing ng_ _to _of of_ to_ ion _in tio ed_ _re ati "
+        "for _fo or_ is_ _is _yo you ou_ our _wi wit ith th_ _be ll_ _co _wo ork "
+        "rk_ _we _ha ve_ _ex exp ill _wh _as _ar are _al ly_ ty_ _pr ble enc nce "
+        "_on _so _de _su ur_ ght _ou ers"
+    ),
+    "de": (
+        "en_ er_ _de der ie_ ich ein sch die _di und _un nd_ che ch_ den _ei in_ "
+        "ung ng_ gen cht ine _ve ver nen ten te_ _be ber _mi mit it_ _ih ihr _zu "
+        "zu_ _fü für ür_ _au auf _si sie _wi wir ir_ eit kei hei lic isc _ge ges "
+        "_da das as_ ren _ar arb bei ens _is ist st_ ste _ma _üb eru _er"
+    ),
+}
+
+_TOKEN = re.compile(r"[^\W\d_]+")
+_MARKERS = {"de": frozenset("äöüß")}
+
+
+def _build_table() -> tuple[list[str], dict[str, list[tuple[int, float]]]]:
+    langs = sorted(PROFILES)
+    table: dict[str, list[tuple[int, float]]] = defaultdict(list)
+    for li, lang in enumerate(langs):
+        grams = PROFILES[lang].split()
+        for rank, gram in enumerate(grams):
+            table[gram.replace("_", " ")].append((li, 1.0 - rank / len(grams) / 2))
+    return langs, dict(table)
+
+
+_LANGS, _TABLE = _build_table()
+
+
+def detect_language(text: str) -> tuple[str, float]:
+    """Return ``(language code, confidence 0–1)`` for ``text``.
+
+    Confidence is the winner's share of the score margin; very short or
+    ambiguous texts fall back to ``DEFAULT`` with confidence 0.
+    """
+    scores = [0.0] * len(_LANGS)
+    sample = text[:SAMPLE_CHARS].lower()
+    words = _TOKEN.findall(sample)
+    if len(words) < MIN_WORDS:
+        return DEFAULT, 0.0
+    for word in words:
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            for li, weight in _TABLE.get(padded[i : i + 3], ()):
+                scores[li] += weight
+    for li, lang in enumerate(_LANGS):
+        markers = _MARKERS.get(lang)
+        if markers:
+            scores[li] += 2.0 * sum(sample.count(ch) for ch in markers)
+
+    ranked = sorted(range(len(_LANGS)), key=scores.__getitem__, reverse=True)
+    best, runner_up = scores[ranked[0]], scores[ranked[1]] if len(ranked) > 1 else 0.0
+    if best <= 0:
+        return DEFAULT, 0.0
+    return _LANGS[ranked[0]], (best - runner_up) / best
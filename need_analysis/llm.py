@@ -0,0 +1,184 @@
+"""LLM gap-filling stage – OpenAI client is created lazily on first use."""
+from __future__ import annotations
+
+import ast
+import asyncio
+import json
+import logging
+import os
+import re
+import weakref
+from collections import Counter
+from typing import TYPE_CHECKING, Callable
+
+from need_analysis.schema import ExtractResult
+
+if TYPE_CHECKING:  # pragma: no cover
+    from openai import AsyncOpenAI
+
+MODEL = "gpt-4o-mini"
+CHUNK = 40  # keep replies short
+MAX_TEXT_CHARS = 12_000
+MAX_TOKENS = 500
+
+# process-wide call counters: calls, cancelled_calls, tokens_saved (estimated)
+USAGE: Counter = Counter()
+
+_api_key: str | None = None
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+# ── OpenAI setup ──────────────────────────────────────────────────────────────
+def configure(api_key: str | None) -> None:
+    """Set the API key explicitly (e.g. from ``st.secrets``) and drop cached clients."""
+    global _api_key
+    _api_key = api_key
+    _clients.clear()
+
+
+def get_api_key() -> str | None:
+    """Return the configured key, falling back to ``OPENAI_API_KEY`` / ``.env``."""
+    if _api_key:
+        return _api_key
+    try:
+        from dotenv import load_dotenv
+    except ImportError:  # pragma: no cover - optional in headless installs
+        pass
+    else:
+        load_dotenv()
+    return os.getenv("OPENAI_API_KEY")
+
+
+def get_client() -> AsyncOpenAI:
+    """Return an ``AsyncOpenAI`` client bound to the running event loop.
+
+    The client's connection pool belongs to one loop, so scripts calling
+    ``asyncio.run()`` repeatedly get a fresh client per loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        from openai import AsyncOpenAI
+
+        client = _clients[loop] = AsyncOpenAI(api_key=get_api_key())
+    return client
+
+
+# ── JSON helpers ──────────────────────────────────────────────────────────────
+def brute_force_brace_fix(s: str) -> str:
+    opens, closes = s.count("{") - s.count("}"), s.count("[") - s.count("]")
+    return s + ("}" * max(opens, 0)) + ("]" * max(closes, 0))
+
+
+def safe_json_load(text: str) -> dict:
+    """
+    Scrub GPT output into valid JSON, or return {}.
+    """
+    cleaned = re.sub(r"```(?:json)?", "", text).strip().rstrip("```").strip()
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        cleaned2 = re.sub(r",\s*([}\]])", r"\1", cleaned).replace("'", '"')
+        try:
+            return json.loads(cleaned2)
+        except json.JSONDecodeError:
+            try:
+                return ast.literal_eval(cleaned2)
+            except Exception:
+                try:
+                    return json.loads(brute_force_brace_fix(cleaned2))
+                except Exception as e:
+                    logging.error("Secondary JSON extraction failed: %s", e)
+                    return {}
+
+
+LLM_PROMPTS = {
+    "en": (
+        "Return ONLY valid JSON where every key maps to an object "
+        'with fields "value" (string|null) and "confidence" (0-1).'
+    ),
+    "de": (
+        "Die Stellenanzeige ist auf Deutsch. Übernimm Werte wörtlich in der "
+        "Sprache der Anzeige. Gib NUR gültiges JSON zurück, in dem jeder Schlüssel "
+        'auf ein Objekt mit den Feldern "value" (string|null) und "confidence" (0-1) zeigt.'
+    ),
+}
+LLM_PROMPT = LLM_PROMPTS["en"]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) for the usage counters."""
+    return len(text) // 4
+
+
+# ── GPT fill ------------------------------------------------------------------
+ChunkCallback = Callable[[int, int, "dict[str, ExtractResult]"], None]
+
+
+async def llm_fill(
+    missing_keys: list[str],
+    text: str,
+    lang: str = "en",
+    on_chunk: ChunkCallback | None = None,
+) -> dict[str, ExtractResult]:
+    """Ask the model for ``missing_keys`` in chunks of ``CHUNK`` keys.
+
+    Args:
+        missing_keys: Schema keys the regex stage did not find.
+        text: Normalized job-ad text.
+        lang: Language of the ad; selects the system prompt.
+        on_chunk: Called as ``on_chunk(done, total, fields)`` before the first
+            request and after every chunk, with the fields of that chunk.
+
+    Cancelling the awaiting task aborts the in-flight request (the HTTP
+    stream is closed) and skips the remaining chunks; both are counted in
+    :data:`USAGE` as ``cancelled_calls`` and estimated ``tokens_saved``.
+    """
+    if not missing_keys:
+        return {}
+
+    client = get_client()
+    out: dict[str, ExtractResult] = {}
+    total = -(-len(missing_keys) // CHUNK)
+    if on_chunk:
+        on_chunk(0, total, {})
+    for i in range(0, len(missing_keys), CHUNK):
+        subset = missing_keys[i : i + CHUNK]
+        user_msg = (
+            f"Extract the following keys and return STRICT JSON only:\n{subset}\n\n"
+            f"TEXT:\n```{text[:MAX_TEXT_CHARS]}```"
+        )
+        try:
+            USAGE["calls"] += 1
+            chat = await client.chat.completions.create(
+                model=MODEL,
+                temperature=0,
+                max_tokens=MAX_TOKENS,
+                messages=[
+                    {"role": "system", "content": LLM_PROMPTS.get(lang, LLM_PROMPT)},
+                    {"role": "user", "content": user_msg},
+                ],
+                response_format={"type": "json_object"},
+            )
+        except asyncio.CancelledError:
+            # the in-flight completion plus every chunk that is never sent
+            unsent = total - i // CHUNK - 1
+            USAGE["cancelled_calls"] += 1
+            USAGE["tokens_saved"] += MAX_TOKENS + unsent * (
+                estimate_tokens(user_msg) + MAX_TOKENS
+            )
+            raise
+
+        raw = safe_json_load(chat.choices[0].message.content)
+        part: dict[str, ExtractResult] = {}
+        for k in subset:
+            node = raw.get(k, {})
+            val = node.get("value") if isinstance(node, dict) else node
+            conf = node.get("confidence", 0.5) if isinstance(node, dict) else 0.5
+            part[k] = ExtractResult(val, float(conf) if val else 0.0)
+        out.update(part)
+        if on_chunk:
+            on_chunk(i // CHUNK + 1, total, part)
+    return out
@@ -0,0 +1,163 @@
+"""SQLite checkpoint manifest for resumable bulk runs.
+
+One row per document records its content hash, the last stage it completed
+and that stage's output. A restarted run skips documents that already reached
+the target stage and resumes the others where they stopped – a document that
+finished the regex stage goes straight to the LLM with its stored text, so no
+ingestion or LLM call is paid twice.
+
+Stages: ``regex`` holds the raw regex output, the checkpoint an LLM run resumes
+from; ``refined`` is a finished regex-only result and ``llm`` a finished LLM
+result, both after the post-LLM refinement. A refined checkpoint keeps its text,
+so a later LLM run re-runs only the regex stage on it, never the refinement.
+
+The database runs in WAL mode so ``export`` or a progress query can read it
+while a run is writing.
+"""
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from need_analysis.schema import ExtractResult, dump_results, load_results
+
+STAGES = ("new", "regex", "refined", "llm")  # in pipeline order
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path         TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    stage        TEXT NOT NULL DEFAULT 'new',
+    status       TEXT NOT NULL DEFAULT 'ok',
+    text         TEXT,
+    fields       TEXT,
+    error        TEXT,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    updated_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_stage ON documents (stage, status);
+"""
+
+
+def content_hash(path: str | Path) -> str:
+    """SHA-256 of the file's bytes."""
+    with open(path, "rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """Parse ``"K/N"`` (0-based shard K of N).
+
+    Raises:
+        ValueError: If the spec is malformed or K is out of range.
+    """
+    k, _, n = spec.partition("/")
+    shard, shards = int(k), int(n)
+    if not 0 <= shard < shards:
+        raise ValueError(f"Shard {spec!r} must satisfy 0 <= K < N")
+    return shard, shards
+
+
+def in_shard(digest: str, shard: int, shards: int) -> bool:
+    """Whether ``digest`` falls into the ``shard``-th of ``shards`` equal hash ranges."""
+    return int(digest[:8], 16) * shards >> 32 == shard
+
+
+@dataclass
+class Checkpoint:
+    stage: str
+    status: str
+    text: str | None
+    fields: dict[str, ExtractResult]
+
+    def reached(self, stage: str) -> bool:
+        return self.status == "ok" and STAGES.index(self.stage) >= STAGES.index(stage)
+
+
+class Manifest:
+    """Per-document status, content hash and last completed stage."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.db = sqlite3.connect(self.path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def checkpoint(self, path: str, digest: str) -> Checkpoint | None:
+        """Return the stored state of ``path``, or ``None`` if new or its content changed."""
+        row = self.db.execute(
+            "SELECT content_hash, stage, status, text, fields FROM documents WHERE path = ?",
+            (path,),
+        ).fetchone()
+        if row is None or row[0] != digest:
+            return None
+        return Checkpoint(row[1], row[2], row[3], load_results(row[4]))
+
+    def record(
+        self,
+        path: str,
+        digest: str,
+        stage: str,
+        fields: dict[str, ExtractResult],
+        text: str | None = None,
+    ) -> None:
+        """Store the output of a completed stage. ``text`` is kept only until the last stage."""
+        self.db.execute(
+            """
+            INSERT INTO documents (path, content_hash, stage, status, text, fields, error, updated_at)
+            VALUES (?, ?, ?, 'ok', ?, ?, NULL, ?)
+            ON CONFLICT (path) DO UPDATE SET
+                content_hash = excluded.content_hash, stage = excluded.stage,
+                status = 'ok', text = excluded.text, fields = excluded.fields,
+                error = NULL, updated_at = excluded.updated_at
+            """,
+            (
+                path,
+                digest,
+                stage,
+                text if stage != STAGES[-1] else None,
+                dump_results(fields),
+                time.time(),
+            ),
+        )
+
+    def record_failure(self, path: str, digest: str, error: str) -> None:
+        """Mark ``path`` failed; its last completed stage is kept for the retry."""
+        self.db.execute(
+            """
+            INSERT INTO documents (path, content_hash, status, error, attempts, updated_at)
+            VALUES (?, ?, 'failed', ?, 1, ?)
+            ON CONFLICT (path) DO UPDATE SET
+                status = 'failed', error = excluded.error,
+                attempts = documents.attempts + 1, updated_at = excluded.updated_at
+            """,
+            (path, digest, error, time.time()),
+        )
+
+    def counts(self) -> dict[str, int]:
+        """Documents per ``stage/status``, e.g. ``{"llm/ok": 8000, "regex/failed": 3}``."""
+        rows = self.db.execute(
+            "SELECT stage || '/' || status, COUNT(*) FROM documents GROUP BY 1"
+        ).fetchall()
+        return dict(rows)
+
+    def results(
+        self, stage: str = STAGES[-1]
+    ) -> Iterator[tuple[str, dict[str, ExtractResult]]]:
+        """Yield ``(path, fields)`` for every document that reached ``stage``."""
+        ranks = STAGES[STAGES.index(stage) :]
+        rows = self.db.execute(
+            f"SELECT path, fields FROM documents WHERE status = 'ok' "
+            f"AND stage IN ({','.join('?' * len(ranks))}) ORDER BY path",
+            ranks,
+        )
+        for path, raw in rows:
+            yield path, load_results(raw)
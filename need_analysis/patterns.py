@@ -0,0 +1,377 @@
+"""Bilingual regex patterns and the regex search stage."""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from need_analysis.schema import ExtractResult
+
+# ──────────────────────────────────────────────
+# REGEX PATTERNS
+# (complete list incl. addons for missing keys)
+# ──────────────────────────────────────────────
+# per-language label alternatives, filled by _simple(); key → {lang: labels}
+LABELS: dict[str, dict[str, str]] = {}
+ANY_LANG = "any"
+# fields whose English labels non-English ads routinely use ("Tech Stack", "Soft Skills")
+EN_LABEL_FIELDS = {
+    "job_title",
+    "tech_stack",
+    "hard_skills",
+    "soft_skills",
+    "it_skills",
+    "must_have_skills",
+    "nice_to_have_skills",
+    "team_size",
+    "remote_policy",
+    "onboarding_process",
+    "other_perks",
+}
+
+
+# helper to cut boilerplate
+def _simple(label_en: str, label_de: str, cap: str, **other_langs: str) -> str:
+    """Register per-language labels for ``cap`` and return the combined pattern.
+
+    Further languages go in as keywords, e.g. ``fr="Intitulé\\s*du\\s*poste"``.
+    """
+    LABELS[cap] = {
+        lang: label
+        for lang, label in {"en": label_en, "de": label_de, **other_langs}.items()
+        if label
+    }
+    # an empty alternative would match every line start
+    label = "|".join(filter(None, (label_en, label_de)))
+    return rf"(?:{label})\s*:?\s*(?P<{cap}>.+)"
+
+
+REGEX_PATTERNS = {
+    # BASIC INFO - mandatory
+    "job_title": _simple("Job\\s*Title|Position", "Stellenbezeichnung", "job_title"),
+    "employment_type": _simple("Employment\\s*Type", "Vertragsart", "employment_type"),
+    "contract_type": _simple("Contract\\s*Type", "Vertragstyp", "contract_type"),
+    "seniority_level": _simple(
+        "Seniority\\s*Level", "Karrierelevel", "seniority_level"
+    ),
+    "date_of_employment_start": _simple(
+        "Start\\s*Date|Begin\\s*Date", "Eintrittsdatum", "date_of_employment_start"
+    ),
+    "work_schedule": _simple("Work\\s*Schedule", "Arbeitszeitmodell", "work_schedule"),
+    "work_location_city": _simple("City|Ort", "Ort", "work_location_city"),
+    # Company core
+    "company_name": _simple("Company|Employer", "Unternehmen", "company_name"),
+    "city": _simple("City", "Stadt", "city"),
+    "company_size": _simple("Company\\s*Size", "Mitarbeiterzahl", "company_size"),
+    "industry": _simple("Industry", "Branche", "industry"),
+    "headquarters_location": _simple(
+        "HQ\\s*Location", "Hauptsitz", "headquarters_location"
+    ),
+    "place_of_work": _simple("Place\\s*of\\s*Work", "Arbeitsort", "place_of_work"),
+    "company_website": r"(?P<company_website>https?://\S+)",
+    # Department / team
+    "department_name": _simple("Department", "Abteilung", "department_name"),
+    "brand_name": _simple("Brand", "", "brand_name"),
+    "team_size": _simple("Team\\s*Size", "Teamgröße", "team_size"),
+    "team_structure": _simple("Team\\s*Structure", "Teamaufbau", "team_structure"),
+    "direct_reports_count": _simple(
+        "Direct\\s*Reports", "Direkt\\s*Berichte", "direct_reports_count"
+    ),
+    "reports_to": _simple("Reports\\s*To", "unterstellt", "reports_to"),
+    "supervises": _simple("Supervises", "Führungsverantwortung", "supervises"),
+    "tech_stack": _simple("Tech(ology)?\\s*Stack", "Technologien?", "tech_stack"),
+    "culture_notes": _simple("Culture", "Kultur", "culture_notes"),
+    "team_challenges": _simple(
+        "Team\\s*Challenges", "Herausforderungen", "team_challenges"
+    ),
+    "client_difficulties": _simple(
+        "Client\\s*Difficulties", "Kundenprobleme", "client_difficulties"
+    ),
+    "main_stakeholders": _simple(
+        "Stakeholders?", "Hauptansprechpartner", "main_stakeholders"
+    ),
+    "team_motivation": _simple(
+        "Team\\s*Motivation", "Team\\s*Motivationen?", "team_motivation"
+    ),
+    "recent_team_changes": _simple(
+        "Recent\\s*Team\\s*Changes", "Teamveränderungen", "recent_team_changes"
+    ),
+    "office_language": _simple("Office\\s*Language", "Bürosprache", "office_language"),
+    "office_type": _simple("Office\\s*Type", "Bürotyp", "office_type"),
+    # Role definition
+    "role_description": _simple(
+        "Role\\s*Description|Role\\s*Purpose", "Aufgabenstellung", "role_description"
+    ),
+    "role_type": _simple("Role\\s*Type", "Rollenart", "role_type"),
+    "role_keywords": _simple(
+        "Role\\s*Keywords?", "Stellenschlüsselwörter", "role_keywords"
+    ),
+    "role_performance_metrics": _simple(
+        "Performance\\s*Metrics", "Rollenkennzahlen", "role_performance_metrics"
+    ),
+    "role_priority_projects": _simple(
+        "Priority\\s*Projects", "Prioritätsprojekte", "role_priority_projects"
+    ),
+    "primary_responsibilities": _simple(
+        "Primary\\s*Responsibilities", "Hauptaufgaben", "primary_responsibilities"
+    ),
+    "key_deliverables": _simple(
+        "Key\\s*Deliverables", "Ergebnisse", "key_deliverables"
+    ),
+    "success_metrics": _simple(
+        "Success\\s*Metrics", "Erfolgskennzahlen", "success_metrics"
+    ),
+    "main_projects": _simple("Main\\s*Projects", "Hauptprojekte", "main_projects"),
+    "travel_required": _simple(
+        "Travel\\s*Required", "Reisetätigkeit", "travel_required"
+    ),
+    "physical_duties": _simple(
+        "Physical\\s*Duties", "Körperliche\\s*Arbeit", "physical_duties"
+    ),
+    "on_call": _simple("On[-\\s]?Call", "Bereitschaft", "on_call"),
+    "decision_authority": _simple(
+        "Decision\\s*Authority", "Entscheidungsbefugnis", "decision_authority"
+    ),
+    "process_improvement": _simple(
+        "Process\\s*Improvement", "Prozessverbesserung", "process_improvement"
+    ),
+    "innovation_expected": _simple(
+        "Innovation\\s*Expected", "Innovationsgrad", "innovation_expected"
+    ),
+    "daily_tools": _simple("Daily\\s*Tools", "Tägliche\\s*Tools?", "daily_tools"),
+    # Tasks
+    "task_list": _simple("Task\\s*List", "Aufgabenliste", "task_list"),
+    "key_responsibilities": _simple(
+        "Key\\s*Responsibilities", "Hauptverantwortlichkeiten", "key_responsibilities"
+    ),
+    "technical_tasks": _simple(
+        "Technical\\s*Tasks?", "Technische\\s*Aufgaben", "technical_tasks"
+    ),
+    "managerial_tasks": _simple(
+        "Managerial\\s*Tasks?", "Führungsaufgaben", "managerial_tasks"
+    ),
+    "administrative_tasks": _simple(
+        "Administrative\\s*Tasks?", "Verwaltungsaufgaben", "administrative_tasks"
+    ),
+    "customer_facing_tasks": _simple(
+        "Customer[-\\s]?Facing\\s*Tasks?",
+        "Kundenkontaktaufgaben",
+        "customer_facing_tasks",
+    ),
+    "internal_reporting_tasks": _simple(
+        "Internal\\s*Reporting\\s*Tasks", "Berichtsaufgaben", "internal_reporting_tasks"
+    ),
+    "performance_tasks": _simple(
+        "Performance\\s*Tasks", "Leistungsaufgaben", "performance_tasks"
+    ),
+    "innovation_tasks": _simple(
+        "Innovation\\s*Tasks", "Innovationsaufgaben", "innovation_tasks"
+    ),
+    "task_prioritization": _simple(
+        "Task\\s*Prioritization", "Aufgabenpriorisierung", "task_prioritization"
+    ),
+    # Skills
+    "must_have_skills": _simple(
+        "Must[-\\s]?Have\\s*Skills?", "Erforderliche\\s*Kenntnisse", "must_have_skills"
+    ),
+    "nice_to_have_skills": _simple(
+        "Nice[-\\s]?to[-\\s]?Have\\s*Skills?", "Wünschenswert", "nice_to_have_skills"
+    ),
+    "hard_skills": _simple("Hard\\s*Skills", "Fachkenntnisse", "hard_skills"),
+    "soft_skills": _simple("Soft\\s*Skills", "Soziale\\s*Kompetenzen?", "soft_skills"),
+    "certifications_required": _simple(
+        "Certifications?\\s*Required", "Zertifikate", "certifications_required"
+    ),
+    "language_requirements": _simple(
+        "Language\\s*Requirements", "Sprachanforderungen", "language_requirements"
+    ),
+    "languages_optional": _simple(
+        "Languages\\s*Optional", "Weitere\\s*Sprachen", "languages_optional"
+    ),
+    "analytical_skills": _simple(
+        "Analytical\\s*Skills", "Analytische\\s*Fähigkeiten", "analytical_skills"
+    ),
+    "communication_skills": _simple(
+        "Communication\\s*Skills", "Kommunikationsfähigkeiten", "communication_skills"
+    ),
+    "project_management_skills": _simple(
+        "Project\\s*Management\\s*Skills",
+        "Projektmanagementskills?",
+        "project_management_skills",
+    ),
+    "tool_proficiency": _simple(
+        "Tool\\s*Proficiency", "Toolkenntnisse", "tool_proficiency"
+    ),
+    "domain_expertise": _simple(
+        "Domain\\s*Expertise", "Fachgebiet", "domain_expertise"
+    ),
+    "leadership_competencies": _simple(
+        "Leadership\\s*Competencies", "Führungskompetenzen?", "leadership_competencies"
+    ),
+    "industry_experience": _simple(
+        "Industry\\s*Experience", "Branchenerfahrung", "industry_experience"
+    ),
+    "soft_requirement_details": _simple(
+        "Soft\\s*Requirement\\s*Details",
+        "Weitere\\s*Anforderungen",
+        "soft_requirement_details",
+    ),
+    "years_experience_min": _simple(
+        "Years\\s*Experience", "Berufserfahrung", "years_experience_min"
+    ),
+    "it_skills": _simple("IT\\s*Skills", "IT[-\\s]?Kenntnisse", "it_skills"),
+    "visa_sponsorship": _simple(
+        "Visa\\s*Sponsorship", "Visasponsoring", "visa_sponsorship"
+    ),
+    # Compensation
+    "salary_currency": _simple("Currency", "Währung", "salary_currency"),
+    "salary_range": r"(?P<salary_range>\d{4,6}\s*(?:-|to|–)\s*\d{4,6})",
+    "salary_range_min": r"(?P<salary_range_min>\d{4,6})\s*(?:-|to|–)\s*\d{4,6}",
+    "salary_range_max": r"\d{4,6}\s*(?:-|to|–)\s*(?P<salary_range_max>\d{4,6})",
+    "bonus_scheme": _simple(
+        "Bonus\\s*Scheme|Bonus\\s*Model", "Bonusregelung", "bonus_scheme"
+    ),
+    "commission_structure": _simple(
+        "Commission\\s*Structure", "Provisionsmodell", "commission_structure"
+    ),
+    "variable_comp": _simple(
+        "Variable\\s*Comp", "Variable\\s*Vergütung", "variable_comp"
+    ),
+    "vacation_days": _simple("Vacation\\s*Days", "Urlaubstage", "vacation_days"),
+    "remote_policy": _simple(
+        "Remote\\s*Policy", "Home\\s*Office\\s*Regelung", "remote_policy"
+    ),
+    "flexible_hours": _simple(
+        "Flexible\\s*Hours|Gleitzeit", "Gleitzeit", "flexible_hours"
+    ),
+    "relocation_support": _simple(
+        "Relocation\\s*Support", "Umzugshilfe", "relocation_support"
+    ),
+    "childcare_support": _simple(
+        "Childcare\\s*Support", "Kinderbetreuung", "childcare_support"
+    ),
+    "learning_budget": _simple(
+        "Learning\\s*Budget", "Weiterbildungsbudget", "learning_budget"
+    ),
+    "company_car": _simple("Company\\s*Car", "Firmenwagen", "company_car"),
+    "sabbatical_option": _simple(
+        "Sabbatical\\s*Option", "Auszeitmodell", "sabbatical_option"
+    ),
+    "health_insurance": _simple(
+        "Health\\s*Insurance", "Krankenversicherung", "health_insurance"
+    ),
+    "pension_plan": _simple("Pension\\s*Plan", "Altersvorsorge", "pension_plan"),
+    "stock_options": _simple("Stock\\s*Options", "Aktienoptionen", "stock_options"),
+    "other_perks": _simple("Other\\s*Perks", "Weitere\\s*Benefits", "other_perks"),
+    "pay_frequency": r"(?P<pay_frequency>monthly|annual|yearly|hourly|quarterly)",
+    # Recruitment
+    "recruitment_contact_email": r"(?P<recruitment_contact_email>[\w\.-]+@[\w\.-]+\.\w+)",
+    "recruitment_contact_phone": _simple(
+        "Contact\\s*Phone", "Telefon", "recruitment_contact_phone"
+    ),
+    "recruitment_steps": _simple(
+        "Recruitment\\s*Steps", "Bewerbungsprozess", "recruitment_steps"
+    ),
+    "recruitment_timeline": _simple(
+        "Recruitment\\s*Timeline", "Bewerbungszeitplan", "recruitment_timeline"
+    ),
+    "number_of_interviews": _simple(
+        "Number\\s*of\\s*Interviews", "Anzahl\\s*Interviews", "number_of_interviews"
+    ),
+    "interview_format": _simple(
+        "Interview\\s*Format", "Interviewformat", "interview_format"
+    ),
+    "interview_stage_count": _simple(
+        "Interview\\s*Stages?", "Bewerbungsgespräche", "interview_stage_count"
+    ),
+    "interview_docs_required": _simple(
+        "Interview\\s*Docs\\s*Required", "Unterlagen", "interview_docs_required"
+    ),
+    "assessment_tests": _simple(
+        "Assessment\\s*Tests?", "Einstellungstests?", "assessment_tests"
+    ),
+    "interview_notes": _simple(
+        "Interview\\s*Notes", "Interviewnotizen", "interview_notes"
+    ),
+    "onboarding_process": _simple(
+        "Onboarding\\s*Process", "Einarbeitung", "onboarding_process"
+    ),
+    "onboarding_process_overview": _simple(
+        "Onboarding\\s*Overview",
+        "Einarbeitungsüberblick",
+        "onboarding_process_overview",
+    ),
+    "probation_period": _simple("Probation\\s*Period", "Probezeit", "probation_period"),
+    "mentorship_program": _simple(
+        "Mentorship\\s*Program", "Mentorenprogramm", "mentorship_program"
+    ),
+    "welcome_package": _simple(
+        "Welcome\\s*Package", "Willkommenspaket", "welcome_package"
+    ),
+    "application_instructions": _simple(
+        "Application\\s*Instructions", "Bewerbungshinweise", "application_instructions"
+    ),
+    # Key contacts
+    "line_manager_name": _simple(
+        "Line\\s*Manager", "Fachvorgesetzte?r", "line_manager_name"
+    ),
+    "line_manager_email": r"(?P<line_manager_email>[\w\.-]+@[\w\.-]+\.\w+)",
+    "line_manager_recv_cv": _simple(
+        "Receives\\s*CV", "Erhält\\s*CV", "line_manager_recv_cv"
+    ),
+    "hr_poc_name": _simple("HR\\s*POC", "Ansprechpartner\\s*HR", "hr_poc_name"),
+    "hr_poc_email": r"(?P<hr_poc_email>[\w\.-]+@[\w\.-]+\.\w+)",
+    "hr_poc_recv_cv": _simple("Receives\\s*CV", "Erhält\\s*CV", "hr_poc_recv_cv"),
+    "finance_poc_name": _simple(
+        "Finance\\s*POC", "Ansprechpartner\\s*Finance", "finance_poc_name"
+    ),
+    "finance_poc_email": r"(?P<finance_poc_email>[\w\.-]+@[\w\.-]+\.\w+)",
+    "finance_poc_recv_offer": _simple(
+        "Receives\\s*Offer", "Erhält\\s*Angebot", "finance_poc_recv_offer"
+    ),
+}
+
+
+_FLAGS = re.IGNORECASE | re.MULTILINE
+
+
+@lru_cache(maxsize=None)
+def compiled_patterns(lang: str = ANY_LANG) -> dict[str, re.Pattern[str]]:
+    """Return REGEX_PATTERNS compiled for one language.
+
+    Labelled patterns keep only that language's alternatives, plus the English
+    ones for :data:`EN_LABEL_FIELDS` and for fields the language has no label
+    for; label-free patterns such as e-mail or salary ranges are shared.
+    ``ANY_LANG`` gives the full set for texts whose language is unclear.
+    """
+    out: dict[str, re.Pattern[str]] = {}
+    for key, pat in REGEX_PATTERNS.items():
+        labels = LABELS.get(key)
+        if labels and lang != ANY_LANG:
+            own = labels.get(lang)
+            en = labels["en"] if key in EN_LABEL_FIELDS or not own else None
+            label = "|".join(filter(None, dict.fromkeys((own, en))))
+            pat = rf"(?:{label})\s*:?\s*(?P<{key}>.+)"
+        out[key] = re.compile(pat, _FLAGS)
+    return out
+
+
+# ── Regex search --------------------------------------------------------------
+def pattern_search(
+    text: str, key: str, pat: str | re.Pattern[str]
+) -> ExtractResult | None:
+    """
+    Sucht Pattern, säubert gängige Präfixe („Name:“, „City:“ …) und liefert
+    ein ExtractResult mit fixer Regex-Confidence 0.9.
+    """
+    if isinstance(pat, str):
+        pat = re.compile(pat, _FLAGS)
+    m = pat.search(text)
+    if not (m and m.group(key)):
+        return None
+
+    val = m.group(key).strip()
+
+    # gängige Labels am Zeilenanfang entfernen
+    val = re.sub(r"^(?:Name|City|Ort|Stadt)\s*[:\-]?\s*", "", val, flags=re.I)
+
+    return ExtractResult(value=val, confidence=0.9)
@@ -0,0 +1,151 @@
+"""Compact per-requisition record with fixed field slots.
+
+A ``dict[str, ExtractResult]`` with 120+ keys costs a hash table plus one
+object per field. :class:`JobRequisition` stores the same data as one list
+of values and one ``array('d')`` of confidences, indexed by the position of
+the key in :data:`FIELDS`, and reads like the dict it replaces. Typed values
+(:mod:`need_analysis.typed`) get a third parallel list, allocated only when
+the first one is stored.
+
+The pipeline stages work on dicts; a finished extraction is held as a
+record – by :class:`~need_analysis.tasks.ExtractionTask`, the shared cache
+and :class:`~need_analysis.jobs.Job` results.
+"""
+from __future__ import annotations
+
+import json
+from array import array
+from typing import Any, Iterator, Mapping
+
+from need_analysis.patterns import REGEX_PATTERNS
+from need_analysis.schema import STEPS, ExtractResult
+
+# wizard order first, then pattern-only keys, then the pipeline's own metadata
+FIELDS: tuple[str, ...] = tuple(
+    dict.fromkeys(
+        [k for _, keys in STEPS for k in keys]
+        + list(REGEX_PATTERNS)
+        + ["language_of_ad"]
+    )
+)
+INDEX: dict[str, int] = {k: i for i, k in enumerate(FIELDS)}
+
+
+class JobRequisition:
+    """Values and confidences of every schema field, addressed by key.
+
+    Mapping-like (``get``, ``[]``, ``in``, ``items``) over the fields that hold
+    a value, so it can stand in for ``dict[str, ExtractResult]`` in read paths.
+
+    Raises:
+        KeyError: When setting a key that is not in :data:`FIELDS`.
+    """
+
+    __slots__ = ("values", "confidence", "typed")
+
+    def __init__(self) -> None:
+        self.values: list[Any] = [None] * len(FIELDS)
+        self.confidence = array("d", bytes(8 * len(FIELDS)))  # doubles: 0.9 stays 0.9
+        self.typed: list[Any] | None = None
+
+    # ── access ----------------------------------------------------------------
+    def set(
+        self, key: str, value: Any, confidence: float = 0.0, typed: Any = None
+    ) -> None:
+        i = INDEX[key]
+        self.values[i] = value
+        self.confidence[i] = confidence
+        self._set_typed(i, typed)
+
+    def _set_typed(self, i: int, typed: Any) -> None:
+        if typed is not None and self.typed is None:
+            self.typed = [None] * len(FIELDS)
+        if self.typed is not None:
+            self.typed[i] = typed
+
+    def _typed(self, i: int) -> Any:
+        return self.typed[i] if self.typed is not None else None
+
+    def get(
+        self, key: str, default: ExtractResult | None = None
+    ) -> ExtractResult | None:
+        i = INDEX.get(key)
+        if i is None or self.values[i] is None:
+            return default
+        return ExtractResult(self.values[i], self.confidence[i], self._typed(i))
+
+    def __getitem__(self, key: str) -> ExtractResult:
+        if (res := self.get(key)) is None:
+            raise KeyError(key)
+        return res
+
+    def __contains__(self, key: object) -> bool:
+        i = INDEX.get(key)  # type: ignore[arg-type]
+        return i is not None and self.values[i] is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (k for k, v in zip(FIELDS, self.values) if v is not None)
+
+    def __len__(self) -> int:
+        return sum(v is not None for v in self.values)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self)
+
+    def items(self) -> Iterator[tuple[str, ExtractResult]]:
+        typed = self.typed or [None] * len(FIELDS)
+        for k, v, c, t in zip(FIELDS, self.values, self.confidence, typed):
+            if v is not None:
+                yield k, ExtractResult(v, c, t)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, JobRequisition):
+            return NotImplemented
+        return (
+            self.values == other.values
+            and self.confidence == other.confidence
+            and (self.typed or []) == (other.typed or [])
+        )
+
+    def __repr__(self) -> str:
+        return f"JobRequisition({len(self)}/{len(FIELDS)} fields)"
+
+    # ── conversion ------------------------------------------------------------
+    @classmethod
+    def from_results(cls, fields: Mapping[str, ExtractResult]) -> JobRequisition:
+        """Build from pipeline output; keys outside :data:`FIELDS` are dropped."""
+        rec = cls()
+        for k, res in fields.items():
+            if (i := INDEX.get(k)) is not None:
+                rec.values[i] = res.value
+                rec.confidence[i] = res.confidence
+                rec._set_typed(i, res.typed)
+        return rec
+
+    def to_results(self) -> dict[str, ExtractResult]:
+        return dict(self.items())
+
+    def to_json(self) -> str:
+        """Same ``{key: [value, confidence(, typed)]}`` shape as :func:`~need_analysis.schema.dump_results`."""
+        typed = self.typed or [None] * len(FIELDS)
+        return json.dumps(
+            {
+                k: [v, c] if t is None else [v, c, t]
+                for k, v, c, t in zip(
+                    FIELDS, self.values, self.confidence.tolist(), typed
+                )
+                if v is not None
+            },
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str | None) -> JobRequisition:
+        rec = cls()
+        for k, (v, c, *typed) in json.loads(raw or "{}").items():
+            if (i := INDEX.get(k)) is not None:
+                rec.values[i] = v
+                rec.confidence[i] = c
+                if typed:
+                    rec._set_typed(i, typed[0])
+        return rec
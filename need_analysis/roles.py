@@ -0,0 +1,161 @@
+"""Role templates – task, skill and compensation suggestions by job title.
+
+Templates live in ``data/role_templates.json``: each has title ``patterns``
+(English and German), the suggestions it provides and, where the role maps
+to one, its ISCO-08 occupation code (``isco``). A pattern matches whole
+words only – "react" does not match "Reactor Operator" – unless a ``*``
+opens one of its edges for German compounds: ``"*buchhalter"`` also matches
+"Finanzbuchhalter", ``"vertrieb*"`` also "Vertriebsmitarbeiter". All
+patterns of the catalog are compiled into one Aho-Corasick automaton, so
+matching a title is a single pass over its characters, however many
+templates the catalog holds. For every suggestion field the template with
+the longest matching pattern wins: "python developer" beats "developer".
+"""
+from __future__ import annotations
+
+import json
+import re
+from functools import cache
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+TEMPLATES_PATH = Path(__file__).with_name("data") / "role_templates.json"
+SUGGESTION_FIELDS = (
+    "task_list",
+    "must_have_skills",
+    "bonus_scheme",
+    "commission_structure",
+    "isco",
+)
+
+_NON_WORD = re.compile(r"[\W_]+")
+_SHIFT = 21  # code points fit in 21 bits; a transition key is state << 21 | char
+
+
+def normalize_title(text: str) -> str:
+    """``"Senior Sales-Manager (m/w/d)"`` → ``" senior sales manager m w d "``.
+
+    Lowercase words separated by single spaces and padded with one space, so
+    a pattern padded the same way (see :func:`_pattern`) only matches whole words.
+    """
+    return f" {_NON_WORD.sub(' ', text.lower()).strip()} "
+
+
+def _pattern(text: str) -> str:
+    """Normalize a pattern like a title; ``"*buchhalter"`` → ``"buchhalter "``.
+
+    Each edge is padded with a space, so it only matches at a word boundary,
+    unless the pattern opens it with ``*``.
+    """
+    text = text.strip()
+    core = _NON_WORD.sub(" ", text.strip("*").lower()).strip()
+    if not core:
+        return ""
+    return f"{'' if text.startswith('*') else ' '}{core}{'' if text.endswith('*') else ' '}"
+
+
+class Automaton:
+    """Aho-Corasick automaton over characters.
+
+    Transitions are one flat dict keyed by ``state << 21 | ord(char)``;
+    ``fail`` and ``link`` (the nearest state on the fail chain that ends a
+    pattern) are lists indexed by state.
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self.patterns = list(patterns)
+        goto: dict[int, int] = {}
+        out = [-1]  # pattern ending at each state
+        for i, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                key = state << _SHIFT | ord(ch)
+                if (nxt := goto.get(key)) is None:
+                    nxt = goto[key] = len(out)
+                    out.append(-1)
+                state = nxt
+            if out[state] < 0:  # duplicates: the first pattern keeps the state
+                out[state] = i
+
+        children: list[list[tuple[int, int]]] = [[] for _ in out]
+        for key, nxt in goto.items():
+            children[key >> _SHIFT].append((key & ((1 << _SHIFT) - 1), nxt))
+        fail = [0] * len(out)
+        link = [0] * len(out)
+        queue = [nxt for _, nxt in children[0]]  # depth 1 fails to the root
+        for state in queue:  # BFS; the list grows while it is walked
+            for c, nxt in children[state]:
+                f = fail[state]
+                while f and (f << _SHIFT | c) not in goto:
+                    f = fail[f]
+                fail[nxt] = goto.get(f << _SHIFT | c, 0)
+                link[nxt] = fail[nxt] if out[fail[nxt]] >= 0 else link[fail[nxt]]
+                queue.append(nxt)
+        self._goto, self._fail, self._link, self._out = goto, fail, link, out
+
+    def __len__(self) -> int:
+        return len(self._out)
+
+    def find(self, text: str) -> Iterator[int]:
+        """Indices of all patterns occurring in ``text`` (with repeats)."""
+        goto, fail, link, out = self._goto, self._fail, self._link, self._out
+        state = 0
+        for ch in text:
+            c = ord(ch)
+            while (nxt := goto.get(state << _SHIFT | c)) is None and state:
+                state = fail[state]
+            state = nxt or 0
+            hit = state if out[state] >= 0 else link[state]
+            while hit:
+                yield out[hit]
+                hit = link[hit]
+
+
+class RoleIndex:
+    """Suggestions for a job title from a catalog of role templates."""
+
+    def __init__(self, templates: Sequence[dict[str, Any]]) -> None:
+        self.templates = list(templates)
+        patterns, owners = [], []
+        for t, template in enumerate(self.templates):
+            for pattern in template["patterns"]:
+                if p := _pattern(pattern):
+                    patterns.append(p)
+                    owners.append(t)
+        self.owners = owners
+        # specificity counts the words only, not the boundary padding
+        self.lengths = [len(p.strip()) for p in patterns]
+        self.automaton = Automaton(patterns)
+
+    @classmethod
+    def load(cls, path: str | Path = TEMPLATES_PATH) -> RoleIndex:
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    def matches(self, title: str) -> list[dict[str, Any]]:
+        """Templates matching ``title``, most specific (longest pattern) first."""
+        best: dict[int, int] = {}
+        for p in self.automaton.find(normalize_title(title)):
+            t = self.owners[p]
+            best[t] = max(best.get(t, 0), self.lengths[p])
+        order = sorted(best, key=lambda t: (-best[t], t))  # ties: catalog order
+        return [self.templates[t] for t in order]
+
+    def suggest(self, title: str) -> dict[str, Any]:
+        """:data:`SUGGESTION_FIELDS` values for ``title``; each from the most specific template."""
+        out: dict[str, Any] = {}
+        for template in self.matches(title):
+            for field in SUGGESTION_FIELDS:
+                if field in template and field not in out:
+                    out[field] = template[field]
+        return out
+
+
+@cache
+def role_index() -> RoleIndex:
+    """Index of the bundled catalog, compiled on first use."""
+    return RoleIndex.load()
+
+
+def role_suggestions(title: str) -> dict[str, Any]:
+    """Suggestions for ``title`` from the bundled catalog (see :meth:`RoleIndex.suggest`)."""
+    return role_index().suggest(title) if title else {}
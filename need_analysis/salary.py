@@ -0,0 +1,251 @@
+"""Salary benchmarks – P25 / P50 / P75 by occupation, region and seniority.
+
+The benchmark table is a local CSV (``NEED_ANALYSIS_SALARY_CSV``, default
+``~/.cache/need_analysis/salaries.csv``) with the columns::
+
+    occupation,region,seniority,currency,period,p25,p50,p75
+    2512,berlin,senior,EUR,year,68000,76000,86000
+    2512,,,EUR,year,52000,61000,72000
+
+``occupation`` is an ISCO-08 code of any length, ``region`` a city or
+country name and ``seniority`` one of :data:`SENIORITIES`. An empty
+``region`` or ``seniority`` marks a row that covers all of them. On load,
+every row is converted to EUR per year and keyed by one ``int64``. The keys
+are sorted next to an ``(n, 3)`` percentile matrix. A lookup tries the most
+specific key first and then falls back, in this order: region → all
+regions, seniority → all levels, and a 4-digit occupation → its 3-, 2- and
+1-digit groups. A batch of lookups is one ``searchsorted`` over all
+candidate keys.
+"""
+from __future__ import annotations
+
+import csv
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Mapping, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SALARY_PATH = Path(
+    os.getenv(
+        "NEED_ANALYSIS_SALARY_CSV",
+        Path.home() / ".cache" / "need_analysis" / "salaries.csv",
+    )
+)
+SENIORITIES = ("junior", "mid", "senior", "lead")
+# full-time units
+PERIODS = {"year": 1, "month": 12, "week": 52, "day": 260, "hour": 2080}
+# approximate; pass current rates to SalaryStore when converting for offers
+RATES_TO_EUR = {"EUR": 1.0, "CHF": 1.05, "GBP": 1.17, "USD": 0.92}
+
+_SENIORITY = (
+    (
+        re.compile(
+            r"\b(?:head|lead|leit(?:er|ung)|principal|director|direktor|chief|vp)\b",
+            re.I,
+        ),
+        "lead",
+    ),
+    (re.compile(r"\b(?:senior|sr|erfahren|expert)\b", re.I), "senior"),
+    (
+        re.compile(
+            r"\b(?:junior|jr|trainees?|einsteiger(?:in)?|entry|graduate|absolvent(?:in)?)\b",
+            re.I,
+        ),
+        "junior",
+    ),
+    (
+        re.compile(r"\b(?:mid(?:[- ]?level)?|intermediate|berufserfahren)\b", re.I),
+        "mid",
+    ),
+)
+
+
+def seniority_of(text: str) -> str:
+    """``"Senior Data Engineer"`` → ``"senior"``; ``""`` when the text names no level."""
+    return next((level for rx, level in _SENIORITY if rx.search(text)), "")
+
+
+def _norm(text: str | None) -> str:
+    return " ".join((text or "").lower().split())
+
+
+@dataclass(frozen=True, slots=True)
+class SalaryBenchmark:
+    p25: float
+    p50: float
+    p75: float
+    currency: str
+    period: str
+
+
+class SalaryStore:
+    """Percentile lookups on a benchmark table, one at a time or in batches.
+
+    Raises:
+        ValueError: If a row names an unknown currency or pay period.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[Mapping[str, str]],
+        rates: Mapping[str, float] = RATES_TO_EUR,
+    ) -> None:
+        self.rates = dict(rates)
+        self.occupations: dict[str, int] = {}
+        self.regions: dict[str, int] = {"": 0}
+        self.seniorities = {s: i for i, s in enumerate(("", *SENIORITIES))}
+        keys, values = [], []
+        for row in rows:
+            occ = row["occupation"].strip()
+            region = _norm(row.get("region"))
+            level = _norm(row.get("seniority"))
+            if level not in self.seniorities:
+                logger.warning("Skipping salary row with seniority %r", level)
+                continue
+            o = self.occupations.setdefault(occ, len(self.occupations))
+            r = self.regions.setdefault(region, len(self.regions))
+            keys.append((o, r, self.seniorities[level]))
+            factor = self._to_eur_year(
+                row.get("currency") or "EUR", row.get("period") or "year"
+            )
+            values.append([float(row[p]) * factor for p in ("p25", "p50", "p75")])
+
+        self._r, self._s = len(self.regions), len(self.seniorities)
+        packed = np.array(
+            [(o * self._r + r) * self._s + s for o, r, s in keys], dtype=np.int64
+        )
+        order = np.argsort(packed, kind="stable")
+        self.keys = packed[order]
+        self.values = np.array(values, dtype=np.float64).reshape(-1, 3)[order]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def load(cls, path: str | Path = SALARY_PATH, **kwargs) -> SalaryStore:
+        """Read a benchmark CSV (see the module docstring for the columns)."""
+        with open(path, encoding="utf-8", newline="") as fh:
+            return cls(csv.DictReader(fh), **kwargs)
+
+    def _to_eur_year(self, currency: str, period: str) -> float:
+        currency, period = currency.strip().upper(), period.strip().lower()
+        if currency not in self.rates or period not in PERIODS:
+            raise ValueError(
+                f"Unknown currency or pay period: {currency!r} / {period!r}"
+            )
+        return self.rates[currency] * PERIODS[period]
+
+    # ── lookups -------------------------------------------------------------------
+    def _candidates(self, occupation: str, region: str, seniority: str) -> list[int]:
+        """Keys to try for one query, most specific first."""
+        regions = [r for r in dict.fromkeys((_norm(region), "")) if r in self.regions]
+        levels = [
+            s for s in dict.fromkeys((_norm(seniority), "")) if s in self.seniorities
+        ]
+        code = occupation.strip()
+        out = []
+        for n in range(len(code), 0, -1):
+            if (o := self.occupations.get(code[:n])) is None:
+                continue
+            for s in levels:
+                out.extend(
+                    (o * self._r + self.regions[r]) * self._s + self.seniorities[s]
+                    for r in regions
+                )
+        return out
+
+    def percentiles(
+        self,
+        occupations: Sequence[str],
+        regions: Sequence[str] | None = None,
+        seniorities: Sequence[str] | None = None,
+        currency: str = "EUR",
+        period: str = "year",
+    ) -> np.ndarray:
+        """P25/P50/P75 for many queries at once.
+
+        Args:
+            occupations: ISCO-08 codes, one per query.
+            regions: City or country per query (default: all regions).
+            seniorities: One of :data:`SENIORITIES` or ``""`` per query.
+            currency: Currency of the result.
+            period: Pay period of the result (a key of :data:`PERIODS`).
+
+        Returns:
+            ``(len(occupations), 3)`` array; rows without any benchmark are NaN.
+
+        Raises:
+            ValueError: If ``currency`` or ``period`` is unknown.
+        """
+        n = len(occupations)
+        regions = regions or [""] * n
+        seniorities = seniorities or [""] * n
+        candidates = [
+            self._candidates(*q) for q in zip(occupations, regions, seniorities)
+        ]
+        width = max(map(len, candidates), default=0)
+        out = np.full((n, 3), np.nan)
+        if not width or not len(self.keys):
+            return out
+        cand = np.full((n, width), -1, dtype=np.int64)
+        for i, keys in enumerate(candidates):
+            cand[i, : len(keys)] = keys
+        pos = np.minimum(np.searchsorted(self.keys, cand), len(self.keys) - 1)
+        found = (self.keys[pos] == cand) & (cand >= 0)
+        hit = found.any(axis=1)
+        first = found.argmax(axis=1)  # most specific candidate that exists
+        out[hit] = self.values[pos[hit, first[hit]]]
+        return out / self._to_eur_year(currency, period)
+
+    def lookup(
+        self,
+        occupation: str,
+        region: str = "",
+        seniority: str = "",
+        currency: str = "EUR",
+        period: str = "year",
+    ) -> SalaryBenchmark | None:
+        """Benchmark for one query, or ``None`` if no row covers the occupation."""
+        p25, p50, p75 = self.percentiles(
+            [occupation], [region], [seniority], currency, period
+        )[0]
+        if np.isnan(p50):
+            return None
+        return SalaryBenchmark(float(p25), float(p50), float(p75), currency, period)
+
+
+_default: SalaryStore | None = None
+_default_path: Path | None = None
+_default_lock = threading.Lock()
+
+
+def get_salary_store(path: str | Path = SALARY_PATH) -> SalaryStore | None:
+    """Shared store for the CSV at ``path``, or ``None`` if there is none."""
+    global _default, _default_path
+    path = Path(path)
+    with _default_lock:
+        if _default is None or _default_path != path:
+            try:
+                _default, _default_path = SalaryStore.load(path), path
+            except (OSError, ValueError, KeyError) as exc:
+                logger.debug("No salary benchmarks at %s: %s", path, exc)
+                return None
+        return _default
+
+
+def occupation_code(title: str) -> str | None:
+    """ISCO-08 code for a job title: the offline ESCO index if built, else the role templates."""
+    from need_analysis.esco.index import get_index
+    from need_analysis.roles import role_suggestions
+
+    if (index := get_index()) is not None and (occ := index.find_occupation(title)):
+        if code := index.isco_group(occ.uri):
+            return code
+    return role_suggestions(title).get("isco")
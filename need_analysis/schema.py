@@ -0,0 +1,224 @@
+"""Field schema shared by the extraction core and the wizard UI."""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+DATE_KEYS = {"date_of_employment_start", "application_deadline"}
+MONTH_KEYS = {"probation_period"}  # whole months, rendered as a number input
+
+# ★ mandatory
+MUST_HAVE_KEYS = {
+    "job_title",
+    "company_name",
+    "city",
+    "employment_type",
+    "contract_type",
+    "seniority_level",
+    "role_description",
+    "role_type",
+    "task_list",
+    "must_have_skills",
+    "salary_range",
+    "salary_currency",
+    "pay_frequency",
+    "recruitment_contact_email",
+}
+
+# Wizard steps  (0 = upload)
+STEPS: list[tuple[str, list[str]]] = [
+    (
+        "Basic Information",
+        [
+            "job_title",
+            "employment_type",
+            "contract_type",
+            "seniority_level",
+            "date_of_employment_start",
+            "job_ref_number",
+            "application_deadline",
+            "work_schedule",
+            "work_location_city",
+            "job_type",  # legacy catch – rendered but hidden if empty
+        ],
+    ),
+    (
+        "Company Info",
+        [
+            "company_name",
+            "city",
+            "company_size",
+            "industry",
+            "headquarters_location",
+            "place_of_work",
+            "company_website",
+            "employer_brand",
+            "ownership_type",
+            "main_products_services",
+            "company_values",
+            "employee_turnover",
+            "recent_achievements",
+            "glassdoor_rating",
+        ],
+    ),
+    (
+        "Department & Team",
+        [
+            "department_name",
+            "brand_name",
+            "team_size",
+            "team_structure",
+            "direct_reports_count",
+            "reports_to",
+            "supervises",
+            "tech_stack",
+            "culture_notes",
+            "team_challenges",
+            "client_difficulties",
+            "main_stakeholders",
+            "team_motivation",
+            "recent_team_changes",
+            "office_language",
+            "office_type",
+        ],
+    ),
+    (
+        "Role Definition",
+        [
+            "role_description",
+            "role_type",
+            "role_keywords",
+            "role_performance_metrics",
+            "role_priority_projects",
+            "primary_responsibilities",
+            "key_deliverables",
+            "success_metrics",
+            "main_projects",
+            "travel_required",
+            "physical_duties",
+            "on_call",
+            "decision_authority",
+            "process_improvement",
+            "innovation_expected",
+            "daily_tools",
+        ],
+    ),
+    (
+        "Tasks & Responsibilities",
+        [
+            "task_list",
+            "key_responsibilities",
+            "technical_tasks",
+            "managerial_tasks",
+            "administrative_tasks",
+            "customer_facing_tasks",
+            "internal_reporting_tasks",
+            "performance_tasks",
+            "innovation_tasks",
+            "task_prioritization",
+        ],
+    ),
+    (
+        "Skills & Competencies",
+        [
+            "must_have_skills",
+            "nice_to_have_skills",
+            "hard_skills",
+            "soft_skills",
+            "certifications_required",
+            "language_requirements",
+            "languages_optional",
+            "tool_proficiency",
+            "tech_stack",  # second appearance for editing convenience
+            "domain_expertise",
+            "leadership_competencies",
+            "industry_experience",
+            "analytical_skills",
+            "communication_skills",
+            "project_management_skills",
+            "soft_requirement_details",
+            "years_experience_min",
+            "it_skills",
+            "visa_sponsorship",
+            "llm_generated_skill_pool",
+            "skills_must_high",
+            "skills_must_low",
+            "skills_nice_high",
+            "skills_nice_low",
+        ],
+    ),
+    (
+        "Compensation & Benefits",
+        [
+            "salary_range",
+            "salary_currency",
+            "pay_frequency",
+            "bonus_scheme",
+            "commission_structure",
+            "variable_comp",
+            "vacation_days",
+            "remote_policy",
+            "flexible_hours",
+            "relocation_support",
+            "childcare_support",
+            "learning_budget",
+            "company_car",
+            "sabbatical_option",
+            "health_insurance",
+            "pension_plan",
+            "stock_options",
+            "other_perks",
+        ],
+    ),
+    (
+        "Recruitment Process",
+        [
+            "recruitment_contact_email",
+            "recruitment_contact_phone",
+            "recruitment_steps",
+            "recruitment_timeline",
+            "number_of_interviews",
+            "interview_format",
+            "interview_stage_count",
+            "interview_docs_required",
+            "assessment_tests",
+            "interview_notes",
+            "onboarding_process",
+            "onboarding_process_overview",
+            "probation_period",
+            "mentorship_program",
+            "welcome_package",
+            "application_instructions",
+        ],
+    ),
+    ("Summary", []),
+]
+
+
+# ── Utility dataclass ─────────────────────────────────────────────────────────
+@dataclass(slots=True)
+class ExtractResult:
+    value: str | None = None
+    confidence: float = 0.0
+    typed: Any = (
+        None  # parsed value from need_analysis.typed (ISO date, number, list …)
+    )
+
+
+def dump_results(fields: dict[str, ExtractResult]) -> str:
+    """Compact JSON (``{key: [value, confidence(, typed)]}``) for manifests and queues."""
+    return json.dumps(
+        {
+            k: [r.value, r.confidence]
+            if r.typed is None
+            else [r.value, r.confidence, r.typed]
+            for k, r in fields.items()
+        },
+        ensure_ascii=False,
+    )
+
+
+def load_results(raw: str | None) -> dict[str, ExtractResult]:
+    """Inverse of :func:`dump_results`."""
+    return {k: ExtractResult(*row) for k, row in json.loads(raw or "{}").items()}
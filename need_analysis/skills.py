@@ -0,0 +1,129 @@
+"""Skill canonicalization – one canonical id per skill, deduplicated across fields.
+
+The skill fields are extracted independently and repeat the same skill in
+different spellings ("MS Excel", "Excel", "Microsoft Excel"). This stage
+runs after :func:`~need_analysis.typed.typed_stage`, reuses its tokenized
+lists and maps every item to a canonical id through a synonym table built
+once at import time from ``data/skill_synonyms.json``. Each id is kept only
+in the highest-priority field it occurs in (:data:`SKILL_FIELDS` order), so
+the wizard, exports and search index see every skill once.
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import replace
+from pathlib import Path
+from typing import Iterable, Mapping
+
+from need_analysis.schema import ExtractResult
+from need_analysis.typed import parse_list
+
+# priority order: a skill found in several fields stays in the first one
+SKILL_FIELDS = (
+    "must_have_skills",
+    "nice_to_have_skills",
+    "hard_skills",
+    "tech_stack",
+    "it_skills",
+    "tool_proficiency",
+)
+SYNONYMS_PATH = Path(__file__).with_name("data") / "skill_synonyms.json"
+
+_QUALIFIER = re.compile(
+    r"^(?:(?:sehr|very)\s+)?(?:gute?|fundierte|sichere?|erste|solide|advanced|basic|solid|"
+    r"strong|good|excellent|proficient\s+in|proficiency\s+in|knowledge\s+of|"
+    r"experience\s+(?:with|in)|erfahrung(?:en)?\s+(?:mit|in)|kenntnisse\s+(?:in|im|von))\s+",
+    re.I,
+)
+_SUFFIX = re.compile(
+    r"[\s-]*(?:kenntnisse|skills?|knowledge|experience|erfahrung)$", re.I
+)
+_PAREN = re.compile(r"\s*\([^)]*\)")
+_COMPACT = re.compile(r"[\s\-._]+")
+
+
+def skill_key(text: str) -> str:
+    """Spelling-insensitive lookup key: ``"sehr gute MS-Excel-Kenntnisse"`` → ``"msexcel"``."""
+    text = text.strip().lower()
+    for _ in range(2):  # "sehr gute Kenntnisse in SAP"
+        text = _QUALIFIER.sub("", text)
+    text = _SUFFIX.sub("", text)
+    return _COMPACT.sub("", text)
+
+
+def _load_synonyms(path: Path) -> tuple[dict[str, str], dict[str, str]]:
+    """``(key → id, id → label)`` from the synonym file."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    ids: dict[str, str] = {}
+    labels: dict[str, str] = {}
+    for cid, entry in data.items():
+        labels[cid] = entry["label"]
+        for name in (entry["label"], *entry.get("synonyms", ())):
+            ids.setdefault(skill_key(name), cid)
+    return ids, labels
+
+
+SKILL_IDS, SKILL_LABELS = _load_synonyms(SYNONYMS_PATH)
+
+
+def canonical_id(item: str) -> str:
+    """Canonical id of a skill; unknown skills get ``"~" + key`` so spellings still merge.
+
+    A trailing qualifier in parentheses ("Excel (advanced)") is ignored when
+    the full text is not a known synonym.
+    """
+    key = skill_key(item)
+    if (cid := SKILL_IDS.get(key)) is not None:
+        return cid
+    bare = skill_key(_PAREN.sub("", item))
+    return SKILL_IDS.get(bare) or f"~{key or bare}"
+
+
+def canonicalize(lists: Mapping[str, Iterable[str]]) -> dict[str, list[str]]:
+    """Deduplicate skill lists across fields in :data:`SKILL_FIELDS` order.
+
+    Known skills are renamed to their canonical label; unknown ones keep the
+    first spelling seen. Fields outside :data:`SKILL_FIELDS` are ignored.
+    """
+    seen: set[str] = set()
+    out: dict[str, list[str]] = {}
+    for field in SKILL_FIELDS:
+        if field not in lists:
+            continue
+        items = []
+        for item in lists[field]:
+            cid = canonical_id(item)
+            if cid in seen or cid == "~":
+                continue
+            seen.add(cid)
+            items.append(SKILL_LABELS.get(cid, item.strip()))
+        out[field] = items
+    return out
+
+
+def skills_stage(fields: dict[str, ExtractResult]) -> dict[str, ExtractResult]:
+    """Return ``fields`` with the skill fields canonicalized and deduplicated.
+
+    ``typed`` becomes the canonical list and ``value`` its comma-joined form;
+    a field whose items all occur in a higher-priority field keeps its
+    source and confidence but becomes an empty list.
+    """
+    lists: dict[str, list[str]] = {}
+    for key in SKILL_FIELDS:
+        res = fields.get(key)
+        if res is None or not res.value:
+            continue
+        if isinstance(res.typed, list):
+            lists[key] = [str(i) for i in res.typed]
+        elif isinstance(res.value, list):
+            lists[key] = [str(i) for i in res.value]
+        else:
+            lists[key] = parse_list(str(res.value))
+    if not lists:
+        return fields
+
+    out = dict(fields)
+    for key, items in canonicalize(lists).items():
+        out[key] = replace(fields[key], value=", ".join(items), typed=items)
+    return out
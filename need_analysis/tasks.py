@@ -0,0 +1,329 @@
+"""Background extraction tasks with stage-level progress.
+
+The wizard starts an :class:`ExtractionTask` on the shared :mod:`~need_analysis.aio`
+loop and returns immediately; a polling widget reads :attr:`ExtractionTask.label`
+and :attr:`ExtractionTask.fields` while the task runs, so fields found by the
+regex stage are usable before the LLM chunks have finished. As soon as a job
+title is known, the task's :attr:`ExtractionTask.esco` starts the ESCO skill
+and task lookup for it in the background.
+
+A :class:`TaskRegistry` gives every browser session at most one live task:
+starting an extraction for new content cancels the superseded one (down to
+its in-flight OpenAI request), while repeating the same content returns the
+task that is already running. With a :class:`~need_analysis.cache.ByteBudgetLRU`
+the registry also shares finished results across sessions by content hash;
+live sources such as URLs are keyed by the hash of the fetched text, so a
+changed page is never answered from the cache.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Coroutine, TypeVar
+
+from need_analysis import aio
+from need_analysis.cache import ByteBudgetLRU
+from need_analysis.esco.prefetch import EscoPrefetch
+from need_analysis.extraction import llm_stage, refine_stage, regex_stage
+from need_analysis.record import JobRequisition
+from need_analysis.schema import ExtractResult
+from need_analysis.text_normalize import normalize_text
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("queued", "ingest", "regex", "llm", "done", "failed", "cancelled")
+REAP_SECONDS = 30.0
+
+T = TypeVar("T")
+
+
+@dataclass
+class ExtractionTask:
+    """Progress of one extraction, written by the loop thread, read by the UI.
+
+    Attributes are only ever replaced, never mutated in place, so a reader in
+    another thread always sees a consistent ``fields`` mapping: a dict of the
+    partial results while the task runs, a :class:`JobRequisition` once it is
+    done, whether it ran or came from the cache.
+    """
+
+    stage: str = "queued"
+    key: str = ""
+    chunks_done: int = 0
+    chunks_total: int = 0
+    fields: dict[str, ExtractResult] | JobRequisition = field(default_factory=dict)
+    error: str | None = None
+    started: float = field(default_factory=time.monotonic)
+    future: Future | None = field(default=None, repr=False)
+    esco: EscoPrefetch = field(default_factory=EscoPrefetch, repr=False)
+    esco_language: str | None = None  # default: the detected language of the ad
+
+    @property
+    def done(self) -> bool:
+        return self.stage in ("done", "failed", "cancelled")
+
+    def cancel(self) -> bool:
+        """Cancel the task; returns ``False`` if it had already finished."""
+        if self.done or self.future is None or not self.future.cancel():
+            return False
+        self.esco.cancel()
+        self.stage = "cancelled"  # the loop catches up with the CancelledError shortly
+        return True
+
+    @property
+    def label(self) -> str:
+        if self.stage == "llm" and self.chunks_total:
+            return f"LLM chunk {self.chunks_done}/{self.chunks_total}"
+        return {"ingest": "Reading document", "regex": "Pattern scan"}.get(
+            self.stage, self.stage.title()
+        )
+
+    @property
+    def fraction(self) -> float:
+        """Rough overall progress in ``[0, 1]`` for a progress bar."""
+        if self.done:
+            return 1.0
+        if self.stage == "llm":
+            return 0.3 + 0.7 * self.chunks_done / max(self.chunks_total, 1)
+        return {"queued": 0.0, "ingest": 0.1, "regex": 0.2}[self.stage]
+
+    def _on_chunk(self, done: int, total: int, part: dict[str, ExtractResult]) -> None:
+        self.fields = {**self.fields, **part}
+        self.chunks_done, self.chunks_total = done, total
+
+    def _prefetch_esco(self) -> None:
+        """Start the ESCO lookup for the job title found so far; no-op if already started."""
+        title = self.fields.get("job_title")
+        if title is None or not title.value:
+            return
+        detected = self.fields.get("language_of_ad")
+        lang = self.esco_language or (str(detected.value) if detected else "en")
+        self.esco.start(str(title.value), lang)
+
+
+DoneCallback = Callable[[ExtractionTask, str], None]
+Lookup = Callable[[str], JobRequisition | None]
+
+
+async def _run(
+    task: ExtractionTask,
+    load: Callable[[], str],
+    on_done: DoneCallback | None = None,
+    lookup: Lookup | None = None,
+) -> JobRequisition | dict[str, ExtractResult]:
+    try:
+        task.stage = "ingest"
+        norm = await asyncio.to_thread(lambda: normalize_text(load()))
+        logger.info(
+            "Normalized %d → %d chars (-%.0f %%): %s",
+            norm.chars_in,
+            norm.chars_out,
+            norm.reduction * 100,
+            dict(norm.removed),
+        )
+        if lookup and (hit := lookup(norm.text)):
+            task.fields = hit
+            task._prefetch_esco()
+            task.stage = "done"
+            return task.fields
+        task.stage = "regex"
+        task.fields = await asyncio.to_thread(regex_stage, norm.text)
+        task._prefetch_esco()  # overlaps the ESCO round trip with the LLM stage
+        task.stage = "llm"
+        # CPU work (typed parsing, ESCO loads) must not stall other sessions on the shared loop
+        fields = await asyncio.to_thread(
+            refine_stage, await llm_stage(task.fields, norm.text, task._on_chunk)
+        )
+        task.fields = JobRequisition.from_results(fields)
+        task._prefetch_esco()  # the LLM may have found or rewritten the title
+        if on_done:
+            on_done(task, norm.text)
+        task.stage = "done"
+    except asyncio.CancelledError:
+        task.stage = "cancelled"
+        raise
+    except Exception as exc:
+        logger.exception("Extraction failed")
+        task.error, task.stage = f"{type(exc).__name__}: {exc}", "failed"
+    return task.fields
+
+
+def start_extraction(
+    load: Callable[[], str],
+    key: str = "",
+    on_done: DoneCallback | None = None,
+    esco_language: str | None = None,
+    lookup: Lookup | None = None,
+) -> ExtractionTask:
+    """Run ingest → normalize → regex → LLM in the background.
+
+    Args:
+        load: Blocking callable returning the raw ad text (PDF/DOCX/URL reader);
+            it runs in a worker thread.
+        key: Identity of the input, see :func:`content_key`.
+        on_done: Called as ``on_done(task, text)`` with the normalized text once
+            extraction succeeded, before the task reports ``done``.
+        esco_language: Language of the prefetched ESCO labels (default: the
+            detected language of the ad).
+        lookup: Called with the normalized text; a returned record completes
+            the task without the regex and LLM stages.
+
+    Returns:
+        The task; poll it, or wait on ``task.future``.
+    """
+    task = ExtractionTask(key=key, esco_language=esco_language)
+    task.future = aio.submit(_run(task, load, on_done, lookup))
+    return task
+
+
+def content_key(payload: bytes | str) -> str:
+    """Identity of an extraction input (upload bytes or URL) for de-duplication."""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+# ── Per-session registry ------------------------------------------------------
+class TaskRegistry:
+    """At most one live extraction, and one run of each named job, per session.
+
+    Args:
+        is_alive: Optional ``session_id -> bool``; when given, tasks of sessions
+            that went away are cancelled every ``reap_every`` seconds.
+        reap_every: Reaper interval in seconds.
+        cache: Shared result cache; a hit completes the task without any work.
+    """
+
+    def __init__(
+        self,
+        is_alive: Callable[[str], bool] | None = None,
+        reap_every: float = REAP_SECONDS,
+        cache: ByteBudgetLRU | None = None,
+    ) -> None:
+        self._tasks: dict[str, ExtractionTask] = {}
+        self._runs: dict[tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self.is_alive = is_alive
+        self.reap_every = reap_every
+        self._reaper: Future | None = None
+        self.cache = cache
+
+    def get(self, session_id: str) -> ExtractionTask | None:
+        return self._tasks.get(session_id)
+
+    def start(
+        self,
+        session_id: str,
+        key: str,
+        load: Callable[[], str],
+        esco_language: str | None = None,
+        live: bool = False,
+    ) -> ExtractionTask:
+        """Return the session's running task for ``key``, or supersede it with a new one.
+
+        ``live`` marks a source that can change under the same ``key`` (a URL):
+        it is always loaded again, and the cache is keyed by the hash of the
+        normalized text instead, looked up after loading.
+        """
+        with self._lock:
+            current = self._tasks.get(session_id)
+            if (
+                current
+                and current.key == key
+                and current.stage not in ("failed", "cancelled")
+                and not (live and current.done)
+            ):
+                return current
+            if current and current.cancel():
+                logger.info("Cancelled superseded extraction of session %s", session_id)
+            if live and self.cache is not None:
+                task = self._tasks[session_id] = start_extraction(
+                    load, key, self._store_by_text, esco_language, self._lookup_text
+                )
+                self._start_reaper()
+                return task
+            if self.cache is not None and (hit := self.cache.get(key)):
+                task = ExtractionTask(
+                    "done", key, fields=hit.fields, esco_language=esco_language
+                )
+                task._prefetch_esco()
+                self._tasks[session_id] = task
+                return task
+            task = self._tasks[session_id] = start_extraction(
+                load, key, self._store, esco_language
+            )
+            self._start_reaper()
+            return task
+
+    def submit(
+        self, session_id: str, name: str, coro: Coroutine[Any, Any, T]
+    ) -> Future[T]:
+        """Run ``coro`` on the shared loop as the session's ``name`` job (e.g. ``"bulk"``).
+
+        A still running job of the same name is cancelled first, and so are the
+        jobs of sessions that went away.
+        """
+        with self._lock:
+            old = self._runs.pop((session_id, name), None)
+            if old and old.cancel():
+                logger.info(
+                    "Cancelled superseded %s run of session %s", name, session_id
+                )
+            future = self._runs[session_id, name] = aio.submit(coro)
+            self._start_reaper()
+            return future
+
+    def _start_reaper(self) -> None:
+        if self.is_alive and self._reaper is None:
+            self._reaper = aio.submit(self._reap_forever())
+
+    def _store(self, task: ExtractionTask, text: str) -> None:
+        if self.cache is not None:
+            # sessions keep a reference to the cached record, not a copy of their own
+            task.fields = self.cache.put(task.key, task.fields, text).fields
+
+    def _store_by_text(self, task: ExtractionTask, text: str) -> None:
+        task.fields = self.cache.put(content_key(text), task.fields, text).fields
+
+    def _lookup_text(self, text: str) -> JobRequisition | None:
+        hit = self.cache.get(content_key(text))
+        return hit.fields if hit else None
+
+    def cancel(self, session_id: str) -> bool:
+        """Cancel and forget the session's task and jobs; returns whether any was running."""
+        with self._lock:
+            task = self._tasks.pop(session_id, None)
+            runs = self._pop_runs(lambda sid: sid == session_id)
+        cancelled = [run.cancel() for run in runs]
+        if task:
+            cancelled.append(task.cancel())
+        return any(cancelled)
+
+    def reap(self, is_alive: Callable[[str], bool]) -> int:
+        """Cancel tasks and jobs of dead sessions; returns how many were cancelled."""
+        with self._lock:
+            dead = [sid for sid in self._tasks if not is_alive(sid)]
+            tasks = [self._tasks.pop(sid) for sid in dead]
+            runs = self._pop_runs(lambda sid: not is_alive(sid))
+        return sum(task.cancel() for task in tasks) + sum(run.cancel() for run in runs)
+
+    def _pop_runs(self, match: Callable[[str], bool]) -> list[Future]:
+        """Remove finished jobs and the jobs of matching sessions; return the latter."""
+        out = []
+        for (sid, name), run in list(self._runs.items()):
+            if run.done() or match(sid):
+                del self._runs[sid, name]
+                if not run.done():
+                    out.append(run)
+        return out
+
+    async def _reap_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.reap_every)
+            if cancelled := self.reap(self.is_alive):
+                logger.info("Cancelled %d task(s) of closed sessions", cancelled)
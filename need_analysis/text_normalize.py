@@ -0,0 +1,192 @@
+"""Text normalization stage between ingestion and extraction.
+
+Shrinks PDF / DOCX text before it reaches the regex stage and the LLM window:
+page headers/footers, hyphenated line breaks, whitespace runs and legal
+boilerplate (EEO statements, GDPR notices) are removed. Every step is a pure
+function of its input, so the same document always normalizes to the same
+string and downstream cache keys stay stable.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+PAGE_BREAK = "\f"
+EDGE_LINES = 3  # lines inspected at the top / bottom of each page
+REPEAT_RATIO = 0.6  # share of pages a line must appear on to count as header/footer
+MIN_PAGES = 3
+MAX_BOILERPLATE_CHARS = 1200  # never strip sentences from a paragraph longer than this
+
+# "Vertriebs-\nund Marketingleiter" keeps its hyphen
+_CONJUNCTION = r"(?:und|oder|bzw|sowie)\b"
+_HYPHEN_BREAK = re.compile(rf"(\w)-[ \t]*\n[ \t]*(?!{_CONJUNCTION})([a-zäöüß])")
+_SUSPENDED_HYPHEN = re.compile(rf"(\w)-[ \t]*\n[ \t]*({_CONJUNCTION})")
+_DIGITS = re.compile(r"\d+")
+_SPACES = re.compile(r"[ \t\u00a0\u2000-\u200b\u202f\u3000]+")
+_TRAILING = re.compile(r" +\n|\n +")
+_BLANK_RUNS = re.compile(r"\n{3,}")
+_PARAGRAPHS = re.compile(r"\n\s*\n")
+_SENTENCE_BREAK = re.compile(r"((?<=[.!?])[ \t]+|\n)")
+
+# GDPR notices are recognised by wording about the applicant's own data: an ad
+# for a data-protection role names the regulation in its duties and requirements
+_APPLICANT = (
+    r"(?:\bBewerb\w*|\bappli(?:cation|cant)s?\b|\byour (?:personal )?(?:application )?data\b"
+    r"|\b(?:Ihr|Dein)\w*\s+(?:personenbezogenen\s+)?(?:Bewerbungs|Bewerber)?daten\b)"
+)
+_YOUR_DATA = (
+    r"(?:\byour (?:personal )?(?:application )?data\b"
+    r"|\b(?:Ihr|Dein)\w*\s+(?:personenbezogenen\s+)?(?:Bewerbungs|Bewerber)?daten\b)"
+)
+_REGULATION = (
+    r"\b(?:gemäß|nach|entsprechend|in accordance with|according to|pursuant to|under)"
+    r"\s+(?:(?:der|den|des|the|Art\.?\s*\d+)\s+)*(?:DSGVO|DS-GVO|GDPR|BDSG)\b"
+)
+_NOTICE = (
+    r"\b(?:privacy (?:policy|notice)|data protection (?:notice|information)"
+    r"|Datenschutz(?:erklärung|hinweisen?|informationen?))\b"
+)
+
+BOILERPLATE_PATTERNS = [
+    re.compile(p, re.I | re.S)
+    for p in (
+        # EEO / AGG
+        r"\bequal (?:employment )?opportunit(?:y|ies) employer\b",
+        r"\b(?:without regard to|regardless of)\b.{0,80}\b(?:race|colou?r|religion|gender|sex|age|national origin|disability)\b",
+        r"\b(?:unabhängig von|ungeachtet)\b.{0,80}\b(?:Geschlecht|Nationalität|ethnischer|Herkunft|Religion|Behinderung|Alter|sexueller)\b",
+        r"\bschwerbehinderte\b.{0,80}\bbei gleicher Eignung\b",
+        # GDPR / DSGVO
+        rf"^(?=.*{_APPLICANT}).*{_REGULATION}",
+        rf"^(?=.*{_APPLICANT}).*{_NOTICE}",
+        rf"\b(?:see|read|find|siehe|finden Sie|lesen Sie)\b.{{0,60}}{_NOTICE}",
+        rf"\b(?:process|stor|retain|delet|verarbeit|speicher|lösch)\w*\b.{{0,60}}{_YOUR_DATA}",
+        rf"{_YOUR_DATA}.{{0,120}}\b(?:process|stor|retain|delet|verarbeit|speicher|gelöscht)",
+        r"^(?=.*\b(?:appli(?:cation|cant)s?|Bewerb\w*)).*"
+        r"\b(?:personal data|personenbezogenen? Daten)\b.{0,200}"
+        r"\b(?:process|stor|retain|delet|verarbeit|speicher|gelöscht)",
+    )
+]
+
+
+@dataclass
+class NormalizedText:
+    text: str
+    chars_in: int
+    removed: Counter = field(default_factory=Counter)  # step → characters removed
+
+    @property
+    def chars_out(self) -> int:
+        return len(self.text)
+
+    @property
+    def reduction(self) -> float:
+        """Share of characters removed (0–1)."""
+        return 1 - self.chars_out / self.chars_in if self.chars_in else 0.0
+
+
+# ── Steps ---------------------------------------------------------------------
+def strip_headers_footers(pages: list[str]) -> list[str]:
+    """Drop lines that repeat at the top or bottom of most pages.
+
+    Digits are masked before comparing so "Seite 3 von 7" matches on every page.
+    """
+    if len(pages) < MIN_PAGES:
+        return pages
+
+    def edges(lines: list[str]) -> list[str]:
+        content = [ln for ln in lines if ln.strip()]
+        return content[:EDGE_LINES] + content[-EDGE_LINES:]
+
+    def key(line: str) -> str:
+        return _DIGITS.sub("#", " ".join(line.split()).lower())
+
+    split = [page.splitlines() for page in pages]
+    counts = Counter(k for lines in split for k in {key(ln) for ln in edges(lines)})
+    threshold = max(2, int(len(pages) * REPEAT_RATIO + 0.5))
+    repeated = {k for k, n in counts.items() if n >= threshold}
+
+    out = []
+    for lines in split:
+        edge = set(edges(lines))
+        out.append(
+            "\n".join(ln for ln in lines if not (ln in edge and key(ln) in repeated))
+        )
+    return out
+
+
+def dehyphenate(text: str) -> str:
+    """Join words split across lines ("Entwick-\\nlung" → "Entwicklung").
+
+    Suspended hyphens before a conjunction stay: "Vertriebs-\\nund Marketing"
+    → "Vertriebs- und Marketing".
+    """
+    text = _SUSPENDED_HYPHEN.sub(r"\1- \2", text)
+    return _HYPHEN_BREAK.sub(r"\1\2", text)
+
+
+def collapse_whitespace(text: str) -> str:
+    """Collapse space runs, trim line ends and limit blank lines to one."""
+    text = _SPACES.sub(" ", text.replace("\r\n", "\n").replace("\r", "\n"))
+    text = _TRAILING.sub("\n", text)
+    return _BLANK_RUNS.sub("\n\n", text).strip()
+
+
+def _strip_sentences(para: str) -> str:
+    """Remove the lines and sentences of ``para`` that match a boilerplate pattern."""
+    parts = _SENTENCE_BREAK.split(para)
+    units, seps = parts[::2], parts[1::2]
+    drop = [any(p.search(unit) for p in BOILERPLATE_PATTERNS) for unit in units]
+    if not any(drop):
+        return para
+    out, sep = "", ""
+    for i, (unit, d) in enumerate(zip(units, drop)):
+        if i:  # a line break between dropped units survives a space
+            sep = "\n" if "\n" in sep + seps[i - 1] else seps[i - 1]
+        if not d:
+            out += (sep if out else "") + unit
+            sep = ""
+    return out
+
+
+def remove_boilerplate(text: str) -> str:
+    """Drop sentences matching a known EEO / GDPR boilerplate pattern.
+
+    Only the matching lines and sentences go, so an ad without paragraph
+    breaks keeps its content next to a GDPR footer. Paragraphs longer than
+    :data:`MAX_BOILERPLATE_CHARS` are kept as they are.
+    """
+    paragraphs = (
+        para if len(para) > MAX_BOILERPLATE_CHARS else _strip_sentences(para)
+        for para in _PARAGRAPHS.split(text)
+    )
+    return "\n\n".join(para for para in paragraphs if para)
+
+
+# ── Pipeline ------------------------------------------------------------------
+def normalize_text(text: str | list[str]) -> NormalizedText:
+    """Run all normalization steps and record how much each one removed.
+
+    Args:
+        text: Document text with pages separated by form feeds, or a list of
+            page texts.
+    """
+    pages = text.split(PAGE_BREAK) if isinstance(text, str) else list(text)
+    chars_in = sum(len(p) for p in pages) + len(pages) - 1
+    result = NormalizedText("", chars_in)
+
+    pages = strip_headers_footers(pages)
+    out = "\n".join(pages)
+    result.removed["headers_footers"] = chars_in - len(out)
+
+    for name, step in (
+        ("dehyphenation", dehyphenate),
+        ("whitespace", collapse_whitespace),
+        ("boilerplate", remove_boilerplate),
+    ):
+        before = len(out)
+        out = step(out)
+        result.removed[name] += before - len(out)
+
+    result.text = out
+    return result
@@ -0,0 +1,360 @@
+"""Typed normalization stage – raw field strings → typed values, once.
+
+Runs after the LLM stage and stores the result in ``ExtractResult.typed``
+next to the raw string, so the wizard, exports and analytics read parsed
+values instead of re-parsing on every rerun. All parsers are precompiled
+and understand German and English notations; a value they cannot read is
+left untyped (``typed is None``) rather than guessed.
+
+Typed values are JSON-native:
+
+* dates – ISO ``"YYYY-MM-DD"``
+* salary – ``{"min": float, "max": float, "currency": "EUR", "period": "year"}``
+* counts / months – ``int``; ratings – ``float``
+* flags – ``bool``
+* skill and task lists – ``list[str]``
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import replace
+from datetime import date
+from typing import Any, Callable
+
+from need_analysis.schema import DATE_KEYS, MONTH_KEYS, ExtractResult
+
+# ── Field → type ──────────────────────────────────────────────────────────────
+DATE_FIELDS = set(DATE_KEYS)  # the wizard renders these as date / number inputs
+SALARY_FIELDS = {"salary_range"}
+AMOUNT_FIELDS = {"salary_range_min", "salary_range_max"}
+INT_FIELDS = {
+    "vacation_days",
+    "team_size",
+    "direct_reports_count",
+    "years_experience_min",
+    "number_of_interviews",
+    "interview_stage_count",
+}
+MONTH_FIELDS = set(MONTH_KEYS)
+FLOAT_FIELDS = {"glassdoor_rating"}
+BOOL_FIELDS = {
+    "travel_required",
+    "on_call",
+    "visa_sponsorship",
+    "relocation_support",
+    "flexible_hours",
+    "company_car",
+    "sabbatical_option",
+    "stock_options",
+    "childcare_support",
+    "line_manager_recv_cv",
+    "hr_poc_recv_cv",
+    "finance_poc_recv_offer",
+}
+LIST_FIELDS = {
+    "must_have_skills",
+    "nice_to_have_skills",
+    "hard_skills",
+    "soft_skills",
+    "it_skills",
+    "tool_proficiency",
+    "tech_stack",
+    "certifications_required",
+    "language_requirements",
+    "languages_optional",
+    "task_list",
+    "key_responsibilities",
+    "other_perks",
+}
+
+# ── Precompiled vocabulary ────────────────────────────────────────────────────
+MONTHS = {
+    "jan": 1,
+    "januar": 1,
+    "january": 1,
+    "jänner": 1,
+    "feb": 2,
+    "februar": 2,
+    "february": 2,
+    "mär": 3,
+    "mrz": 3,
+    "märz": 3,
+    "maerz": 3,
+    "mar": 3,
+    "march": 3,
+    "apr": 4,
+    "april": 4,
+    "mai": 5,
+    "may": 5,
+    "jun": 6,
+    "juni": 6,
+    "june": 6,
+    "jul": 7,
+    "juli": 7,
+    "july": 7,
+    "aug": 8,
+    "august": 8,
+    "sep": 9,
+    "sept": 9,
+    "september": 9,
+    "okt": 10,
+    "oct": 10,
+    "oktober": 10,
+    "october": 10,
+    "nov": 11,
+    "november": 11,
+    "dez": 12,
+    "dec": 12,
+    "dezember": 12,
+    "december": 12,
+}
+_MONTH = "|".join(sorted(map(re.escape, MONTHS), key=len, reverse=True))
+
+_ISO = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_DOTTED = re.compile(r"\b(\d{1,2})\.\s?(\d{1,2})\.\s?(\d{2,4})\b")  # 01.03.2025 (DE)
+# 03/01/2025 (EN) or 01/03/2025
+_SLASHED = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{2,4})\b")
+_DAY_MONTH = re.compile(rf"\b(\d{{1,2}})\.?\s+({_MONTH})\.?,?\s+(\d{{4}})\b", re.I)
+_MONTH_DAY = re.compile(
+    rf"\b({_MONTH})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+(\d{{4}})\b", re.I
+)
+_MONTH_YEAR = re.compile(rf"\b({_MONTH})\.?\s+(\d{{4}})\b", re.I)
+
+_NUMBER = re.compile(
+    r"(?<![\w.,])(\d{1,3}(?:[.,\u00a0\u202f ']\d{3})+(?:[.,]\d{1,2})?|\d+(?:[.,]\d+)?)"
+    r"\s*(k|tsd\.?|teur|t€|mio\.?)?(?![\d])",
+    re.I,
+)
+_INT = re.compile(r"\d+")
+_CURRENCIES = (
+    (re.compile(r"€|(?<![a-z])t?eur(?:os?)?(?![a-z])", re.I), "EUR"),
+    (re.compile(r"\$|(?<![a-z])(?:usd|dollars?)(?![a-z])", re.I), "USD"),
+    (re.compile(r"£|(?<![a-z])(?:gbp|pounds?)(?![a-z])", re.I), "GBP"),
+    (re.compile(r"(?<![a-z])(?:chf|franken)(?![a-z])", re.I), "CHF"),
+)
+_PERIODS = (
+    (re.compile(r"stunde|stündl|\bhour|hourly|/\s?h\b|\bp\.?h\.?\b", re.I), "hour"),
+    (re.compile(r"monat|\bmtl\b|\bmonth|\bp\.?m\.?\b|/\s?mo", re.I), "month"),
+    (re.compile(r"jahr|jährl|\byear|annual|\bp\.?a\.?\b|/\s?y", re.I), "year"),
+)
+PERIOD_WINDOW = 24  # chars around a currency amount searched for its pay period
+CURRENCY_GAP = 6  # chars between an amount and its currency sign or code
+_WEEKS = re.compile(r"woche|week", re.I)
+_TRUE = re.compile(
+    r"^\s*(?:ja|yes|y|true|wahr|x|✓|vorhanden|möglich|possible|available|provided|inklusive|included)(?!\w)",
+    re.I,
+)
+_FALSE = re.compile(
+    r"^\s*(?:nein|no|n|false|falsch|keine?|none|nicht|not|n/a|-)(?!\w)", re.I
+)
+_LIST_SPLIT = re.compile(r"\s*(?:[\n;|•·▪●]|,(?![^()]*\)))\s*")
+_BULLET = re.compile(r"^(?:[-*–]|\d{1,2}[.)])\s+")
+_SEPARATORS = re.compile(r"[\u00a0\u202f ']")
+_GROUPED = re.compile(r"\d{1,3}(?:[.,]\d{3})+")
+
+
+# ── Parsers ───────────────────────────────────────────────────────────────────
+def _year(y: str) -> int:
+    return int(y) + 2000 if len(y) == 2 else int(y)
+
+
+def _iso(y: int, m: int, d: int) -> str | None:
+    try:
+        return date(y, m, d).isoformat()
+    except ValueError:
+        return None
+
+
+def parse_date(text: str, lang: str = "en") -> str | None:
+    """ISO date from ``2025-03-01``, ``01.03.2025``, ``1. März 2025``, ``March 1, 2025`` …
+
+    Slashed dates are read month-first for English ads unless the first number
+    cannot be a month; a bare month and year means the first of that month.
+    """
+    if m := _ISO.search(text):
+        return _iso(int(m[1]), int(m[2]), int(m[3]))
+    if m := _DOTTED.search(text):
+        return _iso(_year(m[3]), int(m[2]), int(m[1]))
+    if m := _SLASHED.search(text):
+        a, b = int(m[1]), int(m[2])
+        month_first = lang == "en" and a <= 12
+        return _iso(_year(m[3]), a if month_first else b, b if month_first else a)
+    if m := _DAY_MONTH.search(text):
+        return _iso(int(m[3]), MONTHS[m[2].lower()], int(m[1]))
+    if m := _MONTH_DAY.search(text):
+        return _iso(int(m[3]), MONTHS[m[1].lower()], int(m[2]))
+    if m := _MONTH_YEAR.search(text):
+        return _iso(int(m[2]), MONTHS[m[1].lower()], 1)
+    return None
+
+
+def parse_amount(raw: str, unit: str | None = None) -> float:
+    """``60.000`` / ``60,000`` / ``4.500,50`` / ``60k`` / ``55 TEUR`` → float."""
+    digits = re.sub(r"[  ']", "", raw)
+    if re.fullmatch(r"\d{1,3}(?:[.,]\d{3})+", digits):
+        digits = re.sub(r"[.,]", "", digits)  # only thousands separators
+    elif "," in digits and "." in digits:
+        dec = "," if digits.rfind(",") > digits.rfind(".") else "."
+        digits = digits.replace("." if dec == "," else ",", "").replace(dec, ".")
+    else:
+        digits = digits.replace(",", ".")
+    value = float(digits)
+    if unit:
+        u = unit.lower().rstrip(".")
+        value *= 1_000_000 if u.startswith("mio") else 1000
+    return value
+
+
+def _amounts(text: str) -> list[float]:
+    return [parse_amount(m[1], m[2]) for m in _NUMBER.finditer(text)]
+
+
+def parse_currency(text: str) -> str | None:
+    return next((code for rx, code in _CURRENCIES if rx.search(text)), None)
+
+
+def parse_period(text: str) -> str | None:
+    return next((p for rx, p in _PERIODS if rx.search(text)), None)
+
+
+def _amount_period(text: str, matches: list[re.Match]) -> str | None:
+    """Pay period written next to a currency amount (``"25 €/h"``, ``"Jahresgehalt 60k"``).
+
+    Numbers without a currency or magnitude unit are no anchor, so working
+    hours like ``"40 Stunden/Woche"`` do not make a salary hourly.
+    """
+    best: tuple[int, str] | None = None
+    for m in matches:
+        lo, hi = max(0, m.start() - CURRENCY_GAP), m.end() + CURRENCY_GAP
+        if not (
+            m[2] or parse_currency(text[lo : m.start()] + " " + text[m.end() : hi])
+        ):
+            continue
+        lo, hi = max(0, m.start() - PERIOD_WINDOW), m.end() + PERIOD_WINDOW
+        for rx, period in _PERIODS:
+            for p in rx.finditer(text, lo, hi):
+                gap = (
+                    p.start() - m.end() if p.start() >= m.end() else m.start() - p.end()
+                )
+                if best is None or gap < best[0]:
+                    best = (gap, period)
+    return best[1] if best else None
+
+
+def parse_salary(
+    text: str, currency: str | None = None, period: str | None = None
+) -> dict[str, Any] | None:
+    """Salary range with currency and pay period.
+
+    Args:
+        text: Raw salary string, e.g. ``"60.000 – 75.000 € brutto p.a."``.
+        currency: Fallback when the string names none (``salary_currency``).
+        period: Fallback pay period (``pay_frequency``).
+    """
+    matches = list(_NUMBER.finditer(text))
+    if not matches:
+        return None
+    # "55-65k": a unit written once applies to the bare numbers of the range
+    unit = next((m[2] for m in reversed(matches) if m[2]), None)
+    amounts = [
+        parse_amount(
+            m[1], m[2] or (unit if unit and parse_amount(m[1]) < 1000 else None)
+        )
+        for m in matches
+    ]
+    return {
+        "min": min(amounts),
+        "max": max(amounts),
+        "currency": parse_currency(text)
+        or (parse_currency(currency) if currency else None),
+        "period": _amount_period(text, matches)
+        or (parse_period(period) if period else None),
+    }
+
+
+def parse_int(text: str) -> int | None:
+    """First integer in the string (``"30 Tage"`` → 30, ``"5+ years"`` → 5)."""
+    return int(m[0]) if (m := _INT.search(text)) else None
+
+
+def parse_months(text: str) -> int | None:
+    """Duration in months; weeks are rounded down (``"6 Monate"`` → 6)."""
+    n = parse_int(text)
+    if n is None:
+        return None
+    return n // 4 if _WEEKS.search(text) else n
+
+
+def parse_float(text: str) -> float | None:
+    return amounts[0] if (amounts := _amounts(text)) else None
+
+
+def parse_bool(text: str) -> bool | None:
+    if _FALSE.search(text):
+        return False
+    if _TRUE.search(text):
+        return True
+    return None
+
+
+def parse_list(text: str) -> list[str]:
+    """Split bullet, line, semicolon or comma separated items; commas inside () are kept."""
+    items = (_BULLET.sub("", part).strip(" .") for part in _LIST_SPLIT.split(text))
+    return list(dict.fromkeys(i for i in items if i))
+
+
+PARSERS: dict[str, Callable[[str], Any]] = {
+    **{k: parse_float for k in FLOAT_FIELDS},
+    **{k: parse_int for k in INT_FIELDS},
+    **{k: parse_months for k in MONTH_FIELDS},
+    **{k: parse_bool for k in BOOL_FIELDS},
+    **{k: parse_list for k in LIST_FIELDS},
+}
+
+
+# ── Stage ─────────────────────────────────────────────────────────────────────
+def parse_field(key: str, value: str, lang: str = "en", **context: str | None) -> Any:
+    """Typed value of one field, or ``None`` if the key is untyped or unreadable.
+
+    ``context`` supplies ``currency`` / ``period`` fallbacks for salary fields.
+    """
+    if key in DATE_FIELDS:
+        return parse_date(value, lang)
+    if key in SALARY_FIELDS:
+        return parse_salary(value, context.get("currency"), context.get("period"))
+    if key in AMOUNT_FIELDS:
+        return amounts[0] if (amounts := _amounts(value)) else None
+    parser = PARSERS.get(key)
+    return parser(value) if parser else None
+
+
+def typed_stage(fields: dict[str, ExtractResult]) -> dict[str, ExtractResult]:
+    """Return ``fields`` with ``typed`` set wherever a parser understood the value.
+
+    Fields that already carry a typed value are not parsed again.
+    """
+    lang = fields["language_of_ad"].value if "language_of_ad" in fields else "en"
+    context = {
+        "currency": str(fields["salary_currency"].value or "")
+        if "salary_currency" in fields
+        else None,
+        "period": str(fields["pay_frequency"].value or "")
+        if "pay_frequency" in fields
+        else None,
+    }
+    out = dict(fields)
+    for key, res in fields.items():
+        if res.typed is not None or not res.value:
+            continue
+        value = res.value
+        # the LLM sometimes answers lists or numbers directly
+        if isinstance(value, list):
+            value = "\n".join(map(str, value))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+        elif not isinstance(value, str):
+            continue
+        typed = parse_field(key, value, lang, **context)
+        if typed is not None and typed != []:
+            out[key] = replace(res, typed=typed)
+    return out
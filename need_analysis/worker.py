@@ -0,0 +1,158 @@
+"""Extraction worker tier – consumes :class:`~need_analysis.jobs.JobQueue`.
+
+Run one or more per node, independently of the Streamlit replicas::
+
+    python -m need_analysis worker --queue jobs.sqlite --processes 4
+
+Each process keeps one event loop (and thus one pooled OpenAI client) and
+runs up to ``concurrency`` jobs at a time, since most of a job is spent
+waiting on the LLM. A running job renews its lease every third of the lease
+time and is stopped as soon as it is cancelled in the queue.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing as mp
+import os
+import socket
+from io import BytesIO
+from pathlib import Path
+
+from need_analysis.extraction import extract
+from need_analysis.jobs import Job, JobQueue
+from need_analysis.schema import ExtractResult
+from need_analysis.text_normalize import normalize_text
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = 0.5
+
+
+class JobCancelled(Exception):
+    """The job was cancelled in the queue while this worker ran it."""
+
+
+def job_text(job: Job) -> str:
+    """Turn a job payload into plain text (the ingestion stage)."""
+    from need_analysis import ingest
+
+    if job.kind == "pdf":
+        return ingest.pdf_text(BytesIO(job.payload))
+    if job.kind == "docx":
+        return ingest.docx_text(BytesIO(job.payload))
+    if job.kind == "url":
+        return ingest.http_text(job.payload.decode("utf-8"))
+    return job.payload.decode("utf-8", errors="ignore")
+
+
+async def _extract_job(job: Job) -> dict[str, ExtractResult]:
+    # ingestion and normalization are CPU-bound; keep them off the loop's thread
+    text = await asyncio.to_thread(lambda: normalize_text(job_text(job)).text)
+    return await extract(text)
+
+
+async def run_job(job: Job, queue: JobQueue | None = None) -> dict[str, ExtractResult]:
+    """Extract one job; with ``queue``, its lease is renewed while it runs.
+
+    Raises:
+        JobCancelled: When a heartbeat finds the job cancelled; the extraction
+            is cancelled as well.
+    """
+    task = asyncio.ensure_future(_extract_job(job))
+    if queue is None:
+        return await task
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=queue.lease_seconds / 3)
+            if done:
+                return task.result()
+            if queue.heartbeat(job.id):
+                raise JobCancelled(job.id)
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.wait({task})
+
+
+async def work(
+    queue: JobQueue,
+    *,
+    concurrency: int = 4,
+    max_jobs: int | None = None,
+    idle_exit: bool = False,
+) -> int:
+    """Claim and run jobs until stopped; returns the number of jobs handled.
+
+    Args:
+        queue: Queue to consume.
+        concurrency: Jobs in flight in this process.
+        max_jobs: Stop after this many jobs (``None`` = run forever).
+        idle_exit: Return as soon as the queue is empty (tests, batch drains).
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    slots = asyncio.Semaphore(concurrency)
+    running: set[asyncio.Task] = set()
+    handled = 0
+
+    async def one(job: Job) -> None:
+        try:
+            queue.complete(job.id, await run_job(job, queue))
+        except JobCancelled:
+            logger.info("Job %s was cancelled", job.id)
+        except Exception as exc:  # noqa: BLE001 – the queue decides about retries
+            logger.warning("Job %s failed (attempt %d): %s", job.id, job.attempts, exc)
+            queue.fail(job.id, f"{type(exc).__name__}: {exc}")
+        finally:
+            slots.release()
+
+    while max_jobs is None or handled < max_jobs:
+        await slots.acquire()
+        job = queue.claim(worker_id)
+        if job is None:
+            slots.release()
+            if idle_exit and not running:
+                break
+            await asyncio.sleep(POLL_SECONDS)
+            continue
+        handled += 1
+        task = asyncio.create_task(one(job))
+        running.add(task)
+        task.add_done_callback(running.discard)
+    await asyncio.gather(*running)
+    return handled
+
+
+def _process_main(queue_path: str, concurrency: int) -> None:
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(processName)s %(message)s"
+    )
+    queue = JobQueue(queue_path)
+    try:
+        asyncio.run(work(queue, concurrency=concurrency))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        queue.close()
+
+
+def run_workers(queue_path: Path, processes: int, concurrency: int = 4) -> None:
+    """Start ``processes`` worker processes and wait for them."""
+    # create the schema once, before the workers race for it
+    JobQueue(queue_path).close()
+    procs = [
+        mp.Process(
+            target=_process_main,
+            args=(str(queue_path), concurrency),
+            name=f"worker-{i}",
+        )
+        for i in range(processes)
+    ]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
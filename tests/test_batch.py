@@ -0,0 +1,31 @@
+import json
+
+from need_analysis.cli import main
+
+
+def test_extract_cli_streams_jsonl(tmp_path, capsys):
+    ads = tmp_path / "ads"
+    (ads / "sub").mkdir(parents=True)
+    (ads / "a.txt").write_text(
+        "Job Title: Data Engineer\nCompany: ACME\n", encoding="utf-8"
+    )
+    (ads / "sub" / "b.txt").write_text(
+        "Wir suchen ab sofort einen Entwickler für unser Team.\n"
+        "Stellenbezeichnung: Entwickler\nUnternehmen: Beta GmbH\n",
+        encoding="utf-8",
+    )
+    (ads / "notes.md").write_text("ignored", encoding="utf-8")
+    out = tmp_path / "results.jsonl"
+
+    code = main(["extract", str(ads), "--out", str(out), "--workers", "1", "--no-llm"])
+
+    rows = {
+        json.loads(line)["path"].rsplit("/", 1)[-1]: json.loads(line)
+        for line in out.read_text().splitlines()
+    }
+    assert code == 0
+    assert set(rows) == {"a.txt", "b.txt"}
+    assert rows["a.txt"]["fields"]["job_title"]["value"] == "Data Engineer"
+    assert rows["b.txt"]["fields"]["company_name"]["value"] == "Beta GmbH"
+    assert rows["b.txt"]["fields"]["language_of_ad"]["value"] == "de"
+    assert "docs/s" in capsys.readouterr().err
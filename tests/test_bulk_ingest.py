@@ -0,0 +1,124 @@
+import asyncio
+
+from need_analysis import bulk_ingest
+from need_analysis.bulk_ingest import ingest_urls
+from need_analysis.http_fetch import FetchError, FetchResult
+
+
+def test_ingest_urls_retries_and_reports_failures(monkeypatch):
+    attempts: dict[str, int] = {}
+
+    async def fake_fetch(url, *, parse=None, **_):
+        attempts[url] = attempts.get(url, 0) + 1
+        if url.endswith("/robots.txt"):
+            return FetchResult(url, 200, "User-agent: *\nDisallow: /private/", "utf-8")
+        if url.endswith("/flaky") and attempts[url] == 1:
+            raise FetchError("http_503", 503)
+        if url.endswith("/gone"):
+            raise FetchError("http_404", 404)
+        return FetchResult(url, 200, parse(f"<b>{url}</b>"), "utf-8")
+
+    async def fake_extract(text):
+        return {"job_title": text}
+
+    monkeypatch.setattr(bulk_ingest, "fetch_text", fake_fetch)
+    urls = [
+        "https://jobs.example.com/a",
+        "https://jobs.example.com/flaky",
+        "https://jobs.example.com/gone",
+        "https://jobs.example.com/private/x",
+        "https://jobs.example.com/a",  # duplicate
+    ]
+    results, report = asyncio.run(
+        ingest_urls(
+            urls, parse=lambda h: h.strip("<b>/"), extract=fake_extract, backoff=0
+        )
+    )
+
+    by_url = {r.url: r for r in results}
+    assert report.total == 4
+    assert report.succeeded == 2
+    assert report.failures == {"http_404": 1, "robots_disallowed": 1}
+    assert by_url["https://jobs.example.com/flaky"].attempts == 2
+    assert attempts["https://jobs.example.com/robots.txt"] == 1  # once per host
+
+
+def _fetch_with_robots(robots_error, calls=None):
+    async def fake_fetch(url, *, parse=None, **_):
+        if calls is not None:
+            calls.append((url, asyncio.get_running_loop().time()))
+        if url.endswith("/robots.txt"):
+            raise robots_error
+        return FetchResult(url, 200, url, "utf-8")
+
+    return fake_fetch
+
+
+async def _echo(text):
+    return {"job_title": text}
+
+
+def test_robots_4xx_allows_and_other_failures_disallow(monkeypatch):
+    urls = [
+        "https://a.example.com/job",
+        "https://b.example.com/job",
+        "https://c.example.com/job",
+    ]
+    errors = {
+        "a.example.com": FetchError("http_404", 404),
+        "b.example.com": FetchError("http_503", 503),
+        "c.example.com": FetchError("timeout"),
+    }
+
+    async def fake_fetch(url, *, parse=None, **_):
+        if url.endswith("/robots.txt"):
+            raise errors[url.split("/")[2]]
+        return FetchResult(url, 200, url, "utf-8")
+
+    monkeypatch.setattr(bulk_ingest, "fetch_text", fake_fetch)
+    results, report = asyncio.run(ingest_urls(urls, extract=_echo, backoff=0))
+
+    assert {r.url: r.error for r in results} == {
+        "https://a.example.com/job": None,
+        "https://b.example.com/job": "robots_unavailable",
+        "https://c.example.com/job": "robots_unavailable",
+    }
+
+
+def test_robots_fetch_waits_its_turn(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        bulk_ingest,
+        "fetch_text",
+        _fetch_with_robots(FetchError("http_404", 404), calls),
+    )
+    asyncio.run(
+        ingest_urls(["https://jobs.example.com/a"], extract=_echo, min_delay=0.05)
+    )
+
+    (robots, t0), (page, t1) = calls
+    assert robots.endswith("/robots.txt") and page.endswith("/a")
+    assert t1 - t0 >= 0.05
+
+
+def test_stopping_early_cancels_the_workers(monkeypatch):
+    monkeypatch.setattr(
+        bulk_ingest, "fetch_text", _fetch_with_robots(FetchError("http_404", 404))
+    )
+
+    async def stuck(text):
+        if text.endswith("/a"):
+            return {"job_title": text}
+        await asyncio.Event().wait()
+
+    async def first_then_stop():
+        urls = ["https://jobs.example.com/a", "https://jobs.example.com/b"]
+        results = bulk_ingest.iter_ingest(urls, extract=stuck)
+        first = await anext(results)
+        await results.aclose()
+        return first, asyncio.all_tasks() - {asyncio.current_task()}
+
+    first, left = asyncio.run(first_then_stop())
+
+    assert first.url == "https://jobs.example.com/a"
+    assert not left
@@ -0,0 +1,43 @@
+from need_analysis import tasks
+from need_analysis.cache import ByteBudgetLRU, deep_sizeof
+from need_analysis.record import FIELDS, JobRequisition
+from need_analysis.schema import ExtractResult
+
+
+def _fields(n):
+    return {k: ExtractResult(f"value of {k}", 0.9) for k in FIELDS[:n]}
+
+
+def test_lru_evicts_by_bytes_and_spills_large_text(tmp_path):
+    one = deep_sizeof(JobRequisition.from_results(_fields(20)))
+    cache = ByteBudgetLRU(
+        budget_bytes=int(one * 2.5), spill_dir=tmp_path, spill_bytes=100
+    )
+
+    big = cache.put("a", _fields(20), text="x" * 10_000)
+    assert big.text is None and big.raw_text() == "x" * 10_000
+    assert cache.stats()["bytes"] < 10_000  # the raw text is not charged in RAM
+
+    cache.put("b", _fields(20))
+    assert cache.get("a") is big  # a is now most recently used
+    cache.put("c", _fields(20))
+
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.stats()["evictions"] == 1 and cache.bytes <= cache.budget_bytes
+    cache.put("d", _fields(20))
+    cache.put("e", _fields(20))
+    assert "a" not in cache and not (tmp_path / "a.txt").exists()
+
+
+def test_registry_shares_cached_results_across_sessions(tmp_path):
+    cache = ByteBudgetLRU(spill_dir=tmp_path)
+    key = tasks.content_key(b"same ad")
+    cache.put(key, {"job_title": ExtractResult("Data Engineer", 0.9)})
+    registry = tasks.TaskRegistry(cache=cache)
+
+    one = registry.start("session-1", key, lambda: "unused")
+    two = registry.start("session-2", key, lambda: "unused")
+
+    assert one.stage == two.stage == "done"
+    assert one.fields is two.fields  # one shared copy, not one per session
+    assert cache.stats()["hits"] == 2
@@ -0,0 +1,69 @@
+import graphlib
+
+import pytest
+
+from functions.engine import MEMO_KEY, Engine, processor
+from functions.processors import PROCESSORS
+
+
+def test_only_processors_with_changed_inputs_rerun():
+    @processor(reads=("title",), writes=("skills",))
+    def skills(state):
+        state["skills"] = [state["title"].lower()]
+
+    @processor(reads=("skills", "tips"), writes=("tips",))
+    def tips(state):
+        if not state.get("tips"):
+            state["tips"] = f"learn {state['skills'][0]}"
+
+    @processor(reads=("salary",), writes=("bonus",))
+    def bonus(state):
+        state["bonus"] = (state.get("salary") or 0) // 10
+
+    engine = Engine([tips, bonus, skills])  # declaration order does not matter
+    state = {"title": "Python"}
+
+    ran = engine.run(state)  # first run: everything is dirty
+    assert sorted(ran) == ["bonus", "skills", "tips"] and ran.index(
+        "skills"
+    ) < ran.index("tips")
+    assert engine.run(state) == []
+    state["title"] = "Rust"
+    assert engine.run(state) == ["skills", "tips"]  # downstream of the edit only
+    assert state["tips"] == "learn python"  # tips only fills an empty field
+    del state["tips"]
+    assert (
+        engine.run(state, keys=["tips"]) == ["tips"] and state["tips"] == "learn rust"
+    )
+    state["salary"] = 1000
+    assert engine.run(state, keys=["skills"]) == []  # bonus is not upstream of skills
+    assert engine.run(state) == ["bonus"] and state["bonus"] == 100
+    assert set(state[MEMO_KEY]) == {"skills", "tips", "bonus"}
+
+
+def test_cycles_and_duplicate_names_are_rejected():
+    a = processor(reads=("x",), writes=("y",))(lambda s: None)
+    b = processor(reads=("y",), writes=("x",))(lambda s: None)
+    with pytest.raises(ValueError):  # both are called "<lambda>"
+        Engine([a, b])
+
+    def first(state):
+        ...
+
+    def second(state):
+        ...
+
+    with pytest.raises(graphlib.CycleError):
+        Engine([processor(("x",), ("y",))(first), processor(("y",), ("x",))(second)])
+
+
+def test_wizard_processors_skip_unchanged_reruns():
+    state = {"job_title": "Senior Sales Manager", "lang": "en"}
+    first = PROCESSORS.run(state)
+    assert (
+        "update_commission_structure" in first and state["must_have_skills"][0] == "CRM"
+    )
+    assert PROCESSORS.run(state) == []
+    state["job_title"] = "Python Developer"
+    assert PROCESSORS.run(state, keys=["bonus_scheme"]) == ["update_bonus_scheme"]
+    assert "bonus_scheme" in state  # filled earlier, not recomputed
@@ -0,0 +1,322 @@
+import csv
+
+import numpy as np
+import pytest
+
+from need_analysis.cli import main
+from need_analysis.esco.graph import SkillGraph, gather, graph_path
+from need_analysis.esco.index import EscoIndex
+from need_analysis.esco.matcher import MIN_SCORE, OccupationMatcher, clean_title
+from need_analysis.esco.prefill import prefill_stage
+from need_analysis.esco.vectors import SkillVectors, vectors_path
+from need_analysis.schema import ExtractResult
+
+OCC = "http://data.europa.eu/esco/occupation/data-scientist"
+PY = "http://data.europa.eu/esco/skill/python"
+ML = "http://data.europa.eu/esco/skill/machine-learning"
+GRP = "http://data.europa.eu/esco/isced-f/0613"
+
+
+def _write(path, header, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as fh:
+        w = csv.writer(fh)
+        w.writerow(header)
+        w.writerows(rows)
+
+
+@pytest.fixture
+def esco_dump(tmp_path):
+    occ_head = [
+        "conceptType",
+        "conceptUri",
+        "iscoGroup",
+        "preferredLabel",
+        "altLabels",
+        "description",
+    ]
+    skill_head = [
+        "conceptType",
+        "conceptUri",
+        "skillType",
+        "reuseLevel",
+        "preferredLabel",
+        "altLabels",
+        "description",
+    ]
+    _write(
+        tmp_path / "en" / "occupations_en.csv",
+        occ_head,
+        [
+            [
+                "Occupation",
+                OCC,
+                "2511",
+                "data scientist",
+                "data science specialist\nML engineer",
+                "Data scientists collect and analyse data. They build predictive models. They report findings.",
+            ],
+        ],
+    )
+    _write(
+        tmp_path / "de" / "occupations_de.csv",
+        occ_head,
+        [
+            [
+                "Occupation",
+                OCC,
+                "2511",
+                "Datenwissenschaftler/Datenwissenschaftlerin",
+                "Data Scientist",
+                "Datenwissenschaftler sammeln Daten. Sie bauen Modelle.",
+            ],
+        ],
+    )
+    _write(
+        tmp_path / "en" / "skills_en.csv",
+        skill_head,
+        [
+            [
+                "KnowledgeSkillCompetence",
+                PY,
+                "knowledge",
+                "sector-specific",
+                "Python (computer programming)",
+                "python",
+                "",
+            ],
+            [
+                "KnowledgeSkillCompetence",
+                ML,
+                "knowledge",
+                "cross-sector",
+                "machine learning",
+                "ML",
+                "",
+            ],
+        ],
+    )
+    _write(
+        tmp_path / "de" / "skills_de.csv",
+        skill_head,
+        [
+            [
+                "KnowledgeSkillCompetence",
+                PY,
+                "knowledge",
+                "sector-specific",
+                "Python (Computerprogrammierung)",
+                "",
+                "",
+            ],
+            [
+                "KnowledgeSkillCompetence",
+                ML,
+                "knowledge",
+                "cross-sector",
+                "maschinelles Lernen",
+                "",
+                "",
+            ],
+        ],
+    )
+    _write(
+        tmp_path / "en" / "occupationSkillRelations_en.csv",
+        ["occupationUri", "relationType", "skillType", "skillUri"],
+        [[OCC, "essential", "knowledge", PY], [OCC, "optional", "knowledge", ML]],
+    )
+    _write(
+        tmp_path / "en" / "skillGroups_en.csv",
+        ["conceptType", "conceptUri", "preferredLabel", "altLabels"],
+        [["SkillGroup", GRP, "software and applications development and analysis", ""]],
+    )
+    _write(
+        tmp_path / "en" / "broaderRelationsSkillPillar_en.csv",
+        ["conceptType", "conceptUri", "broaderType", "broaderUri"],
+        [
+            ["KnowledgeSkillCompetence", PY, "SkillGroup", GRP],
+            ["KnowledgeSkillCompetence", ML, "SkillGroup", GRP],
+        ],
+    )
+    return tmp_path
+
+
+def test_import_and_lookup(esco_dump, tmp_path):
+    db = tmp_path / "esco.sqlite"
+    assert (
+        main(
+            [
+                "esco-import",
+                str(esco_dump / "en"),
+                str(esco_dump / "de"),
+                "--db",
+                str(db),
+            ]
+        )
+        == 0
+    )
+
+    index = EscoIndex(db)
+    assert index.search_skills("pyth") == ["Python (computer programming)"]
+    assert index.search_skills("maschinel", language="de") == ["maschinelles Lernen"]
+    assert index.find_occupation("ML engineer").uri == OCC  # alternative label
+    assert index.find_occupation("datenwissenschaftlerin", "de").label.startswith(
+        "Datenwissenschaftler"
+    )
+    assert index.get_skills_for_job_title("Data Scientist") == [
+        "Python (computer programming)"
+    ]
+    assert index.get_tasks_for_job_title("data scientist", limit=2) == [
+        "Data scientists collect and analyse data",
+        "They build predictive models",
+    ]
+    assert (
+        index.search_skills("") == []
+        and index.get_skills_for_job_title("astronaut") == []
+    )
+
+
+def test_missing_dump_is_reported(tmp_path):
+    assert main(["esco-import", str(tmp_path), "--db", str(tmp_path / "x.sqlite")]) == 2
+
+
+def test_import_builds_trigram_matcher(esco_dump, tmp_path):
+    db = tmp_path / "esco.sqlite"
+    main(["esco-import", str(esco_dump / "en"), str(esco_dump / "de"), "--db", str(db)])
+
+    index = EscoIndex(db)
+    assert index.matcher is not None
+    occ = index.find_occupation("Senior Datenwissenschaftler*in (m/w/d)", "de")
+    assert occ.uri == OCC and occ.label.startswith("Datenwissenschaftler")
+
+
+def test_matcher_cleans_titles_and_survives_mmap(tmp_path):
+    assert (
+        clean_title("Senior Fullstack Entwickler:innen (m/w/d) – 100% remote")
+        == "fullstack entwickler"
+    )
+    assert clean_title("Sales Manager m/w/d") == "sales manager"
+    assert clean_title("Admin Berlin") == "admin berlin"
+
+    matcher = OccupationMatcher.from_labels(
+        [
+            ("occ/dev", "software developer", True),
+            ("occ/dev", "Softwareentwickler/Softwareentwicklerin", False),
+            ("occ/dev", "fullstack developer", False),
+            ("occ/acc", "accountant", True),
+            ("occ/acc", "Buchhalter/Buchhalterin", False),
+        ]
+    )
+    matcher.save(tmp_path / "occ.trigrams")
+    mapped = OccupationMatcher.load(tmp_path / "occ.trigrams")
+
+    top = mapped.match("Senior Fullstack Developer (w/m/d)", k=2)
+    assert [m.uri for m in top] == ["occ/dev", "occ/acc"]
+    assert top[0].score == 1.0 and top[1].score < MIN_SCORE
+    assert (
+        top[0].label == "software developer" and top[0].matched == "fullstack developer"
+    )
+    assert mapped.match_many(["Buchhalter (m/w/d)", "Buchhalter (m/w/d)", "xyz"]) == {
+        "Buchhalter (m/w/d)": mapped.match("Buchhalter", 1, MIN_SCORE),
+        "xyz": [],
+    }
+    assert mapped.match("Buchhalter", 1)[0].uri == "occ/acc"
+
+
+def test_skill_vectors_batch_search_and_suggestions(esco_dump, tmp_path, monkeypatch):
+    from functions import processors
+    from need_analysis.esco import vectors
+
+    db = tmp_path / "esco.sqlite"
+    main(["esco-import", str(esco_dump / "en"), str(esco_dump / "de"), "--db", str(db)])
+    skills = SkillVectors.load(vectors_path(db))
+
+    assert isinstance(skills.matrix, np.memmap)
+    hits = skills.search(["python programming", "maschinelles lernen"], k=1)
+    assert [h[0].uri for h in hits] == [PY, ML]
+    assert (
+        skills.search(["python"], k=2, language="de")[0][0].label
+        == "Python (Computerprogrammierung)"
+    )
+    assert skills.normalize(["machine-learning", "Kochen"], "en") == [
+        "machine learning",
+        "Kochen",
+    ]
+
+    monkeypatch.setattr(vectors, "get_skill_vectors", lambda: skills)
+    state = {
+        "lang": "en",
+        "must_have_skills": "machine-learning, Python (computer programming)",
+    }
+    processors.normalize_must_have_skills(state)
+    processors.update_nice_to_have_skills(state)
+    assert (
+        state["must_have_skills"] == "machine learning, Python (computer programming)"
+    )
+    assert state["nice_to_have_skills"] == [
+        "Public speaking",
+        "Problem-solving",
+        "Data analysis",
+    ]
+
+
+def test_suggest_keeps_close_neighbours_but_not_the_normalized_input():
+    skills = SkillVectors.from_labels(
+        [
+            ("u1", "en", "data analysis"),
+            ("u2", "en", "data analysis tools"),
+            ("u3", "en", "data analytics"),
+            ("u4", "en", "statistics"),
+            ("u5", "en", "cooking"),
+        ]
+    )
+    assert skills.search(["data analysis"], 2, "en")[0][1].score >= 0.75
+
+    suggested = skills.suggest(["Data-Analysis"], k=2, language="en")
+
+    assert suggested == ["data analysis tools", "data analytics"]
+
+
+def test_skill_graph_expands_occupations_and_prefills(esco_dump, tmp_path):
+    db = tmp_path / "esco.sqlite"
+    main(["esco-import", str(esco_dump / "en"), str(esco_dump / "de"), "--db", str(db)])
+    graph = SkillGraph.load(graph_path(db))
+
+    assert isinstance(graph.essential_idx, np.memmap)
+    skills = graph.expand(OCC, "de")
+    assert skills.essential == ["Python (Computerprogrammierung)"]
+    assert skills.optional == ["maschinelles Lernen"]
+    # en fallback
+    assert skills.groups == ["software and applications development and analysis"]
+    assert graph.expand("occ/unknown") is None
+    assert graph.prefill([OCC, "occ/unknown", OCC]) == [
+        {
+            "skills_must_high": ["Python (computer programming)"],
+            "skills_must_low": [],
+            "skills_nice_high": [],
+            "skills_nice_low": ["machine learning"],
+        },
+        None,
+        {
+            "skills_must_high": ["Python (computer programming)"],
+            "skills_must_low": [],
+            "skills_nice_high": [],
+            "skills_nice_low": ["machine learning"],
+        },
+    ]
+
+    ptr, idx = np.array([0, 2, 2, 3]), np.array([7, 8, 9])
+    targets, owner = gather(ptr, idx, np.array([2, 1, 0]))
+    assert targets.tolist() == [9, 7, 8] and owner.tolist() == [0, 2, 2]
+
+    fields = {
+        "job_title": ExtractResult("Senior Data Scientist (m/w/d)", 0.9),
+        "language_of_ad": ExtractResult("de", 0.99),
+        "skills_nice_low": ExtractResult("Kochen", 0.8, typed=["Kochen"]),
+    }
+    out = prefill_stage(fields, db)
+    assert out["skills_must_high"].typed == ["Python (Computerprogrammierung)"]
+    assert out["skills_must_high"].confidence == 0.6
+    assert out["skills_nice_low"] is fields["skills_nice_low"]  # extracted values win
+    assert "skills_must_low" not in out
+    assert prefill_stage(fields, tmp_path / "missing.sqlite") is fields
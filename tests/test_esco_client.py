@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from need_analysis.esco import client
+
+OCC = {
+    "uri": "http://data.europa.eu/esco/occupation/data-scientist",
+    "title": "data scientist",
+    "description": {"en": {"literal": "Collect data. Build models."}},
+    "_links": {
+        "hasEssentialSkill": [
+            {"title": "Python (computer programming)"},
+            {"title": "statistics"},
+        ],
+        "hasOptionalSkill": [{"title": "R"}],
+    },
+}
+
+
+@pytest.fixture
+def requests_seen(monkeypatch):
+    seen = []
+
+    async def handler(request):
+        seen.append(request.url.params["text"])
+        await asyncio.sleep(0.01)  # keep the first request in flight
+        hits = [OCC] if "data" in request.url.params["text"].lower() else []
+        return httpx.Response(200, json={"_embedded": {"results": hits}})
+
+    http = httpx.AsyncClient(
+        base_url=client.BASE_URL, transport=httpx.MockTransport(handler)
+    )
+    monkeypatch.setattr(client, "get_client", lambda: http)
+    monkeypatch.setattr(client, "_profiles", client.TTLCache())
+    return seen
+
+
+def test_skills_and_tasks_share_one_request(requests_seen):
+    async def both():
+        return await asyncio.gather(
+            client.occupation_profile("Data Scientist"),
+            client.occupation_profile("data scientist "),
+        )
+
+    first, second = asyncio.run(both())
+    again = asyncio.run(client.occupation_profile("Data Scientist"))
+
+    assert first is second is again
+    assert first.essential_skills == ("Python (computer programming)", "statistics")
+    assert first.tasks == ["Collect data", "Build models"]
+    assert requests_seen == ["data scientist"]  # cleaned title is sent
+
+
+def test_batch_dedupes_titles_and_caches_misses(requests_seen):
+    titles = ["Data Scientist", "Astronaut", "Data Scientist"]
+    profiles = asyncio.run(client.occupation_profiles(titles, concurrency=2))
+    asyncio.run(client.occupation_profile("Astronaut"))
+
+    assert set(profiles) == {"Data Scientist", "Astronaut"}
+    assert profiles["Astronaut"] is None
+    assert sorted(requests_seen) == ["astronaut", "data scientist"]
+
+
+def test_concurrent_lookups_on_two_loops_each_get_a_result(monkeypatch):
+    gate = threading.Event()
+
+    async def handler(request):
+        await asyncio.to_thread(gate.wait, 5)  # hold both requests in flight
+        return httpx.Response(200, json={"_embedded": {"results": [OCC]}})
+
+    transport = httpx.MockTransport(handler)
+    monkeypatch.setattr(
+        client,
+        "get_client",
+        lambda: httpx.AsyncClient(base_url=client.BASE_URL, transport=transport),
+    )
+    monkeypatch.setattr(client, "_profiles", client.TTLCache())
+
+    with ThreadPoolExecutor(2) as pool:
+        futures = [
+            pool.submit(asyncio.run, client.occupation_profile("Data Scientist"))
+            for _ in range(2)
+        ]
+        time.sleep(0.05)
+        gate.set()
+        results = [f.result(timeout=5) for f in futures]
+
+    assert [p.label for p in results] == ["data scientist", "data scientist"]
+
+
+def test_ttl_cache_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(client.time, "monotonic", lambda: now[0])
+    cache = client.TTLCache(maxsize=2, ttl=10)
+    cache.put("a", None)
+    cache.put("b", 1)
+    cache.put("c", 2)  # evicts "a"
+
+    assert cache.get("a", "gone") == "gone" and cache.get("b") == 1
+    now[0] = 111.0
+    assert cache.get("c", "gone") == "gone"
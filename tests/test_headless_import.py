@@ -0,0 +1,30 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = ("streamlit", "openai", "PyPDF2", "docx", "bs4", "httpx")
+
+
+def test_core_import_has_no_heavy_dependencies():
+    code = (
+        "import sys, json\n"
+        "import need_analysis.extraction, need_analysis.ingest\n"
+        f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert json.loads(out.stdout) == []
+
+
+def test_lazy_package_exports():
+    import need_analysis
+
+    assert need_analysis.ExtractResult().confidence == 0.0
+    assert "job_title" in need_analysis.REGEX_PATTERNS
@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+
+from need_analysis import http_fetch
+from need_analysis.http_fetch import HttpCache, fetch_text
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_fetch_text_revalidates_with_etag(monkeypatch, tmp_path):
+    calls = []
+
+    def handler(request):
+        calls.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            content="<p>Stellenanzeige für Entwickler</p>".encode("latin-1"),
+            headers={"ETag": '"v1"', "Content-Type": "text/html; charset=iso-8859-1"},
+        )
+
+    monkeypatch.setattr(http_fetch, "get_client", lambda: _client(handler))
+    cache = HttpCache(tmp_path)
+    parse = lambda html: html.replace("<p>", "").replace("</p>", "")  # noqa: E731
+
+    kwargs = {"parse": parse, "cache": cache, "cache_key": "strip-p"}
+    first = asyncio.run(fetch_text("https://example.com/job", **kwargs))
+    second = asyncio.run(fetch_text("https://example.com/job", **kwargs))
+
+    assert first.text == "Stellenanzeige für Entwickler"
+    assert second.status == 304 and second.from_cache
+    assert second.text == first.text
+    assert calls == [None, '"v1"']
+
+
+def test_fetch_text_caps_body_and_sniffs_meta_charset(monkeypatch, tmp_path):
+    body = b'<meta charset="utf-8">' + "ä".encode() * 5000
+
+    monkeypatch.setattr(
+        http_fetch,
+        "get_client",
+        lambda: _client(lambda r: httpx.Response(200, content=body)),
+    )
+    res = asyncio.run(
+        fetch_text("https://example.com/big", max_bytes=1000, cache=HttpCache(tmp_path))
+    )
+
+    assert res.truncated
+    assert res.encoding == "utf-8"
+    assert "ä" in res.text and len(res.text.encode()) <= 1000
+
+
+def test_lambda_parsers_are_not_cached_without_a_key(monkeypatch, tmp_path):
+    headers = {"ETag": '"v1"'}
+    monkeypatch.setattr(
+        http_fetch,
+        "get_client",
+        lambda: _client(
+            lambda r: httpx.Response(200, text="<p>Job</p>", headers=headers)
+        ),
+    )
+    cache = HttpCache(tmp_path)
+
+    upper = asyncio.run(
+        fetch_text("https://example.com/a", parse=lambda t: t.upper(), cache=cache)
+    )
+    lower = asyncio.run(
+        fetch_text("https://example.com/a", parse=lambda t: t.lower(), cache=cache)
+    )
+
+    assert (upper.text, lower.text) == ("<P>JOB</P>", "<p>job</p>")
+    assert not any(tmp_path.iterdir())
+
+
+def test_truncated_body_ends_on_a_whole_character(monkeypatch, tmp_path):
+    body = b'<meta charset="utf-8">' + "ä".encode() * 5000
+
+    monkeypatch.setattr(
+        http_fetch,
+        "get_client",
+        lambda: _client(lambda r: httpx.Response(200, content=body)),
+    )
+    res = asyncio.run(
+        fetch_text("https://example.com/big", max_bytes=1001, cache=HttpCache(tmp_path))
+    )
+
+    assert res.truncated
+    assert "\ufffd" not in res.text and res.text.endswith("ä")
+
+
+def test_each_event_loop_gets_its_own_client(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        http_fetch,
+        "_new_client",
+        lambda: _client(lambda r: httpx.Response(200, text="ok")),
+    )
+
+    async def fetch_twice():
+        first = await fetch_text("https://example.com/a", cache=HttpCache(tmp_path))
+        second = await fetch_text("https://example.com/b", cache=HttpCache(tmp_path))
+        assert first.text == second.text == "ok"
+        return http_fetch.get_client()
+
+    loop_a, loop_b = asyncio.new_event_loop(), asyncio.new_event_loop()
+    try:
+        client_a = loop_a.run_until_complete(fetch_twice())
+        client_b = loop_b.run_until_complete(fetch_twice())
+        assert client_a is not client_b
+        assert loop_a.run_until_complete(fetch_twice()) is client_a
+    finally:
+        loop_a.close()
+        loop_b.close()
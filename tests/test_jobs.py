@@ -0,0 +1,120 @@
+import asyncio
+
+from need_analysis import worker
+from need_analysis.jobs import MAX_ATTEMPTS, JobQueue
+from need_analysis.record import JobRequisition
+from need_analysis.schema import ExtractResult
+
+
+def test_worker_drains_queue_and_retries_failures(tmp_path, monkeypatch):
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+    ok_id = queue.enqueue("text", "Job Title: Data Engineer")
+    bad_id = queue.enqueue("text", "boom")
+    assert queue.depth() == 2
+
+    async def fake_extract(text):
+        if text == "boom":
+            raise RuntimeError("LLM unavailable")
+        return {"job_title": ExtractResult(text.split(": ")[1], 0.9)}
+
+    monkeypatch.setattr(worker, "extract", fake_extract)
+    handled = asyncio.run(worker.work(queue, concurrency=2, idle_exit=True))
+
+    ok, bad = queue.get(ok_id), queue.get(bad_id)
+    assert ok.status == "done" and ok.result["job_title"].value == "Data Engineer"
+    # same type as a finished in-process task
+    assert isinstance(ok.result, JobRequisition)
+    assert bad.status == "failed" and bad.attempts == MAX_ATTEMPTS
+    assert "LLM unavailable" in bad.error
+    assert handled == 1 + MAX_ATTEMPTS
+    assert queue.stats()["depth"] == 0
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite", lease_seconds=-1)
+    job_id = queue.enqueue("url", "https://example.com/job")
+
+    first = queue.claim("node-a:1")
+    second = queue.claim("node-b:2")  # node-a died; its lease has already run out
+
+    assert first.id == second.id == job_id
+    assert second.attempts == 2
+    assert second.payload == b"https://example.com/job"
+
+
+def test_cancelled_job_is_never_claimed_or_completed(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+    claimed = queue.enqueue("text", "old upload")
+    waiting = queue.enqueue("text", "newer upload")
+
+    job = queue.claim("node-a:1")
+    assert job.id == claimed
+    assert queue.cancel(claimed) and queue.cancel(waiting)
+    queue.complete(claimed, {"job_title": ExtractResult("late", 0.9)})
+
+    assert queue.claim("node-a:1") is None
+    assert (
+        queue.get(claimed).status == "cancelled" and queue.get(claimed).result is None
+    )
+    assert not queue.cancel(claimed)
+
+
+def test_heartbeat_keeps_a_running_job_leased(tmp_path, monkeypatch):
+    queue = JobQueue(tmp_path / "jobs.sqlite", lease_seconds=0.3)
+    job_id = queue.enqueue("text", "Job Title: Data Engineer")
+
+    async def slow_extract(text):
+        await asyncio.sleep(1.0)  # several leases long
+        return {"job_title": ExtractResult("Data Engineer", 0.9)}
+
+    monkeypatch.setattr(worker, "extract", slow_extract)
+
+    async def main():
+        run = asyncio.create_task(worker.work(queue, max_jobs=1))
+        await asyncio.sleep(0.6)
+        stolen = queue.claim("node-b:2")
+        await run
+        return stolen
+
+    assert asyncio.run(main()) is None
+    job = queue.get(job_id)
+    assert job.status == "done" and job.attempts == 1
+
+
+def test_cancel_stops_a_running_job(tmp_path, monkeypatch):
+    queue = JobQueue(tmp_path / "jobs.sqlite", lease_seconds=0.3)
+    job_id = queue.enqueue("text", "Job Title: Data Engineer")
+    stopped = asyncio.Event()
+
+    async def slow_extract(text):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            stopped.set()
+            raise
+
+    monkeypatch.setattr(worker, "extract", slow_extract)
+
+    async def main():
+        run = asyncio.create_task(worker.work(queue, max_jobs=1))
+        await asyncio.sleep(0.2)
+        assert queue.cancel(job_id)
+        await asyncio.wait_for(run, timeout=2)
+        assert stopped.is_set()
+
+    asyncio.run(main())
+    assert queue.get(job_id).status == "cancelled"
+
+
+def test_queue_is_safe_to_share_between_threads(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+
+    def roundtrip(i):
+        job_id = queue.enqueue("text", f"ad {i}")
+        return queue.get(job_id).status
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(roundtrip, range(200)))
+    assert statuses == ["queued"] * 200 and queue.depth() == 200
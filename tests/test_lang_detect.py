@@ -0,0 +1,49 @@
+from need_analysis.lang_detect import detect_language
+
+
+def test_detect_language_german_and_english():
+    de = "Wir suchen ab sofort einen Softwareentwickler (m/w/d) für unser Team in Berlin."
+    en = "We are looking for a Senior Software Engineer to join our team in London."
+
+    assert detect_language(de)[0] == "de"
+    assert detect_language(en)[0] == "en"
+    assert detect_language(de)[1] > 0.3
+
+
+def test_detect_language_empty_text_falls_back():
+    assert detect_language("") == ("en", 0.0)
+    assert detect_language("12345 -- !!") == ("en", 0.0)
+
+
+def test_german_subset_is_smaller_than_any():
+    from need_analysis.patterns import ANY_LANG, compiled_patterns
+
+    de, any_ = compiled_patterns("de"), compiled_patterns(ANY_LANG)
+
+    assert sum(len(p.pattern) for p in de.values()) < 0.8 * sum(
+        len(p.pattern) for p in any_.values()
+    )
+    # English label kept where ads use it
+    assert de["tech_stack"].search("Tech Stack: Python")
+    assert not de["industry"].search("Industry: Automotive")
+    assert de["brand_name"].search("Brand: Acme")  # no German label → English
+
+
+def test_patterns_without_a_label_do_not_match_any_line():
+    from need_analysis.patterns import ANY_LANG, compiled_patterns
+
+    for lang in (ANY_LANG, "de", "en"):
+        patterns = compiled_patterns(lang)
+        assert (
+            patterns["job_title"].search("Wir suchen Verstärkung\nfür unser Team")
+            is None
+        )
+        assert patterns["brand_name"].search("Wir suchen Verstärkung") is None
+
+
+def test_short_form_text_uses_the_full_pattern_set():
+    from need_analysis.extraction import regex_stage
+
+    fields = regex_stage("Job Title: Data Engineer\nStart Date: 01.10.2025\n")
+    assert fields["language_of_ad"].confidence == 0.0
+    assert fields["date_of_employment_start"].value == "01.10.2025"
@@ -0,0 +1,98 @@
+import asyncio
+import io
+import json
+
+from need_analysis import batch
+from need_analysis.batch import run_batch
+from need_analysis.manifest import Manifest, in_shard, parse_shard
+from need_analysis.schema import ExtractResult
+
+
+def _ads(tmp_path, n=3):
+    paths = []
+    for i in range(n):
+        path = tmp_path / f"ad{i}.txt"
+        path.write_text(f"Job Title: Engineer {i}\n", encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_run_resumes_at_llm_stage_and_skips_completed(tmp_path, monkeypatch):
+    paths = _ads(tmp_path)
+    manifest = Manifest(tmp_path / "m.sqlite")
+    llm_calls = []
+
+    async def fake_llm(fields, text):
+        llm_calls.append(text)
+        if "Engineer 1" in text and len(llm_calls) <= 3:
+            raise RuntimeError("connection reset")
+        return {
+            **fields,
+            "city": ExtractResult("Berlin", 0.7),
+            "vacation_days": ExtractResult("30 Tage", 0.7),
+        }
+
+    monkeypatch.setattr(batch, "llm_stage", fake_llm)
+
+    first = asyncio.run(run_batch(paths, io.StringIO(), workers=1, manifest=manifest))
+    assert first == {"ok": 2, "failed": 1}
+    assert manifest.counts() == {"llm/ok": 2, "regex/failed": 1}
+
+    monkeypatch.setattr(batch, "prepare_document", None)  # ingestion must not run again
+    out = io.StringIO()
+    second = asyncio.run(run_batch(paths, out, workers=1, manifest=manifest))
+    assert second == {"ok": 1, "skipped": 2}
+    assert len(llm_calls) == 4
+    assert {p.rsplit("/", 1)[-1] for p, _ in manifest.results()} == {
+        "ad0.txt",
+        "ad1.txt",
+        "ad2.txt",
+    }
+
+    # the resumed output holds every document once, finished ones replayed from the manifest
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert sorted(r["path"].rsplit("/", 1)[-1] for r in rows) == [
+        "ad0.txt",
+        "ad1.txt",
+        "ad2.txt",
+    ]
+    assert all(r["error"] is None for r in rows)
+    # the manifest stores the output of the last stage, typed values included
+    assert all(fields["vacation_days"].typed == 30 for _, fields in manifest.results())
+
+
+def _refine(fields):
+    refined = fields.get("refined", ExtractResult("0", 1.0))
+    return {**fields, "refined": ExtractResult(str(int(refined.value) + 1), 1.0)}
+
+
+def test_llm_run_after_regex_only_run_refines_once(tmp_path, monkeypatch):
+    paths = _ads(tmp_path, n=2)
+    manifest = Manifest(tmp_path / "m.sqlite")
+    monkeypatch.setattr(batch, "refine_stage", _refine)
+    seen = []
+
+    async def fake_llm(fields, text):
+        seen.append(fields)
+        return fields
+
+    monkeypatch.setattr(batch, "llm_stage", fake_llm)
+
+    asyncio.run(
+        run_batch(paths, io.StringIO(), workers=1, use_llm=False, manifest=manifest)
+    )
+    assert manifest.counts() == {"refined/ok": 2}
+
+    monkeypatch.setattr(batch, "prepare_document", None)  # the stored text is reused
+    second = asyncio.run(run_batch(paths, io.StringIO(), workers=1, manifest=manifest))
+    assert second == {"ok": 2}
+    # the LLM gets raw regex fields, so the refinement runs once per result
+    assert all("refined" not in fields for fields in seen)
+    assert all(f["refined"].value == "1" for _, f in manifest.results())
+
+
+def test_shards_partition_hash_space():
+    digests = [f"{i * 2654435761 % 2**32:08x}" + "0" * 56 for i in range(200)]
+    owners = [[k for k in range(4) if in_shard(d, k, 4)] for d in digests]
+    assert all(len(o) == 1 for o in owners)
+    assert parse_shard("2/4") == (2, 4)
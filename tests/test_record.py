@@ -0,0 +1,37 @@
+from need_analysis.cache import deep_sizeof
+from need_analysis.record import FIELDS, JobRequisition
+from need_analysis.schema import ExtractResult, load_results
+
+
+def test_record_round_trips_and_reads_like_a_dict():
+    fields = {
+        "job_title": ExtractResult("Data Engineer", 0.9),
+        "salary_range_min": ExtractResult("60000", 0.75),
+        "language_of_ad": ExtractResult("de", 0.5),
+        "vacation_days": ExtractResult("30 Tage", 0.5, 30),
+        "not_a_field": ExtractResult("dropped", 1.0),
+    }
+    rec = JobRequisition.from_results(fields)
+
+    assert "job_title" in rec and "city" not in rec and len(rec) == 4
+    assert rec.get("city") is None and rec["job_title"].value == "Data Engineer"
+    assert rec.to_results()["salary_range_min"] == ExtractResult("60000", 0.75)
+    assert rec["vacation_days"].typed == 30 and rec["job_title"].typed is None
+    assert JobRequisition.from_json(rec.to_json()) == rec
+    assert load_results(rec.to_json())["language_of_ad"] == ExtractResult("de", 0.5)
+
+
+def test_record_is_much_smaller_than_the_dict():
+    full = {k: ExtractResult(f"value of {k}", 0.8) for k in FIELDS}
+    values = sum(deep_sizeof(r.value) for r in full.values())
+    rec = JobRequisition.from_results(full)
+    assert deep_sizeof(rec) - values < (deep_sizeof(full) - values) / 4
+
+
+def test_confidences_keep_full_precision():
+    rec = JobRequisition.from_results(
+        {"job_title": ExtractResult("Data Engineer", 0.9)}
+    )
+    assert rec["job_title"].confidence == 0.9
+    assert rec.to_results()["job_title"] == ExtractResult("Data Engineer", 0.9)
+    assert JobRequisition.from_json(rec.to_json())["job_title"].confidence == 0.9
@@ -0,0 +1,93 @@
+from functions import processors
+from need_analysis.roles import Automaton, RoleIndex, normalize_title, role_index
+
+
+def test_automaton_finds_overlapping_patterns():
+    patterns = ["he", "she", "his", "hers", "she"]
+    auto = Automaton(patterns)
+    found = sorted(patterns[i] for i in auto.find("ushers"))
+    assert found == ["he", "hers", "she"]  # the duplicate "she" is reported once
+    assert list(auto.find("xyz")) == []
+
+
+def test_most_specific_template_wins_per_field():
+    index = RoleIndex(
+        [
+            {
+                "id": "dev",
+                "patterns": ["developer", "entwickler"],
+                "task_list": ["Code"],
+            },
+            {
+                "id": "py",
+                "patterns": ["python"],
+                "must_have_skills": ["Python"],
+                "task_list": ["Py"],
+            },
+            {"id": "web", "patterns": ["python web developer"], "task_list": ["Web"]},
+            {"id": "lead", "patterns": [" lead "], "bonus_scheme": "10 %"},
+        ]
+    )
+    assert (
+        normalize_title("Lead Python-Entwickler*in (m/w/d)")
+        == " lead python entwickler in m w d "
+    )
+    assert index.suggest("Lead Python-Entwickler*in (m/w/d)") == {
+        "task_list": ["Code"],
+        "must_have_skills": ["Python"],
+        "bonus_scheme": "10 %",
+    }
+    assert index.suggest("Python Web Developer")["task_list"] == ["Web"]
+    # whole word only
+    assert "bonus_scheme" not in index.suggest("Leading Python Developer")
+    assert index.suggest("Astronaut") == {}
+
+
+def test_patterns_match_whole_words_unless_opened_for_compounds():
+    index = RoleIndex(
+        [
+            {"id": "react", "patterns": ["react"], "must_have_skills": ["React"]},
+            {"id": "finance", "patterns": ["*buchhalter*"], "isco": "2411"},
+            {"id": "sales", "patterns": ["vertrieb*"], "isco": "3322"},
+        ]
+    )
+    assert index.suggest("React Developer") == {"must_have_skills": ["React"]}
+    assert index.suggest("Reactor Operator") == {}
+    assert index.suggest("Finanzbuchhalterin") == {"isco": "2411"}
+    assert index.suggest("Vertriebsmitarbeiter") == {"isco": "3322"}
+    assert index.suggest("Außenvertrieb") == {}
+
+
+def test_bundled_catalog_ignores_look_alike_titles():
+    for title in (
+        "Reactor Operator",
+        "Security Guard",
+        "Fachkraft für Arbeitssicherheit",
+        "Air Traffic Controller",
+        "Decoder Engineer",
+    ):
+        assert role_index().suggest(title) == {}, title
+    # a developer, but not a .NET one
+    assert [t["id"] for t in role_index().matches("Internet Developer")] == [
+        "software_developer"
+    ]
+    assert role_index().suggest(".NET Developer (m/w/d)")["must_have_skills"][0] == "C#"
+    assert role_index().suggest("Finanzbuchhalter (m/w/d)")["isco"] == "2411"
+    assert role_index().suggest("IT-Security Engineer")["isco"] == "2529"
+
+
+def test_processors_use_the_bundled_catalog():
+    # the longer pattern first: "vertrieb*" beats "senior"
+    assert [t["id"] for t in role_index().matches("Senior Vertriebsmitarbeiter")] == [
+        "sales",
+        "senior_level",
+    ]
+    state = {"job_title": "Senior Vertriebsmitarbeiter (m/w/d)"}
+    processors.update_task_list(state)
+    processors.update_must_have_skills(state)
+    processors.update_bonus_scheme(state)
+    processors.update_commission_structure(state)
+    assert state["task_list"][0] == "Prospect and qualify leads"
+    assert state["must_have_skills"] == ["CRM", "Negotiation", "Lead generation"]
+    assert state["bonus_scheme"].startswith("Annual performance bonus")
+    assert state["commission_structure"].startswith("Quarterly quota")
@@ -0,0 +1,90 @@
+import math
+
+import pytest
+
+from functions import processors
+from need_analysis import salary
+from need_analysis.salary import SalaryStore, seniority_of
+
+CSV = """occupation,region,seniority,currency,period,p25,p50,p75
+2512,berlin,senior,EUR,year,68000,76000,86000
+2512,,senior,EUR,year,64000,72000,82000
+2512,,,EUR,year,52000,61000,72000
+25,,,EUR,month,4000,4500,5000
+3322,zürich,,CHF,year,90000,100000,110000
+"""
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "salaries.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return SalaryStore.load(path)
+
+
+def test_lookup_falls_back_from_region_to_seniority_to_occupation_group(store):
+    assert store.lookup("2512", "Berlin", "senior").p50 == 76000  # exact row
+    assert store.lookup("2512", "Hamburg", "senior").p50 == 72000  # any region
+    assert store.lookup("2512", "Berlin", "junior").p50 == 61000  # any level
+    assert store.lookup("2519", "", "").p50 == 54000  # 2-digit group, 4,500 × 12
+    assert store.lookup("7126") is None
+
+
+def test_currency_and_period_conversion(store):
+    chf = store.lookup("3322", "Zürich")
+    assert chf.p50 == pytest.approx(100000 * 1.05)  # stored in EUR per year
+    assert store.lookup("3322", "zürich", currency="CHF").p50 == pytest.approx(100000)
+    assert store.lookup("2512", period="month").p75 == pytest.approx(6000)
+    assert store.lookup("2512", period="hour").p25 == pytest.approx(25.0)
+    with pytest.raises(ValueError):
+        store.lookup("2512", currency="XYZ")
+
+
+def test_batch_matches_single_lookups(store):
+    queries = [
+        ("2512", "berlin", "senior"),
+        ("9999", "", ""),
+        ("2519", "köln", "lead"),
+    ] * 100
+    table = store.percentiles(*zip(*queries))
+    assert table.shape == (300, 3)
+    for row, (occ, region, level) in zip(table[:3], queries):
+        single = store.lookup(occ, region, level)
+        assert (single is None and math.isnan(row[1])) or row[1] == single.p50
+
+
+def test_update_salary_range_uses_benchmarks(store, monkeypatch):
+    assert seniority_of("Senior Python Developer (m/w/d)") == "senior"
+    assert seniority_of("Midwife") == ""
+
+    monkeypatch.setattr(salary, "get_salary_store", lambda: store)
+    state = {
+        "job_title": "Senior Python Developer",
+        "city": "Berlin",
+        "pay_frequency": "monatlich",
+    }
+    processors.update_salary_range(state)
+    # 68k / 86k per month
+    assert (state["salary_min"], state["salary_max"]) == (5700, 7200)
+
+    state = {"job_title": "Astronaut"}  # no occupation code: generic fallback
+    processors.update_salary_range(state)
+    assert (state["salary_min"], state["salary_max"]) == (60000, 80000)
+
+
+@pytest.mark.parametrize(
+    "title, level",
+    [
+        ("VPN Engineer", ""),
+        ("Headquarters Assistant", ""),
+        ("Leitstandfahrer", ""),
+        ("Expertise Manager", ""),
+        ("Entrypoint Developer", ""),
+        ("Leiter Vertrieb", "lead"),
+        ("Head of Sales", "lead"),
+        ("Sr. Data Engineer", "senior"),
+        ("Absolventin Maschinenbau", "junior"),
+    ],
+)
+def test_seniority_needs_whole_words(title, level):
+    assert seniority_of(title) == level
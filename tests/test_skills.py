@@ -0,0 +1,52 @@
+from need_analysis.schema import ExtractResult
+from need_analysis.skills import canonical_id, canonicalize, skill_key, skills_stage
+from need_analysis.typed import typed_stage
+
+
+def test_spellings_share_one_id():
+    assert skill_key("sehr gute MS-Excel-Kenntnisse") == "msexcel"
+    ids = {
+        canonical_id(s)
+        for s in ("MS Excel", "Excel", "Microsoft Excel", "Excel (advanced)")
+    }
+    assert ids == {"ms_excel"}
+    assert canonical_id("Kubernetes") == canonical_id("K8s") == "kubernetes"
+    assert (
+        canonical_id("Terraform Cloud")
+        == canonical_id("terraform-cloud")
+        == "~terraformcloud"
+    )
+
+
+def test_dedupe_keeps_field_priority():
+    out = canonicalize(
+        {
+            "tool_proficiency": ["Excel", "Jira"],
+            "must_have_skills": ["MS Excel", "Python 3"],
+            "nice_to_have_skills": ["python", "Gute Englischkenntnisse", "dbt"],
+            "tech_stack": ["Python", "DBT", "K8s"],
+        }
+    )
+    assert out == {
+        "must_have_skills": ["Microsoft Excel", "Python"],
+        "nice_to_have_skills": ["English", "dbt"],
+        "tech_stack": ["Kubernetes"],
+        "tool_proficiency": ["Jira"],
+    }
+
+
+def test_stage_rewrites_typed_lists_and_empties_duplicated_fields():
+    fields = typed_stage(
+        {
+            "must_have_skills": ExtractResult("- MS Excel\n- SAP S/4HANA", 0.9),
+            "it_skills": ExtractResult("Excel; S4HANA", 0.6),
+            "soft_skills": ExtractResult("Teamplayer", 0.5),
+        }
+    )
+    out = skills_stage(fields)
+
+    assert out["must_have_skills"].typed == ["Microsoft Excel", "SAP S/4HANA"]
+    assert out["must_have_skills"].value == "Microsoft Excel, SAP S/4HANA"
+    assert out["must_have_skills"].confidence == 0.9
+    assert out["it_skills"].typed == [] and out["it_skills"].value == ""
+    assert out["soft_skills"] is fields["soft_skills"]
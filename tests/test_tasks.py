@@ -0,0 +1,178 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from need_analysis import extraction, llm, tasks
+from need_analysis.cache import ByteBudgetLRU
+from need_analysis.record import JobRequisition
+from need_analysis.schema import ExtractResult
+
+
+def test_background_extraction_reports_stages_and_partial_fields(monkeypatch):
+    seen = []
+    started = threading.Event()  # the task must not run before ``task`` is bound
+
+    async def fake_llm_fill(missing, text, lang="en", on_chunk=None):
+        on_chunk(0, 2, {})
+        seen.append(dict(task.fields))  # regex results are visible before the LLM
+        on_chunk(1, 2, {"other_perks": ExtractResult("Gym", 0.7)})
+        seen.append(task.label)
+        on_chunk(2, 2, {})
+        return {"other_perks": ExtractResult("Gym", 0.7)}
+
+    def load():
+        started.wait(5)
+        return "Job Title: Data Engineer\nCity: Berlin"
+
+    monkeypatch.setattr(extraction, "llm_fill", fake_llm_fill)
+    task = tasks.start_extraction(load)
+    started.set()
+    fields = task.future.result(timeout=5)
+
+    assert task.stage == "done" and task.fraction == 1.0
+    assert "job_title" in seen[0] and "other_perks" not in seen[0]
+    assert seen[1] == "LLM chunk 1/2"
+    assert (
+        fields["other_perks"].value == "Gym"
+        and fields["job_title"].value == "Data Engineer"
+    )
+
+
+def test_fresh_run_and_cache_hit_return_the_same_type(monkeypatch):
+    async def fake_llm_fill(missing, text, lang="en", on_chunk=None):
+        return {}
+
+    monkeypatch.setattr(extraction, "llm_fill", fake_llm_fill)
+    registry = tasks.TaskRegistry(cache=ByteBudgetLRU())
+    key = tasks.content_key(b"ad")
+    fresh = registry.start("session-1", key, lambda: "Job Title: Data Engineer")
+    fresh.future.result(timeout=5)
+    hit = registry.start("session-2", key, lambda: "unused")
+
+    assert hit.stage == "done"
+    assert isinstance(fresh.fields, JobRequisition) and hit.fields is fresh.fields
+    uncached = tasks.start_extraction(lambda: "Job Title: A").future.result(timeout=5)
+    assert isinstance(uncached, JobRequisition)
+
+
+def test_live_source_is_cached_by_its_fetched_text(monkeypatch):
+    calls = []
+
+    async def fake_llm_fill(missing, text, lang="en", on_chunk=None):
+        calls.append(text)
+        return {}
+
+    monkeypatch.setattr(extraction, "llm_fill", fake_llm_fill)
+    registry = tasks.TaskRegistry(cache=ByteBudgetLRU())
+    key = tasks.content_key("https://example.com/job")
+    page = ["Job Title: Data Engineer"]
+
+    def run(session_id):
+        task = registry.start(session_id, key, lambda: page[0], live=True)
+        task.future.result(timeout=5)
+        return task
+
+    first, same = run("session-1"), run("session-2")
+    assert len(calls) == 1 and same.fields is first.fields
+
+    page[0] = "Job Title: Data Scientist"  # the page changed under the same URL
+    changed = run("session-1")
+    assert len(calls) == 2
+    assert changed.fields["job_title"].value == "Data Scientist"
+
+
+def test_failed_load_marks_task_failed():
+    def load():
+        raise OSError("unreadable PDF")
+
+    task = tasks.start_extraction(load)
+    task.future.result(timeout=5)
+    assert task.done and task.stage == "failed"
+    assert "unreadable PDF" in task.error
+
+
+def test_superseded_task_is_cancelled_mid_request(monkeypatch):
+    started = []
+
+    async def hanging_create(**kwargs):
+        started.append(kwargs["model"])
+        await asyncio.Event().wait()  # a response that never arrives
+
+    fake = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=hanging_create))
+    )
+    monkeypatch.setattr(llm, "get_client", lambda: fake)
+    monkeypatch.setattr(llm, "USAGE", llm.USAGE.__class__())
+    registry = tasks.TaskRegistry()
+
+    first = registry.start(
+        "session-1", tasks.content_key(b"ad one"), lambda: "Job Title: A"
+    )
+    assert (
+        registry.start("session-1", tasks.content_key(b"ad one"), lambda: "x") is first
+    )
+    deadline = time.monotonic() + 5
+    while not started and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    second = registry.start(
+        "session-1", tasks.content_key(b"ad two"), lambda: "Job Title: B"
+    )
+    assert second is not first and first.stage == "cancelled"
+    while not llm.USAGE["cancelled_calls"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert llm.USAGE["cancelled_calls"] == 1
+    assert llm.USAGE["tokens_saved"] >= llm.MAX_TOKENS
+
+    assert registry.reap(lambda sid: False) == 1
+    assert registry.get("session-1") is None
+
+
+def test_named_jobs_are_cancelled_when_superseded_or_the_session_ends():
+    registry = tasks.TaskRegistry()
+
+    async def forever():
+        await asyncio.Event().wait()
+
+    async def quick():
+        return "done"
+
+    first = registry.submit("session-1", "bulk", forever())
+    second = registry.submit("session-1", "bulk", forever())
+    other = registry.submit("session-2", "bulk", quick())
+
+    assert first.cancelled() and not second.done()
+    assert other.result(timeout=5) == "done"
+    assert registry.reap(lambda sid: sid != "session-1") == 1
+    assert second.cancelled()
+
+
+def test_esco_lookup_starts_after_regex_stage(monkeypatch):
+    from need_analysis.esco import prefetch
+
+    calls, seen = [], []
+
+    async def fake_lookup(title, language="en", limit=10):
+        calls.append((title, language))
+        return prefetch.EscoLookup(title, language, ("SQL",), ("Build pipelines",))
+
+    async def fake_llm_fill(missing, text, lang="en", on_chunk=None):
+        deadline = time.monotonic() + 5
+        # prefetch runs while the LLM works
+        while not calls and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        seen.extend(calls)
+        return {}
+
+    monkeypatch.setattr(prefetch, "lookup", fake_lookup)
+    monkeypatch.setattr(extraction, "llm_fill", fake_llm_fill)
+    task = tasks.start_extraction(
+        lambda: "Job Title: Data Engineer\nCity: Berlin", esco_language="de"
+    )
+    task.future.result(timeout=5)
+
+    assert seen == [("Data Engineer", "de")]
+    hit = task.esco.get("data engineer (m/w/d)", "de", timeout=1)  # same cleaned title
+    assert hit.skills == ("SQL",) and hit.tasks == ("Build pipelines",)
+    assert calls == [("Data Engineer", "de")]
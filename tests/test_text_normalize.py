@@ -0,0 +1,96 @@
+from need_analysis.text_normalize import normalize_text
+
+
+def _pages() -> str:
+    bodies = [
+        "Wir suchen einen Senior Entwick-\nler für unser Team.\nAufgaben:\n- Code   schreiben",
+        "Profil:\n- 5 Jahre Erfahrung\n\n\n\nBenefits: 30 Urlaubstage",
+        "Kontakt: jobs@acme.de\n\nWir begrüßen Bewerbungen unabhängig von Geschlecht, "
+        "Nationalität und Alter.\n\nWe are an equal opportunity employer.",
+    ]
+    return "\f".join(
+        f"ACME GmbH – Stellenanzeige\n{body}\nSeite {i} von 3"
+        for i, body in enumerate(bodies, 1)
+    )
+
+
+def test_normalize_text_strips_noise():
+    res = normalize_text(_pages())
+
+    assert "Stellenanzeige" not in res.text  # repeated header
+    assert "Seite" not in res.text  # page-number footer
+    assert "Senior Entwickler für" in res.text  # dehyphenated
+    assert "Code schreiben" in res.text  # whitespace collapsed
+    assert "\n\n\n" not in res.text
+    assert "Geschlecht" not in res.text and "equal opportunity" not in res.text
+    assert "Kontakt: jobs@acme.de" in res.text
+    assert res.chars_out < res.chars_in
+    assert 0 < res.reduction < 1
+    assert sum(res.removed.values()) == res.chars_in - res.chars_out
+
+
+def test_normalize_text_is_deterministic_and_idempotent():
+    first = normalize_text(_pages()).text
+    assert normalize_text(_pages()).text == first
+    assert normalize_text(first).text == first
+
+
+def test_short_ad_keeps_content_next_to_gdpr_footer():
+    ad = (
+        "Wir suchen einen Vertriebsleiter (m/w/d) in Berlin.\n"
+        "Aufgaben: Kundenbetreuung und Angebotserstellung.\n"
+        "Deine Daten verarbeiten wir gemäß DSGVO."
+    )
+    res = normalize_text(ad)
+
+    assert res.text == (
+        "Wir suchen einen Vertriebsleiter (m/w/d) in Berlin.\n"
+        "Aufgaben: Kundenbetreuung und Angebotserstellung."
+    )
+    assert normalize_text(res.text).text == res.text
+
+
+def test_suspended_hyphen_before_conjunction_is_kept():
+    res = normalize_text("Gesucht: Vertriebs-\nund Marketingleiter, Entwick-\nlung")
+    assert res.text == "Gesucht: Vertriebs- und Marketingleiter, Entwicklung"
+
+
+def test_one_line_ad_with_gdpr_sentence_is_not_emptied():
+    res = normalize_text(
+        "Senior Dev gesucht. Python, SQL. Bewerbung per Mail; Datenschutz nach DSGVO."
+    )
+    assert res.text == "Senior Dev gesucht. Python, SQL."
+
+
+def test_data_protection_duties_are_not_boilerplate():
+    ad = (
+        "Datenschutzbeauftragter (m/w/d)\n"
+        "Ihre Aufgaben: Umsetzung der DSGVO im Konzern. Beratung der Fachbereiche. "
+        "Sie prüfen, ob personenbezogene Daten rechtmäßig verarbeitet werden.\n"
+        "Anforderungen: Fundierte Kenntnisse der GDPR und des BDSG. "
+        "Erfahrung mit Datenschutzerklärungen und Auftragsverarbeitung.\n"
+        "Wir verarbeiten Ihre Bewerbungsdaten gemäß DSGVO. "
+        "We process your personal data in accordance with the GDPR."
+    )
+    res = normalize_text(ad)
+
+    assert res.text == (
+        "Datenschutzbeauftragter (m/w/d)\n"
+        "Ihre Aufgaben: Umsetzung der DSGVO im Konzern. Beratung der Fachbereiche. "
+        "Sie prüfen, ob personenbezogene Daten rechtmäßig verarbeitet werden.\n"
+        "Anforderungen: Fundierte Kenntnisse der GDPR und des BDSG. "
+        "Erfahrung mit Datenschutzerklärungen und Auftragsverarbeitung."
+    )
+
+
+def test_applicant_data_notices_are_removed():
+    for notice in (
+        "Mit Ihrer Bewerbung willigen Sie in die Verarbeitung Ihrer Daten ein.",
+        "Informationen zum Datenschutz für Bewerber finden Sie in unserer Datenschutzerklärung.",
+        "Your application data will be stored for six months.",
+        "Personal data submitted with your application is processed under the GDPR.",
+        "Please read our privacy policy before applying.",
+    ):
+        assert normalize_text(f"Python Developer in Berlin.\n{notice}").text == (
+            "Python Developer in Berlin."
+        ), notice
@@ -0,0 +1,110 @@
+import pytest
+
+from need_analysis.extraction import regex_stage
+from need_analysis.schema import (
+    DATE_KEYS,
+    MONTH_KEYS,
+    ExtractResult,
+    dump_results,
+    load_results,
+)
+from need_analysis.typed import (
+    parse_bool,
+    parse_date,
+    parse_list,
+    parse_salary,
+    typed_stage,
+)
+
+
+@pytest.mark.parametrize(
+    "text, lang, iso",
+    [
+        ("01.03.2025", "de", "2025-03-01"),
+        ("1. März 2025", "de", "2025-03-01"),
+        ("March 1st, 2025", "en", "2025-03-01"),
+        ("03/01/2025", "en", "2025-03-01"),
+        ("03/01/2025", "de", "2025-01-03"),
+        ("ab Juni 2025", "de", "2025-06-01"),
+        ("ab sofort", "de", None),
+    ],
+)
+def test_parse_date(text, lang, iso):
+    assert parse_date(text, lang) == iso
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("60.000 – 75.000 € brutto p.a.", (60000, 75000, "EUR", "year")),
+        ("€60,000-€75,000 per year", (60000, 75000, "EUR", "year")),
+        ("4.500,50 € monatlich", (4500.5, 4500.5, "EUR", "month")),
+        ("55-65k", (55000, 65000, None, None)),
+        ("$45/hour", (45, 45, "USD", "hour")),
+    ],
+)
+def test_parse_salary(text, expected):
+    got = parse_salary(text)
+    assert (got["min"], got["max"], got["currency"], got["period"]) == expected
+
+
+def test_lists_and_flags():
+    assert parse_list(
+        "- Python\n- SQL (Postgres, MySQL)\n3D modelling; Docker, Docker"
+    ) == [
+        "Python",
+        "SQL (Postgres, MySQL)",
+        "3D modelling",
+        "Docker",
+    ]
+    assert parse_bool("Ja, nach Absprache") is True and parse_bool("keine") is False
+    assert parse_bool("nach Absprache") is None
+
+
+def test_typed_stage_keeps_raw_and_round_trips():
+    fields = {
+        "salary_range": ExtractResult("50.000 – 60.000", 0.9),
+        "salary_currency": ExtractResult("EUR", 0.9),
+        "vacation_days": ExtractResult("30 Tage Urlaub", 0.8),
+        "must_have_skills": ExtractResult(["Python", "SQL"], 0.6),
+        "job_title": ExtractResult("Data Engineer", 0.9),
+    }
+    typed = typed_stage(fields)
+
+    assert typed["salary_range"].value == "50.000 – 60.000"
+    assert typed["salary_range"].typed == {
+        "min": 50000,
+        "max": 60000,
+        "currency": "EUR",
+        "period": None,
+    }
+    assert typed["vacation_days"].typed == 30
+    assert typed["must_have_skills"].typed == ["Python", "SQL"]
+    assert typed["job_title"].typed is None
+    assert load_results(dump_results(typed)) == typed
+
+
+def test_typed_stage_after_regex_stage():
+    fields = typed_stage(
+        regex_stage("Job Title: Data Engineer\nStart Date: 01.10.2025\n")
+    )
+    assert fields["date_of_employment_start"].typed == "2025-10-01"
+
+
+@pytest.mark.parametrize(
+    "text, period",
+    [
+        ("3.500 € brutto monatlich bei 40 Stunden/Woche", "month"),
+        ("40 Stunden/Woche, 60.000 € p.a.", "year"),
+        ("Stundenlohn: 25 €", "hour"),
+        ("40 Stunden/Woche", None),
+    ],
+)
+def test_salary_period_comes_from_the_currency_amount(text, period):
+    assert parse_salary(text)["period"] == period
+
+
+def test_probation_period_is_months_not_a_date():
+    typed = typed_stage({"probation_period": ExtractResult("6 Monate", 0.8)})
+    assert typed["probation_period"].typed == 6
+    assert "probation_period" not in DATE_KEYS and "probation_period" in MONTH_KEYS
@@ -1,15 +1,23 @@
-"""Client for interacting with the ESCO REST API."""
+"""Client for interacting with the ESCO REST API.
+
+When the offline index exists (``python -m need_analysis esco-import``), every
+lookup is answered from it and the REST API is not contacted. Otherwise the
+pooled async client in :mod:`need_analysis.esco.client` answers skills and
+tasks for a title with one cached request.
+"""
 
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Optional, Union
-
-import requests
+from typing import Dict, Iterable, List, Optional
 
 logger = logging.getLogger(__name__)
 
-BASE_URL = "https://ec.europa.eu/esco/api"
+
+def _local_index():
+    from need_analysis.esco.index import get_index
+
+    return get_index()
 
 
 def search_skills(query: str, *, language: str = "en", limit: int = 10) -> List[str]:
@@ -23,39 +31,27 @@ def search_skills(query: str, *, language: str = "en", limit: int = 10) -> List[
     Returns:
         List of skill titles.
     """
-    params: Dict[str, Union[str, int]] = {
-        "text": query,
-        "language": language,
-        "type": "skill",
-        "limit": limit,
-    }
+    if (index := _local_index()) is not None:
+        return index.search_skills(query, language=language, limit=limit)
+    from need_analysis.aio import run_sync
+    from need_analysis.esco import client
+
     try:
-        response = requests.get(f"{BASE_URL}/search", params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        results = data.get("_embedded", {}).get("results", [])
-        return [r.get("title") for r in results if r.get("title")]
+        return run_sync(client.search_skills(query, language=language, limit=limit))
     except Exception as exc:  # pragma: no cover - network
         logger.warning("ESCO API request failed: %s", exc)
         return []
 
 
-def _find_occupation_uri(job_title: str, *, language: str) -> Optional[str]:
-    """Return the ESCO URI for the given ``job_title`` if found."""
-
-    params: Dict[str, Union[str, int]] = {
-        "text": job_title,
-        "language": language,
-        "type": "occupation",
-        "limit": 1,
-        "full": "true",
-    }
-    response = requests.get(f"{BASE_URL}/search", params=params, timeout=10)
-    response.raise_for_status()
-    results = response.json().get("_embedded", {}).get("results", [])
-    if not results:
+def _profile(job_title: str, *, language: str):
+    """Cached occupation profile for ``job_title``, or ``None``."""
+    from need_analysis.esco import client
+
+    try:
+        return client.occupation_profile_sync(job_title, language=language)
+    except Exception as exc:  # pragma: no cover - network
+        logger.warning("ESCO API request failed: %s", exc)
         return None
-    return results[0].get("uri")
 
 
 def get_skills_for_job_title(
@@ -63,24 +59,10 @@ def get_skills_for_job_title(
 ) -> List[str]:
     """Return essential skills for ``job_title`` from ESCO."""
 
-    try:
-        occ_uri = _find_occupation_uri(job_title, language=language)
-        if not occ_uri:
-            return []
-        params: Dict[str, Union[str, int]] = {
-            "uri": occ_uri,
-            "relation": "hasEssentialSkill",
-            "language": language,
-            "limit": limit,
-            "full": "false",
-        }
-        resp = requests.get(f"{BASE_URL}/resource/related", params=params, timeout=10)
-        resp.raise_for_status()
-        skills = resp.json().get("_embedded", {}).get("hasEssentialSkill", [])
-        return [s.get("title") for s in skills if s.get("title")]
-    except Exception as exc:  # pragma: no cover - network
-        logger.warning("ESCO API request failed: %s", exc)
-        return []
+    if (index := _local_index()) is not None:
+        return index.get_skills_for_job_title(job_title, language=language, limit=limit)
+    profile = _profile(job_title, language=language)
+    return list(profile.essential_skills[:limit]) if profile else []
 
 
 def get_tasks_for_job_title(
@@ -88,23 +70,26 @@ def get_tasks_for_job_title(
 ) -> List[str]:
     """Return a list of typical tasks for ``job_title`` from ESCO."""
 
-    try:
-        occ_uri = _find_occupation_uri(job_title, language=language)
-        if not occ_uri:
-            return []
-        params: Dict[str, Union[str, int]] = {
-            "uri": occ_uri,
-            "language": language,
-        }
-        resp = requests.get(
-            f"{BASE_URL}/resource/occupation", params=params, timeout=10
-        )
-        resp.raise_for_status()
-        desc = resp.json().get("description", {}).get(language, {}).get("literal", "")
-        if not desc:
-            return []
-        sentences = [s.strip() for s in desc.split(".") if s.strip()]
-        return sentences[:limit]
-    except Exception as exc:  # pragma: no cover - network
-        logger.warning("ESCO API request failed: %s", exc)
-        return []
+    if (index := _local_index()) is not None:
+        return index.get_tasks_for_job_title(job_title, language=language, limit=limit)
+    profile = _profile(job_title, language=language)
+    return profile.tasks[:limit] if profile else []
+
+
+def prefetch_job_titles(
+    job_titles: Iterable[str], *, language: str = "en"
+) -> Dict[str, Optional[str]]:
+    """Resolve many titles concurrently and warm the cache.
+
+    Returns:
+        Mapping of each title to its occupation URI (``None`` if not found).
+    """
+    titles = list(job_titles)
+    if (index := _local_index()) is not None:
+        hits = {t: index.find_occupation(t, language) for t in titles}
+        return {t: occ.uri if occ else None for t, occ in hits.items()}
+    from need_analysis.aio import run_sync
+    from need_analysis.esco import client
+
+    profiles = run_sync(client.occupation_profiles(titles, language=language))
+    return {t: p.uri if p else None for t, p in profiles.items()}
@@ -1,24 +1,12 @@
 """Side-effect helpers that pre- or post-process session_state values."""
 from __future__ import annotations
-import streamlit as st
+
 import datetime
 
-# your existing helpers
-from functions.processors import (
-    update_bonus_scheme,
-    update_commission_structure,
-    update_must_have_skills,
-    update_nice_to_have_skills,
-    update_publication_channels,
-    update_salary_range,
-    update_task_list,
-    update_translation_required,
-)
+import streamlit as st
 
-from utils.esco_client import (
-    get_skills_for_job_title,
-    get_tasks_for_job_title,
-)
+from functions.processors import PROCESSORS
+from need_analysis.esco.prefetch import EscoLookup, EscoPrefetch
 from utils.i18n import tr
 from utils.schema import WizardStep
 
@@ -36,6 +24,11 @@ def _ensure_default_dates() -> None:
         st.session_state[key] = datetime.date.today()
 
 
+def _processors(*keys: str) -> callable:
+    """Hook bringing ``keys`` up to date; processors with unchanged inputs are skipped."""
+    return lambda: PROCESSORS.run(st.session_state, keys)
+
+
 # --------------------------------------------------------------------------- #
 # Map each step to a list of side-effect functions that mutate session_state.
 # Each function must accept **no arguments** and read / write st.session_state
@@ -43,41 +36,55 @@ def _ensure_default_dates() -> None:
 # --------------------------------------------------------------------------- #
 PRE_HOOKS: dict[WizardStep, list[callable]] = {
     WizardStep.TASKS: [
-        lambda: update_task_list(st.session_state),
+        _processors("task_list"),
         lambda: _prefill_esco_tasks(),
     ],
     WizardStep.SKILLS: [
-        lambda: update_must_have_skills(st.session_state),
-        lambda: update_nice_to_have_skills(st.session_state),
+        _processors("must_have_skills", "nice_to_have_skills"),
         lambda: _prefill_esco_skills(),
     ],
     WizardStep.COMP_BENEFITS: [
-        lambda: update_salary_range(st.session_state),
-        lambda: update_bonus_scheme(st.session_state),
-        lambda: update_commission_structure(st.session_state),
+        _processors("salary_min", "salary_max", "bonus_scheme", "commission_structure"),
     ],
     WizardStep.RECRUITMENT: [
-        lambda: update_publication_channels(st.session_state),
-        lambda: update_translation_required(st.session_state),
+        _processors("publication_channels", "translation_required"),
     ],
     WizardStep.BASIC: [_ensure_default_dates],
 }
 
 
 # ---------- helper wrappers for ESCO auto-prefill -------------------------- #
+def _esco_lookup(title: str) -> EscoLookup | None:
+    """Session's ESCO lookup for ``title``; prefetched during extraction when possible."""
+    prefetch = st.session_state.setdefault("esco", EscoPrefetch())
+    return prefetch.get(title, st.session_state.get("lang", "de"))
+
+
 def _prefill_esco_tasks() -> None:
     title = st.session_state.get("job_title")
-    if title and not st.session_state.get("task_list"):
-        tasks = get_tasks_for_job_title(title, language=st.session_state.get("lang", "de"), limit=5)
+    if (
+        title
+        and not st.session_state.get("task_list")
+        and (esco := _esco_lookup(title))
+    ):
+        tasks = esco.tasks[:5]
         if tasks:
             st.session_state["task_list"] = "\n".join(tasks)
-            st.info(tr("Aufgaben von ESCO importiert", st.session_state.get("lang", "de")))
+            st.info(
+                tr("Aufgaben von ESCO importiert", st.session_state.get("lang", "de"))
+            )
 
 
 def _prefill_esco_skills() -> None:
     title = st.session_state.get("job_title")
-    if title and not st.session_state.get("must_have_skills"):
-        skills = get_skills_for_job_title(title, language=st.session_state.get("lang", "de"), limit=5)
+    if (
+        title
+        and not st.session_state.get("must_have_skills")
+        and (esco := _esco_lookup(title))
+    ):
+        skills = esco.skills[:5]
         if skills:
             st.session_state["must_have_skills"] = ", ".join(skills)
-            st.info(tr("Skills von ESCO importiert", st.session_state.get("lang", "de")))
+            st.info(
+                tr("Skills von ESCO importiert", st.session_state.get("lang", "de"))
+            )
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import datetime
+
 import streamlit as st
 
 from functions.processors import (
@@ -14,22 +16,19 @@ from functions.processors import (
     update_task_list,
     update_translation_required,
 )
-
-import datetime
-
+from need_analysis.http_fetch import fetch_text_sync
+from utils.esco_client import (
+    get_skills_for_job_title,
+    get_tasks_for_job_title,
+    search_skills,
+)
+from utils.i18n import tr
 from utils.utils_jobinfo import (
-    display_fields_summary,
     basic_field_extraction,
+    display_fields_summary,
     extract_text,
     save_fields_to_session,
 )
-from utils.i18n import tr
-from utils.esco_client import (
-    search_skills,
-    get_skills_for_job_title,
-    get_tasks_for_job_title,
-)
-import requests
 
 
 def wizard_step_1_basic() -> None:
@@ -80,9 +79,7 @@ def wizard_step_1_basic() -> None:
 
         if url_input and url_input != st.session_state.get("last_url", ""):
             try:  # pragma: no cover - network
-                response = requests.get(url_input, timeout=10)
-                response.raise_for_status()
-                text = response.text
+                text = fetch_text_sync(url_input).text
                 fields_update = basic_field_extraction(text)
                 fields_update["input_url"] = url_input
                 save_fields_to_session(fields_update)